@@ -1,30 +1,45 @@
 """FastAPI wrapper for universal infrastructure MCP server."""
 from __future__ import annotations
 
+import asyncio
 import logging
-import sys
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 import anyio
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-
-from server import mcp, simulation_engine
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from core.ingest import INGEST_FORMATS, batch_format, ingest_max_bytes, parse_batch
+from core.logs import configure_logging
+from core.rest import (
+    SnapshotCache,
+    component_snapshot,
+    read_body,
+    risk_snapshot,
+    snapshot_response,
+    system_snapshot,
+)
+from server import build_world, ingest_socket, mcp, simulation_engine, startup
 
 logger = logging.getLogger("universal-infra.app")
-logger.addHandler(logging.StreamHandler(sys.stderr))
-logger.setLevel(logging.INFO)
+
+_snapshots = SnapshotCache()
+_max_ingest_bytes = ingest_max_bytes()
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    configure_logging()
     async with anyio.create_task_group() as tg:
         mcp.session_manager._task_group = tg  # type: ignore[attr-defined]
+        await startup.begin(build_world)
+        await ingest_socket.start()
         logger.info("Universal Infrastructure MCP server starting")
         logger.info("MCP endpoint: http://localhost:8010/mcp")
         yield
         logger.info("Universal Infrastructure MCP server shutting down")
+        await ingest_socket.close()
 
 
 app = FastAPI(
@@ -45,6 +60,14 @@ async def root() -> JSONResponse:
         "endpoints": {
             "mcp": "/mcp",
             "systems": "tool:get_systems",
+            "rest_system": "/systems/{system_id}",
+            "rest_risk": "/systems/{system_id}/risk",
+            "rest_component": "/components/{component_id}",
+            "changes": "/changes?since={version}",
+            "memory": "/diagnostics/memory",
+            "ingest": "POST /ingest",
+            "replay": "/replay",
+            "clock": "/clock",
             "state": "tool:get_system_state",
             "risk": "tool:evaluate_system_risk",
             "control": "tool:execute_control_action",
@@ -54,7 +77,8 @@ async def root() -> JSONResponse:
 
 @app.get("/healthz")
 async def healthz() -> JSONResponse:
-    return JSONResponse(content={"status": "ok"})
+    status_code, payload = startup.healthz()
+    return JSONResponse(content=payload, status_code=status_code)
 
 
 @app.get("/systems")
@@ -71,5 +95,135 @@ async def systems() -> JSONResponse:
     return JSONResponse(content=payload)
 
 
+@app.get("/systems/{system_id}")
+async def system_state(system_id: str, request: Request) -> Response:
+    return await snapshot_response(
+        request,
+        _snapshots,
+        ("system", system_id),
+        lambda: simulation_engine.version,
+        lambda reader: simulation_engine.read_system(system_id, reader),
+        system_snapshot,
+    )
+
+
+@app.get("/systems/{system_id}/risk")
+async def system_risk(system_id: str, request: Request) -> Response:
+    return await snapshot_response(
+        request,
+        _snapshots,
+        ("risk", system_id),
+        lambda: simulation_engine.version,
+        lambda reader: simulation_engine.read_system(system_id, reader),
+        risk_snapshot,
+    )
+
+
+@app.get("/components/{component_id}")
+async def component_state(component_id: str, request: Request) -> Response:
+    return await snapshot_response(
+        request,
+        _snapshots,
+        ("component", component_id),
+        lambda: simulation_engine.version,
+        lambda reader: simulation_engine.read_component(component_id, reader),
+        component_snapshot,
+    )
+
+
+@app.get("/changes")
+async def changes(
+    since: int,
+    system_id: str | None = None,
+    limit: int = 1000,
+    epoch: str | None = None,
+) -> JSONResponse:
+    try:
+        payload = await simulation_engine.get_changes_since(since, system_id=system_id, limit=limit, epoch=epoch)
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    return JSONResponse(content=payload)
+
+
+@app.get("/diagnostics/memory")
+async def memory(top_components: int = 10, tracemalloc_top: int = 0) -> JSONResponse:
+    payload = await simulation_engine.get_memory_report(
+        top_components=top_components,
+        tracemalloc_top=tracemalloc_top,
+    )
+    return JSONResponse(content=payload)
+
+
+@app.post("/ingest")
+async def ingest(request: Request) -> JSONResponse:
+    fmt = batch_format(request.headers.get("content-type"))
+    if fmt is None:
+        return JSONResponse(
+            content={"detail": f"Unsupported Content-Type. Valid: {sorted(INGEST_FORMATS)}"},
+            status_code=415,
+        )
+    body = await read_body(request, _max_ingest_bytes)
+    if body is None:
+        return JSONResponse(
+            content={"detail": f"Request body exceeds {_max_ingest_bytes} bytes (SIM_INGEST_MAX_BYTES)"},
+            status_code=413,
+        )
+    try:
+        batch = await asyncio.to_thread(parse_batch, body, fmt)
+    except ValueError as error:
+        return JSONResponse(content={"detail": str(error)}, status_code=400)
+    return JSONResponse(content=await simulation_engine.ingest_telemetry(batch))
+
+
+@app.get("/clock")
+async def clock_status() -> JSONResponse:
+    return JSONResponse(content=await simulation_engine.get_clock_status())
+
+
+@app.patch("/clock")
+async def clock_control(
+    mode: str | None = None,
+    speed: float | None = None,
+    advance_seconds: float | None = None,
+) -> JSONResponse:
+    try:
+        payload = await simulation_engine.control_clock(mode=mode, speed=speed, advance_seconds=advance_seconds)
+    except ValueError as error:
+        return JSONResponse(content={"detail": str(error)}, status_code=400)
+    return JSONResponse(content=payload)
+
+
+@app.get("/replay")
+async def replay_status() -> JSONResponse:
+    try:
+        payload = await simulation_engine.get_replay_status()
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    return JSONResponse(content=payload)
+
+
+@app.patch("/replay")
+async def replay_control(
+    speed: float | None = None,
+    position_seconds: float | None = None,
+    loop: bool | None = None,
+) -> JSONResponse:
+    try:
+        payload = await simulation_engine.control_replay(speed=speed, position_seconds=position_seconds, loop=loop)
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    except ValueError as error:
+        return JSONResponse(content={"detail": str(error)}, status_code=400)
+    return JSONResponse(content=payload)
+
+
+@app.delete("/replay")
+async def replay_stop() -> JSONResponse:
+    try:
+        payload = await simulation_engine.stop_replay()
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    return JSONResponse(content=payload)
+
 _mcp_http_app = mcp.streamable_http_app()
 app.router.routes.extend(_mcp_http_app.routes)
@@ -1,30 +1,52 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-import sys
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
 import anyio
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-
-from core.infra_registry import InfrastructureStateRegistry
-from servers.power_server import DOMAIN_FILTER, mcp
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+from core.ingest import INGEST_FORMATS, batch_format, ingest_max_bytes, parse_batch
+from core.logs import configure_logging
+from core.rest import (
+    SnapshotCache,
+    component_snapshot,
+    read_body,
+    risk_snapshot,
+    snapshot_response,
+    system_snapshot,
+)
+from servers.power_server import (
+    DOMAIN_FILTER,
+    build_world,
+    get_registry,
+    ingest_socket,
+    ingest_telemetry,
+    mcp,
+    startup,
+)
 
 logger = logging.getLogger("power-infra.app")
-logger.addHandler(logging.StreamHandler(sys.stderr))
-logger.setLevel(logging.INFO)
+
+_snapshots = SnapshotCache()
+_max_ingest_bytes = ingest_max_bytes()
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    configure_logging()
     async with anyio.create_task_group() as tg:
         mcp.session_manager._task_group = tg  # type: ignore[attr-defined]
+        await startup.begin(build_world)
+        await ingest_socket.start()
         logger.info("Power Infrastructure MCP server starting")
         logger.info("MCP endpoint: http://localhost:8001/mcp")
         yield
         logger.info("Power Infrastructure MCP server shutting down")
+        await ingest_socket.close()
 
 
 app = FastAPI(
@@ -41,19 +63,32 @@ async def root() -> JSONResponse:
             "service": "Power Infrastructure MCP",
             "version": "1.0.0",
             "domain": DOMAIN_FILTER,
-            "endpoints": {"mcp": "/mcp", "health": "/healthz", "systems": "/systems"},
+            "endpoints": {
+                "mcp": "/mcp",
+                "health": "/healthz",
+                "systems": "/systems",
+                "system": "/systems/{system_id}",
+                "risk": "/systems/{system_id}/risk",
+                "component": "/components/{component_id}",
+                "changes": "/changes?since={version}",
+                "memory": "/diagnostics/memory",
+                "ingest": "POST /ingest",
+                "replay": "/replay",
+                "clock": "/clock",
+            },
         }
     )
 
 
 @app.get("/healthz")
 async def healthz() -> JSONResponse:
-    return JSONResponse(content={"status": "ok", "domain": DOMAIN_FILTER})
+    status_code, payload = startup.healthz()
+    return JSONResponse(content={**payload, "domain": DOMAIN_FILTER}, status_code=status_code)
 
 
 @app.get("/systems")
 async def systems() -> JSONResponse:
-    registry = await InfrastructureStateRegistry.get_instance()
+    registry = await get_registry()
     systems = await registry.get_systems(domain_filter=DOMAIN_FILTER)
     payload = [
         {
@@ -66,5 +101,152 @@ async def systems() -> JSONResponse:
     return JSONResponse(content=payload)
 
 
+@app.get("/systems/{system_id}")
+async def system_state(system_id: str, request: Request) -> Response:
+    registry = await get_registry()
+    return await snapshot_response(
+        request,
+        _snapshots,
+        ("system", system_id),
+        lambda: registry.version,
+        lambda reader: registry.read_system(system_id, reader, domain_filter=DOMAIN_FILTER),
+        system_snapshot,
+    )
+
+
+@app.get("/systems/{system_id}/risk")
+async def system_risk(system_id: str, request: Request) -> Response:
+    registry = await get_registry()
+    return await snapshot_response(
+        request,
+        _snapshots,
+        ("risk", system_id),
+        lambda: registry.version,
+        lambda reader: registry.read_system(system_id, reader, domain_filter=DOMAIN_FILTER),
+        risk_snapshot,
+    )
+
+
+@app.get("/components/{component_id}")
+async def component_state(component_id: str, request: Request) -> Response:
+    registry = await get_registry()
+    return await snapshot_response(
+        request,
+        _snapshots,
+        ("component", component_id),
+        lambda: registry.version,
+        lambda reader: registry.read_component(component_id, reader, domain_filter=DOMAIN_FILTER),
+        component_snapshot,
+    )
+
+
+@app.get("/changes")
+async def changes(
+    since: int,
+    system_id: str | None = None,
+    limit: int = 1000,
+    epoch: str | None = None,
+) -> JSONResponse:
+    registry = await get_registry()
+    try:
+        payload = await registry.get_changes_since(
+            since,
+            system_id=system_id,
+            limit=limit,
+            epoch=epoch,
+            domain_filter=DOMAIN_FILTER,
+        )
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    return JSONResponse(content=payload)
+
+
+@app.get("/diagnostics/memory")
+async def memory(top_components: int = 10, tracemalloc_top: int = 0) -> JSONResponse:
+    registry = await get_registry()
+    payload = await registry.get_memory_report(
+        top_components=top_components,
+        tracemalloc_top=tracemalloc_top,
+        domain_filter=DOMAIN_FILTER,
+    )
+    return JSONResponse(content=payload)
+
+
+@app.post("/ingest")
+async def ingest(request: Request) -> JSONResponse:
+    fmt = batch_format(request.headers.get("content-type"))
+    if fmt is None:
+        return JSONResponse(
+            content={"detail": f"Unsupported Content-Type. Valid: {sorted(INGEST_FORMATS)}"},
+            status_code=415,
+        )
+    body = await read_body(request, _max_ingest_bytes)
+    if body is None:
+        return JSONResponse(
+            content={"detail": f"Request body exceeds {_max_ingest_bytes} bytes (SIM_INGEST_MAX_BYTES)"},
+            status_code=413,
+        )
+    try:
+        batch = await asyncio.to_thread(parse_batch, body, fmt)
+    except ValueError as error:
+        return JSONResponse(content={"detail": str(error)}, status_code=400)
+    return JSONResponse(content=await ingest_telemetry(batch))
+
+
+@app.get("/clock")
+async def clock_status() -> JSONResponse:
+    registry = await get_registry()
+    return JSONResponse(content=await registry.get_clock_status())
+
+
+@app.patch("/clock")
+async def clock_control(
+    mode: str | None = None,
+    speed: float | None = None,
+    advance_seconds: float | None = None,
+) -> JSONResponse:
+    registry = await get_registry()
+    try:
+        payload = await registry.control_clock(mode=mode, speed=speed, advance_seconds=advance_seconds)
+    except ValueError as error:
+        return JSONResponse(content={"detail": str(error)}, status_code=400)
+    return JSONResponse(content=payload)
+
+
+@app.get("/replay")
+async def replay_status() -> JSONResponse:
+    registry = await get_registry()
+    try:
+        payload = await registry.get_replay_status()
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    return JSONResponse(content=payload)
+
+
+@app.patch("/replay")
+async def replay_control(
+    speed: float | None = None,
+    position_seconds: float | None = None,
+    loop: bool | None = None,
+) -> JSONResponse:
+    registry = await get_registry()
+    try:
+        payload = await registry.control_replay(speed=speed, position_seconds=position_seconds, loop=loop)
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    except ValueError as error:
+        return JSONResponse(content={"detail": str(error)}, status_code=400)
+    return JSONResponse(content=payload)
+
+
+@app.delete("/replay")
+async def replay_stop() -> JSONResponse:
+    registry = await get_registry()
+    try:
+        payload = await registry.stop_replay()
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0])}, status_code=404)
+    return JSONResponse(content=payload)
+
 _mcp_http_app = mcp.streamable_http_app()
 app.router.routes.extend(_mcp_http_app.routes)
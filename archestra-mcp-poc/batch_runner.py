@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from core.batch import OUTPUT_FORMATS, TABLE_COLUMNS, BatchRunner
+from core.clock import SimulationClock
+from core.logs import configure_logging
+from simulation import UniversalSimulationEngine
+
+
+def _parse_start(raw: str) -> datetime:
+    try:
+        start = datetime.fromisoformat(raw)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Invalid ISO 8601 timestamp: {raw}") from exc
+    return start if start.tzinfo is not None else start.replace(tzinfo=timezone.utc)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run the universal simulation headless and write tick output to compressed columnar files.",
+    )
+    parser.add_argument("--output", required=True, help="Directory for part files and manifest.json")
+    parser.add_argument("--duration", type=float, default=3600.0, help="Simulated duration in seconds")
+    parser.add_argument("--step-seconds", type=float, default=1.0, help="Simulated seconds per step")
+    parser.add_argument("--replicas", type=int, default=1, help="Copies of the sample fleet to simulate")
+    parser.add_argument("--scenario", default=None, help="Scenario file (JSON, JSON lines or YAML) to simulate instead of the sample fleet")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the simulation")
+    parser.add_argument("--start", type=_parse_start, default=None, help="Simulated start time (ISO 8601, default now)")
+    parser.add_argument("--chunk-rows", type=int, default=50_000, help="Rows buffered per table before a part is written")
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="json.gz")
+    parser.add_argument(
+        "--tables",
+        default=",".join(TABLE_COLUMNS),
+        help=f"Comma-separated tables to write (from {', '.join(TABLE_COLUMNS)})",
+    )
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.step_seconds <= 0.0:
+        raise ValueError("--step-seconds must be greater than zero")
+    if args.replicas < 1:
+        raise ValueError("--replicas must be at least 1")
+    if args.scenario is not None and args.replicas != 1:
+        raise ValueError("--replicas only applies to the sample fleet, not to --scenario")
+
+    clock = SimulationClock(mode="fixed_step", start=args.start)
+    engine = UniversalSimulationEngine(clock=clock, seed=args.seed)
+    if args.scenario is not None:
+        engine.load_scenario(args.scenario)
+    else:
+        engine.initialize_sample_systems(replicas=args.replicas)
+
+    tables = tuple(table.strip() for table in args.tables.split(",") if table.strip())
+    runner = BatchRunner(engine, args.output, chunk_rows=args.chunk_rows, fmt=args.format, tables=tables)
+    steps = max(1, int(args.duration / args.step_seconds))
+    summary = await runner.run(steps, args.step_seconds)
+    return summary.to_dict()
+
+
+def main() -> int:
+    args = _build_parser().parse_args()
+    configure_logging()
+    try:
+        summary = asyncio.run(_run(args))
+    except ValueError as exc:
+        print(f"[error] {exc}")
+        return 2
+
+    summary["tables"] = {table: details["rows"] for table, details in summary["tables"].items()}
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,144 @@
+"""Live ingestion throughput benchmark.
+
+Builds the sample fleet (``--replicas`` copies), generates ``--points``
+telemetry points spread over every component as NDJSON and CSV, and
+measures, in this interpreter, points per second for parsing, for applying
+parsed batches to the engine, and end to end through the Unix socket in
+batches of ``--batch`` points.
+
+    python benchmarks/ingest.py --points 200000 --replicas 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.clock import SimulationClock  # noqa: E402
+from core.dynamics import NOISE_METRICS  # noqa: E402
+from core.ingest import IngestSocket, parse_batch  # noqa: E402
+from simulation import UniversalSimulationEngine  # noqa: E402
+
+
+def _engine(replicas: int) -> UniversalSimulationEngine:
+    engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step"))
+    engine.initialize_sample_systems(replicas=replicas)
+    return engine
+
+
+async def _points(engine: UniversalSimulationEngine, count: int) -> list[tuple[str, str, float, float]]:
+    components = await engine.read_systems(
+        lambda system: [
+            (component.component_id, component.capacity, [metric[0] for metric in NOISE_METRICS.get(system.system_type, ())])
+            for component in system.components
+        ]
+    )
+    flat = [component for system in components for component in system]
+    start = engine.clock.now().timestamp()
+    points: list[tuple[str, str, float, float]] = []
+    step = 0
+    while len(points) < count:
+        for component_id, capacity, metrics in flat:
+            points.append((component_id, "load", round(capacity * (0.5 + (step % 7) / 20), 3), start + step))
+            for metric in metrics:
+                points.append((component_id, metric, 1.0 + step % 5, start + step))
+        step += 1
+    return points[:count]
+
+
+def _ndjson(points: list[tuple[str, str, float, float]]) -> bytes:
+    return "".join(
+        json.dumps({"component_id": c, "metric_name": m, "metric_value": v, "timestamp": t}) + "\n"
+        for c, m, v, t in points
+    ).encode()
+
+
+def _csv(points: list[tuple[str, str, float, float]]) -> bytes:
+    rows = "".join(f"{c},{m},{v},{t}\n" for c, m, v, t in points)
+    return ("component_id,metric_name,metric_value,timestamp\n" + rows).encode()
+
+
+def _chunks(body: bytes, batch: int) -> list[bytes]:
+    lines = body.splitlines(keepends=True)
+    return [b"".join(lines[start : start + batch]) for start in range(0, len(lines), batch)]
+
+
+async def _measure_format(replicas: int, points: int, batch: int, fmt: str) -> dict[str, float]:
+    engine = _engine(replicas)
+    generated = await _points(engine, points)
+    body = _ndjson(generated) if fmt == "ndjson" else _csv(generated)
+    header, rows = (b"", body) if fmt == "ndjson" else body.split(b"\n", 1)
+    chunks = [header + b"\n" + chunk if header else chunk for chunk in _chunks(rows, batch)]
+
+    started = time.perf_counter()
+    batches = [parse_batch(chunk, fmt) for chunk in chunks]
+    parse_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    accepted = 0
+    for parsed in batches:
+        accepted += (await engine.ingest_telemetry(parsed))["accepted"]
+    apply_seconds = time.perf_counter() - started
+    return {
+        "accepted": accepted,
+        "parse_points_per_second": round(points / parse_seconds),
+        "apply_points_per_second": round(points / apply_seconds),
+        "total_points_per_second": round(points / (parse_seconds + apply_seconds)),
+    }
+
+
+async def _measure_socket(replicas: int, points: int) -> dict[str, float]:
+    engine = _engine(replicas)
+    body = _ndjson(await _points(engine, points))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "ingest.sock")
+        server = IngestSocket(path, engine.ingest_telemetry)
+        await server.start()
+        try:
+            started = time.perf_counter()
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(body)
+            await writer.drain()
+            writer.write_eof()
+            summary = json.loads(await reader.readline())
+            elapsed = time.perf_counter() - started
+            writer.close()
+        finally:
+            await server.close()
+    return {
+        "accepted": summary["accepted"],
+        "batches": summary["batches"],
+        "points_per_second": round(points / elapsed),
+    }
+
+
+async def _run(args: argparse.Namespace) -> dict[str, object]:
+    return {
+        "points": args.points,
+        "batch": args.batch,
+        "ndjson": await _measure_format(args.replicas, args.points, args.batch, "ndjson"),
+        "csv": await _measure_format(args.replicas, args.points, args.batch, "csv"),
+        "unix_socket": await _measure_socket(args.replicas, args.points),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=200_000)
+    parser.add_argument("--replicas", type=int, default=20)
+    parser.add_argument("--batch", type=int, default=10_000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,127 @@
+"""Scenario loading benchmark.
+
+Writes a synthetic scenario with ``--components`` components spread over
+systems of ``--per-system`` components each (a chain topology and the
+usual constraints per system type), then measures, in this interpreter,
+how long parsing plus building engine state takes and how long a full
+``load_scenario`` into an engine takes.
+
+    python benchmarks/scenario_load.py --components 50000 --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.clock import SimulationClock  # noqa: E402
+from core.scenario import iter_scenario  # noqa: E402
+from simulation import UniversalSimulationEngine  # noqa: E402
+
+SYSTEM_TYPES: tuple[tuple[str, str, tuple[dict[str, object], ...]], ...] = (
+    (
+        "power_grid",
+        "feeder",
+        (
+            {"name": "max_frequency_deviation", "min_value": 49.5, "max_value": 50.5, "units": "Hz"},
+            {"name": "max_line_loading", "max_value": 1.05, "units": "ratio"},
+        ),
+    ),
+    ("hydro_plant", "turbine", ({"name": "min_flow", "min_value": 30.0, "units": "m3/s"},)),
+    ("sewage_plant", "pump", ({"name": "target_ph_min", "min_value": 6.5, "units": "pH"},)),
+)
+
+
+def write_scenario(path: Path, components: int, per_system: int, fmt: str) -> int:
+    systems = []
+    for index in range(0, components, per_system):
+        system_type, component_type, constraints = SYSTEM_TYPES[(index // per_system) % len(SYSTEM_TYPES)]
+        system_id = f"sys_{index // per_system:05d}"
+        count = min(per_system, components - index)
+        ids = [f"{system_id}_c{offset:04d}" for offset in range(count)]
+        systems.append(
+            {
+                "system_id": system_id,
+                "system_type": system_type,
+                "name": f"Synthetic {system_type} {index // per_system}",
+                "location": "Benchmark",
+                "components": [
+                    {
+                        "component_id": component_id,
+                        "component_type": component_type,
+                        "capacity": 100.0,
+                        "current_load": 40.0 + offset % 40,
+                    }
+                    for offset, component_id in enumerate(ids)
+                ],
+                "topology_graph": {
+                    "edges": [
+                        {"source_component_id": source, "target_component_id": target, "max_throughput": 90.0}
+                        for source, target in zip(ids, ids[1:])
+                    ]
+                },
+                "operational_constraints": list(constraints),
+            }
+        )
+    with path.open("w", encoding="utf-8") as handle:
+        if fmt == "jsonl":
+            for system in systems:
+                handle.write(json.dumps(system, separators=(",", ":")) + "\n")
+        else:
+            json.dump({"name": "synthetic", "systems": systems}, handle, separators=(",", ":"))
+    return len(systems)
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "median": round(statistics.median(samples), 4),
+        "min": round(min(samples), 4),
+        "max": round(max(samples), 4),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", type=int, default=50_000)
+    parser.add_argument("--per-system", type=int, default=50)
+    parser.add_argument("--format", choices=("json", "jsonl"), default="json")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f"scenario.{args.format}"
+        systems = write_scenario(path, args.components, args.per_system, args.format)
+
+        parse_runs: list[float] = []
+        load_runs: list[float] = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            for _system in iter_scenario(path):
+                pass
+            parse_runs.append(time.perf_counter() - started)
+
+            engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step"))
+            started = time.perf_counter()
+            engine.load_scenario(path)
+            load_runs.append(time.perf_counter() - started)
+
+        results = {
+            "components": args.components,
+            "systems": systems,
+            "file_bytes": path.stat().st_size,
+            "parse_and_build_seconds": _summary(parse_runs),
+            "load_scenario_seconds": _summary(load_runs),
+        }
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
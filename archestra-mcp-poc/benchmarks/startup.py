@@ -0,0 +1,134 @@
+"""Cold-start benchmark for the MCP servers.
+
+Measures, in fresh interpreters, how long each entry module takes to import
+and, for the HTTP apps, how long a uvicorn process takes from spawn to a
+ready ``/healthz`` and to the first ``/systems`` response. Each scenario is
+run with ``MCP_FAST_STARTUP`` off and on.
+
+    python benchmarks/startup.py --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+IMPORT_MODULES = ("server", "app", "app_power", "app_hydro", "app_sewage")
+HTTP_APPS = ("app:app", "app_power:app")
+
+_IMPORT_SNIPPET = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def _env(fast: bool) -> dict[str, str]:
+    env = dict(os.environ)
+    env["MCP_FAST_STARTUP"] = "1" if fast else "0"
+    env["PYTHONPATH"] = str(ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def measure_import(module: str, fast: bool) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET.format(module=module)],
+        cwd=ROOT,
+        env=_env(fast),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def _get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=1.0) as response:
+            response.read()
+            return int(response.status)
+    except urllib.error.HTTPError as error:
+        return int(error.code)
+
+
+def measure_first_response(app: str, fast: bool, timeout: float = 30.0) -> dict[str, float]:
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", app, "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=_env(fast),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    timings: dict[str, float] = {}
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            try:
+                status = _get(f"{base}/healthz")
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.01)
+                continue
+            timings.setdefault("listening", time.perf_counter() - started)
+            if status == 200:
+                timings["ready"] = time.perf_counter() - started
+                break
+            time.sleep(0.01)
+        else:
+            raise TimeoutError(f"{app} did not become ready within {timeout}s")
+
+        _get(f"{base}/systems")
+        timings["first_response"] = time.perf_counter() - started
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return timings
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "median": round(statistics.median(samples), 4),
+        "min": round(min(samples), 4),
+        "max": round(max(samples), 4),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-http", action="store_true", help="Only measure import time")
+    args = parser.parse_args()
+
+    results: dict[str, dict[str, object]] = {}
+    for fast in (False, True):
+        mode = "fast" if fast else "default"
+        imports = {
+            module: _summary([measure_import(module, fast) for _ in range(args.runs)])
+            for module in IMPORT_MODULES
+        }
+        http: dict[str, dict[str, dict[str, float]]] = {}
+        if not args.skip_http:
+            for app in HTTP_APPS:
+                runs = [measure_first_response(app, fast) for _ in range(args.runs)]
+                http[app] = {key: _summary([run[key] for run in runs]) for key in runs[0]}
+        results[mode] = {"import_seconds": imports, "http_seconds": http}
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+"""Streaming anomaly detection on per-metric component telemetry.
+
+Every (component, metric) stream keeps a Holt linear-trend forecast
+(level plus slope), the exponentially weighted variance of its one-step
+residuals and two-sided CUSUM sums on the standardized residual. Following
+the trend keeps smooth ramps and oscillations, such as the daily-style
+swing of power load, from leaving a long run of same-signed residuals that
+the CUSUM would read as a level shift. The residual scale is floored at a
+fraction of the stream's own spread for the same reason: a noise-free
+oscillation has tiny but correlated residuals.
+
+Each new point is scored in O(1): a large z-score flags a spike, and a
+CUSUM sum crossing its threshold flags a level shift and restarts the sums.
+A flagged stream stays active for ``hold_points`` further samples so that
+agents polling once in a while still see it; a stream that stops reporting
+drops out after ``hold_seconds`` of simulated time instead, and ``forget``
+clears a component taken offline at once.
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+
+@dataclass(slots=True)
+class TelemetryAnomaly:
+    component_id: str
+    metric_name: str
+    kind: str
+    value: float
+    expected: float
+    z_score: float
+    detected_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "component_id": self.component_id,
+            "metric_name": self.metric_name,
+            "kind": self.kind,
+            "value": round(self.value, 4),
+            "expected": round(self.expected, 4),
+            "z_score": round(self.z_score, 3),
+            "detected_at": self.detected_at.isoformat(),
+        }
+
+
+class _StreamState:
+    __slots__ = (
+        "mean",
+        "variance",
+        "level",
+        "trend",
+        "residual_variance",
+        "count",
+        "cusum_high",
+        "cusum_low",
+        "hold",
+    )
+
+    def __init__(self, value: float) -> None:
+        self.mean = value
+        self.variance = 0.0
+        self.level = value
+        self.trend = 0.0
+        self.residual_variance = 0.0
+        self.count = 1
+        self.cusum_high = 0.0
+        self.cusum_low = 0.0
+        self.hold = 0
+
+
+class AnomalyDetector:
+    def __init__(
+        self,
+        alpha: float = 0.05,
+        level_alpha: float = 0.5,
+        trend_beta: float = 0.3,
+        scale_floor: float = 0.3,
+        z_threshold: float = 3.5,
+        warmup: int = 20,
+        cusum_drift: float = 0.5,
+        cusum_threshold: float = 8.0,
+        hold_points: int = 10,
+        hold_seconds: float = 300.0,
+        max_events: int = 1000,
+    ) -> None:
+        self._alpha = alpha
+        self._level_alpha = level_alpha
+        self._trend_beta = trend_beta
+        self._scale_floor = scale_floor
+        self._z_threshold = z_threshold
+        self._warmup = warmup
+        self._cusum_drift = cusum_drift
+        self._cusum_threshold = cusum_threshold
+        self._hold_points = hold_points
+        self._hold = timedelta(seconds=hold_seconds)
+        self._streams: dict[tuple[str, str], _StreamState] = {}
+        self._active: dict[tuple[str, str], TelemetryAnomaly] = {}
+        self._events: deque[TelemetryAnomaly] = deque(maxlen=max_events)
+
+    def update(self, component_id: str, metric_name: str, value: float, timestamp: datetime) -> TelemetryAnomaly | None:
+        key = (component_id, metric_name)
+        state = self._streams.get(key)
+        if state is None:
+            self._streams[key] = _StreamState(value)
+            return None
+
+        expected = state.level + state.trend
+        residual = value - expected
+        std = max(math.sqrt(state.residual_variance), self._scale_floor * math.sqrt(state.variance))
+        z_score = residual / std if std > 1e-9 else 0.0
+
+        # West's incremental EWMA updates: spread of the values and of the forecast residuals.
+        deviation = value - state.mean
+        increment = self._alpha * deviation
+        state.mean += increment
+        state.variance = (1.0 - self._alpha) * (state.variance + deviation * increment)
+        state.residual_variance = (1.0 - self._alpha) * (
+            state.residual_variance + self._alpha * residual * residual
+        )
+        # Holt's update: the level moves toward the new value and the trend toward the level's step.
+        level = expected + self._level_alpha * residual
+        state.trend += self._trend_beta * (level - state.level - state.trend)
+        state.level = level
+        state.count += 1
+
+        if state.hold > 0:
+            state.hold -= 1
+            if state.hold == 0:
+                self._active.pop(key, None)
+
+        if state.count <= self._warmup:
+            return None
+
+        kind: str | None = None
+        if abs(z_score) >= self._z_threshold:
+            kind = "spike"
+        else:
+            state.cusum_high = max(0.0, state.cusum_high + z_score - self._cusum_drift)
+            state.cusum_low = max(0.0, state.cusum_low - z_score - self._cusum_drift)
+            if state.cusum_high >= self._cusum_threshold or state.cusum_low >= self._cusum_threshold:
+                kind = "level_shift"
+                state.cusum_high = 0.0
+                state.cusum_low = 0.0
+
+        if kind is None:
+            return None
+
+        anomaly = TelemetryAnomaly(
+            component_id=component_id,
+            metric_name=metric_name,
+            kind=kind,
+            value=value,
+            expected=expected,
+            z_score=z_score,
+            detected_at=timestamp,
+        )
+        state.hold = self._hold_points
+        self._active[key] = anomaly
+        self._events.append(anomaly)
+        return anomaly
+
+    def forget(self, component_id: str) -> None:
+        """Drop the component's active anomalies and streams; it warms up again when it next reports."""
+        for key in [key for key in self._streams if key[0] == component_id]:
+            del self._streams[key]
+            self._active.pop(key, None)
+
+    def active(self, component_ids: Iterable[str] | None = None, now: datetime | None = None) -> list[TelemetryAnomaly]:
+        if now is not None:
+            cutoff = now - self._hold
+            for key in [key for key, anomaly in self._active.items() if anomaly.detected_at < cutoff]:
+                del self._active[key]
+                self._streams[key].hold = 0
+        if component_ids is None:
+            return list(self._active.values())
+        wanted = set(component_ids)
+        return [anomaly for (component_id, _), anomaly in self._active.items() if component_id in wanted]
+
+    def recent(self, component_ids: Iterable[str] | None = None, limit: int = 50) -> list[TelemetryAnomaly]:
+        wanted = set(component_ids) if component_ids is not None else None
+        selected: list[TelemetryAnomaly] = []
+        for anomaly in reversed(self._events):
+            if wanted is not None and anomaly.component_id not in wanted:
+                continue
+            selected.append(anomaly)
+            if len(selected) >= limit:
+                break
+        return selected
@@ -0,0 +1,264 @@
+"""Headless batch simulation with chunked columnar output.
+
+``BatchRunner`` steps a ``UniversalSimulationEngine`` on a fixed-step clock
+as fast as the CPU allows and flattens every step into three tables:
+``systems`` (risk and aggregate load), ``components`` (load, health, state)
+and ``telemetry`` (every point emitted during the step). Rows are buffered
+column by column and flushed to a new compressed part file whenever a table
+reaches ``chunk_rows``, so memory stays bounded by the chunk size no matter
+how long the run is. A ``manifest.json`` describing the schema and parts is
+written at the end.
+"""
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from core.state import SystemState
+
+OUTPUT_FORMATS: frozenset[str] = frozenset({"json.gz", "parquet"})
+
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "systems": (
+        "step",
+        "timestamp",
+        "system_id",
+        "system_type",
+        "aggregate_load",
+        "average_utilization",
+        "risk_score",
+        "risk_level",
+        "bottlenecks",
+        "predicted_failures",
+        "anomalies",
+        "constraint_violations",
+    ),
+    "components": (
+        "step",
+        "timestamp",
+        "system_id",
+        "component_id",
+        "component_type",
+        "current_load",
+        "capacity",
+        "utilization",
+        "health_status",
+        "operational_state",
+    ),
+    "telemetry": (
+        "step",
+        "timestamp",
+        "system_id",
+        "component_id",
+        "metric_name",
+        "metric_value",
+        "units",
+    ),
+}
+
+
+class ColumnarChunkWriter:
+    """Buffer rows of one table as columns and write them out in parts."""
+
+    def __init__(self, directory: Path, table: str, columns: tuple[str, ...], chunk_rows: int, fmt: str) -> None:
+        if fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {fmt}. Valid: {sorted(OUTPUT_FORMATS)}")
+        if fmt == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            raise ValueError("Parquet output requires the optional 'pyarrow' package")
+        self._directory = directory / table
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._table = table
+        self._columns = columns
+        self._chunk_rows = max(1, chunk_rows)
+        self._format = fmt
+        self._buffer: dict[str, list[Any]] = {name: [] for name in columns}
+        self._pending = 0
+        self.rows_written = 0
+        self.parts: list[dict[str, Any]] = []
+
+    def append(self, row: tuple[Any, ...]) -> None:
+        for name, value in zip(self._columns, row):
+            self._buffer[name].append(value)
+        self._pending += 1
+        if self._pending >= self._chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._pending == 0:
+            return
+        path = self._directory / f"part-{len(self.parts):05d}.{self._format}"
+        if self._format == "parquet":
+            self._write_parquet(path)
+        else:
+            payload = {"table": self._table, "rows": self._pending, "columns": self._buffer}
+            with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as handle:
+                json.dump(payload, handle, separators=(",", ":"))
+
+        self.parts.append({"path": str(path.relative_to(self._directory.parent)), "rows": self._pending})
+        self.rows_written += self._pending
+        self._buffer = {name: [] for name in self._columns}
+        self._pending = 0
+
+    def _write_parquet(self, path: Path) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.table(self._buffer), path, compression="zstd")
+
+
+@dataclass
+class BatchSummary:
+    output_dir: str
+    steps: int
+    step_seconds: float
+    systems: int
+    started_at: str
+    finished_at: str
+    wall_seconds: float
+    tables: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "output_dir": self.output_dir,
+            "steps": self.steps,
+            "step_seconds": self.step_seconds,
+            "systems": self.systems,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "steps_per_second": round(self.steps / self.wall_seconds, 2) if self.wall_seconds > 0 else None,
+            "tables": self.tables,
+        }
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        engine: Any,
+        output_dir: str | Path,
+        chunk_rows: int = 50_000,
+        fmt: str = "json.gz",
+        tables: tuple[str, ...] = tuple(TABLE_COLUMNS),
+    ) -> None:
+        unknown = [table for table in tables if table not in TABLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown tables: {unknown}. Valid: {list(TABLE_COLUMNS)}")
+        self._engine = engine
+        self._output_dir = Path(output_dir)
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        self._writers = {
+            table: ColumnarChunkWriter(self._output_dir, table, TABLE_COLUMNS[table], chunk_rows, fmt)
+            for table in tables
+        }
+        self._format = fmt
+        self._step = 0
+
+    def _collect(self, system: SystemState) -> int:
+        writers = self._writers
+        step = self._step
+        now: datetime = system.risk_state.updated_at
+        stamp = now.isoformat()
+
+        systems_writer = writers.get("systems")
+        if systems_writer is not None:
+            aggregate_load = average_utilization = None
+            for point in reversed(system.telemetry):
+                if point.timestamp != now:
+                    break
+                if point.metric_name == "aggregate_load":
+                    aggregate_load = point.metric_value
+                elif point.metric_name == "average_utilization":
+                    average_utilization = point.metric_value
+            risk = system.risk_state
+            systems_writer.append(
+                (
+                    step,
+                    stamp,
+                    system.system_id,
+                    system.system_type,
+                    aggregate_load,
+                    average_utilization,
+                    risk.risk_score,
+                    risk.risk_level.value,
+                    len(risk.bottlenecks),
+                    len(risk.predicted_failures),
+                    len(risk.anomalies),
+                    len(risk.constraint_violations),
+                )
+            )
+
+        components_writer = writers.get("components")
+        telemetry_writer = writers.get("telemetry")
+        for component in system.components:
+            if components_writer is not None:
+                components_writer.append(
+                    (
+                        step,
+                        stamp,
+                        system.system_id,
+                        component.component_id,
+                        component.component_type,
+                        component.current_load,
+                        component.capacity,
+                        component.current_load / component.capacity if component.capacity > 0.0 else 0.0,
+                        component.health_status.value,
+                        component.operational_state.value,
+                    )
+                )
+            if telemetry_writer is not None:
+                # Points from this step are the trailing run stamped with the step time.
+                start = len(component.telemetry)
+                while start > 0 and component.telemetry[start - 1].timestamp == now:
+                    start -= 1
+                for point in component.telemetry[start:]:
+                    telemetry_writer.append(
+                        (
+                            step,
+                            stamp,
+                            system.system_id,
+                            component.component_id,
+                            point.metric_name,
+                            point.metric_value,
+                            point.units,
+                        )
+                    )
+        return 1
+
+    async def run(self, steps: int, step_seconds: float = 1.0) -> BatchSummary:
+        started_at = self._engine.clock.now()
+        wall_start = time.perf_counter()
+        systems = 0
+        for _ in range(steps):
+            await self._engine.advance(1, step_seconds)
+            self._step += 1
+            systems = sum(await self._engine.read_systems(self._collect))
+        for writer in self._writers.values():
+            writer.flush()
+        wall_seconds = time.perf_counter() - wall_start
+
+        summary = BatchSummary(
+            output_dir=str(self._output_dir),
+            steps=steps,
+            step_seconds=step_seconds,
+            systems=systems,
+            started_at=started_at.isoformat(),
+            finished_at=self._engine.clock.now().isoformat(),
+            wall_seconds=wall_seconds,
+            tables={
+                table: {
+                    "columns": list(TABLE_COLUMNS[table]),
+                    "rows": writer.rows_written,
+                    "parts": writer.parts,
+                }
+                for table, writer in self._writers.items()
+            },
+        )
+        manifest = {"format": self._format, **summary.to_dict()}
+        (self._output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return summary
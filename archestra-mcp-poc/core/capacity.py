@@ -0,0 +1,389 @@
+"""Max-flow / min-cut capacity analysis over a system's topology.
+
+Every component is split into an in-node and an out-node joined by an arc
+carrying the component's capacity (nothing while it is OFFLINE), and every
+topology edge becomes an arc from its source's out-node to its target's
+in-node carrying ``max_throughput`` (unbounded when unset). Flow runs from a
+super source into the chosen source components to a super sink out of the
+chosen sinks; by default these are the components without feeders and the
+components without successors.
+
+The max flow is found with Dinic's algorithm. The min cut is the set of
+arcs leaving the part of the residual network still reachable from the
+source: those are the limiting components and edges, and their capacities
+sum to the max flow. The flow is also split into source-to-sink paths.
+
+``CapacityPaths`` keeps the solved network per system, source and sink
+selection, tagged with the system's topology version, which the engines
+bump on control actions that change capacity or operational state.
+Repeated queries at the same version return the stored result. After a
+change only the component arcs whose capacity moved are updated: a raise
+keeps the current flow feasible and the solver augments from it, a cut
+below the flow already carried rebuilds the network.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict, deque
+from typing import Any, Iterable
+
+from core.state import ComponentState, SystemState
+from models import OperationalState
+
+# Control actions after which a system's capacity network may differ.
+TOPOLOGY_ACTIONS = frozenset(
+    {
+        "increase_capacity",
+        "scale_capacity",
+        "expand_capacity",
+        "isolate_component",
+        "set_operational_state",
+        "restore_component",
+    }
+)
+MAX_REPORTED_PATHS = 50
+_EPSILON = 1e-9
+_UNBOUNDED = float("inf")
+
+
+class FlowNetwork:
+    """Split-node flow network of one system, solved in place with Dinic's algorithm."""
+
+    __slots__ = (
+        "component_ids",
+        "capacities",
+        "edges",
+        "sources",
+        "sinks",
+        "flow",
+        "_head",
+        "_residual",
+        "_limit",
+        "_arcs",
+        "_source",
+        "_sink",
+    )
+
+    def __init__(self, system: SystemState, sources: tuple[int, ...], sinks: tuple[int, ...]) -> None:
+        components = system.components
+        position = {component.component_id: index for index, component in enumerate(components)}
+        self.component_ids = [component.component_id for component in components]
+        self.capacities = [_component_capacity(component) for component in components]
+        self.sources = sources
+        self.sinks = sinks
+        count = 2 * len(components) + 2
+        self._source = count - 2
+        self._sink = count - 1
+        self._head: list[int] = []
+        self._residual: list[float] = []
+        self._limit: list[float] = []
+        self._arcs: list[list[int]] = [[] for _ in range(count)]
+        # Arc 2 * i is component i's in-to-out arc.
+        for index, capacity in enumerate(self.capacities):
+            self._add_arc(2 * index, 2 * index + 1, capacity)
+        # (source index, target index, relation type, max throughput, arc)
+        self.edges: list[tuple[int, int, str, float | None, int]] = []
+        for edge in system.topology_graph.edges:
+            source = position.get(edge.source_component_id)
+            target = position.get(edge.target_component_id)
+            if source is None or target is None or source == target:
+                continue
+            limit = _UNBOUNDED if edge.max_throughput is None else max(0.0, edge.max_throughput)
+            arc = self._add_arc(2 * source + 1, 2 * target, limit)
+            self.edges.append((source, target, edge.relation_type, edge.max_throughput, arc))
+        for index in sources:
+            self._add_arc(self._source, 2 * index, _UNBOUNDED)
+        for index in sinks:
+            self._add_arc(2 * index + 1, self._sink, _UNBOUNDED)
+        self.flow = 0.0
+        self.augment()
+
+    def _add_arc(self, tail: int, head: int, limit: float) -> int:
+        arc = len(self._head)
+        self._head.extend((head, tail))
+        self._residual.extend((limit, 0.0))
+        self._limit.extend((limit, 0.0))
+        self._arcs[tail].append(arc)
+        self._arcs[head].append(arc + 1)
+        return arc
+
+    def arc_flow(self, arc: int) -> float:
+        return self._residual[arc + 1]
+
+    def set_capacity(self, index: int, capacity: float) -> bool:
+        """Change component ``index``'s capacity, keeping the current flow when it still fits.
+
+        Returns False when the component already carries more than ``capacity``;
+        the network must then be rebuilt.
+        """
+        arc = 2 * index
+        if capacity < self.arc_flow(arc) - _EPSILON:
+            return False
+        self._residual[arc] = max(0.0, self._residual[arc] + capacity - self._limit[arc])
+        self._limit[arc] = capacity
+        self.capacities[index] = capacity
+        return True
+
+    def augment(self) -> float:
+        """Push flow until no augmenting path is left; returns the total flow."""
+        while True:
+            level = self._levels()
+            if level[self._sink] < 0:
+                return self.flow
+            following = [0] * len(self._arcs)
+            while True:
+                pushed = self._push(level, following)
+                if pushed <= _EPSILON:
+                    break
+                self.flow += pushed
+
+    def _levels(self) -> list[int]:
+        level = [-1] * len(self._arcs)
+        level[self._source] = 0
+        queue = deque([self._source])
+        head, residual, arcs = self._head, self._residual, self._arcs
+        while queue:
+            node = queue.popleft()
+            for arc in arcs[node]:
+                target = head[arc]
+                if level[target] < 0 and residual[arc] > _EPSILON:
+                    level[target] = level[node] + 1
+                    queue.append(target)
+        return level
+
+    def _push(self, level: list[int], following: list[int]) -> float:
+        """Find one path in the level graph (iteratively, so long chains do not recurse) and saturate it."""
+        head, residual, arcs = self._head, self._residual, self._arcs
+        path: list[int] = []
+        node = self._source
+        while True:
+            if node == self._sink:
+                pushed = min(residual[arc] for arc in path)
+                for arc in path:
+                    residual[arc] -= pushed
+                    residual[arc ^ 1] += pushed
+                return pushed
+            node_arcs = arcs[node]
+            while following[node] < len(node_arcs):
+                arc = node_arcs[following[node]]
+                target = head[arc]
+                if residual[arc] > _EPSILON and level[target] == level[node] + 1:
+                    break
+                following[node] += 1
+            else:
+                # Dead end: drop the node from this phase and step back.
+                level[node] = -1
+                if not path:
+                    return 0.0
+                arc = path.pop()
+                node = head[arc ^ 1]
+                following[node] += 1
+                continue
+            path.append(arc)
+            node = head[arc]
+
+    def min_cut(self) -> tuple[list[int], list[int]]:
+        """Components and edges (by position in ``edges``) on the cut next to the source side."""
+        reached = [False] * len(self._arcs)
+        reached[self._source] = True
+        queue = deque([self._source])
+        head, residual, arcs = self._head, self._residual, self._arcs
+        while queue:
+            node = queue.popleft()
+            for arc in arcs[node]:
+                target = head[arc]
+                if not reached[target] and residual[arc] > _EPSILON:
+                    reached[target] = True
+                    queue.append(target)
+        components = [
+            index for index in range(len(self.capacities)) if reached[2 * index] and not reached[2 * index + 1]
+        ]
+        edges = [
+            position
+            for position, (source, target, _, _, _) in enumerate(self.edges)
+            if reached[2 * source + 1] and not reached[2 * target]
+        ]
+        return components, edges
+
+    def paths(self) -> list[tuple[list[int], float]]:
+        """Split the flow into source-to-sink component paths, largest first."""
+        remaining = {arc: self.arc_flow(arc) for arc in range(0, len(self._head), 2) if self.arc_flow(arc) > _EPSILON}
+        head = self._head
+        component_arcs = 2 * len(self.capacities)
+        found: list[tuple[list[int], float]] = []
+        while True:
+            route: list[int] = []
+            visited = {self._source}
+            node = self._source
+            while node != self._sink:
+                arc = next(
+                    (arc for arc in self._arcs[node] if remaining.get(arc, 0.0) > _EPSILON and head[arc] not in visited),
+                    None,
+                )
+                if arc is None:
+                    break
+                route.append(arc)
+                node = head[arc]
+                visited.add(node)
+            if node != self._sink or not route:
+                break
+            amount = min(remaining[arc] for arc in route)
+            for arc in route:
+                remaining[arc] -= amount
+            found.append(([arc // 2 for arc in route if arc < component_arcs], amount))
+        found.sort(key=lambda item: -item[1])
+        return found
+
+
+def _component_capacity(component: ComponentState) -> float:
+    if component.operational_state == OperationalState.OFFLINE:
+        return 0.0
+    return max(0.0, component.capacity)
+
+
+def _resolve_endpoints(
+    system: SystemState,
+    source_component_ids: tuple[str, ...] | None,
+    sink_component_ids: tuple[str, ...] | None,
+) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    position = {component.component_id: index for index, component in enumerate(system.components)}
+    fed: set[int] = set()
+    feeding: set[int] = set()
+    for edge in system.topology_graph.edges:
+        source = position.get(edge.source_component_id)
+        target = position.get(edge.target_component_id)
+        if source is not None and target is not None and source != target:
+            feeding.add(source)
+            fed.add(target)
+    everything = range(len(system.components))
+    sources = _endpoints(system, position, source_component_ids, [i for i in everything if i not in fed], "source")
+    sinks = _endpoints(system, position, sink_component_ids, [i for i in everything if i not in feeding], "sink")
+    if set(sources) & set(sinks):
+        raise ValueError("Source and sink components must be different")
+    return sources, sinks
+
+
+def _endpoints(
+    system: SystemState,
+    position: dict[str, int],
+    component_ids: tuple[str, ...] | None,
+    default: list[int],
+    role: str,
+) -> tuple[int, ...]:
+    if component_ids is None:
+        if not default:
+            raise ValueError(f"System {system.system_id} has no default {role} components; pass them explicitly")
+        return tuple(default)
+    if not component_ids:
+        raise ValueError(f"At least one {role} component is required")
+    for component_id in component_ids:
+        if component_id not in position:
+            raise ValueError(f"Component {component_id} is not in system {system.system_id}")
+    return tuple(sorted(position[component_id] for component_id in component_ids))
+
+
+class _Entry:
+    __slots__ = ("version", "network", "result")
+
+    def __init__(self, version: int, network: FlowNetwork, result: dict[str, Any]) -> None:
+        self.version = version
+        self.network = network
+        self.result = result
+
+
+class CapacityPaths:
+    """Solved capacity networks per system and endpoint selection, pinned to topology versions."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._versions: dict[str, int] = {}
+        self._entries: OrderedDict[tuple[str, tuple[str, ...] | None, tuple[str, ...] | None], _Entry] = OrderedDict()
+        self._max_entries = max_entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def topology_version(self, system_id: str) -> int:
+        return self._versions.get(system_id, 0)
+
+    def invalidate(self, system_id: str) -> None:
+        """Record that capacities or operational states of ``system_id`` may have changed."""
+        self._versions[system_id] = self._versions.get(system_id, 0) + 1
+
+    def compute(
+        self,
+        system: SystemState,
+        source_component_ids: Iterable[str] | None = None,
+        sink_component_ids: Iterable[str] | None = None,
+    ) -> dict[str, Any]:
+        requested_sources = None if source_component_ids is None else tuple(dict.fromkeys(source_component_ids))
+        requested_sinks = None if sink_component_ids is None else tuple(dict.fromkeys(sink_component_ids))
+        # Keyed by the request as given, so a repeated query is answered before any topology walk.
+        key = (system.system_id, requested_sources, requested_sinks)
+        version = self.topology_version(system.system_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if entry.version == version:
+                return {**entry.result, "computation": "cached"}
+            network = entry.network
+            computation = "incremental"
+            for index, component in enumerate(system.components):
+                capacity = _component_capacity(component)
+                if capacity != network.capacities[index] and not network.set_capacity(index, capacity):
+                    network = FlowNetwork(system, network.sources, network.sinks)
+                    computation = "full"
+                    break
+            else:
+                network.augment()
+        else:
+            network = FlowNetwork(system, *_resolve_endpoints(system, requested_sources, requested_sinks))
+            computation = "full"
+
+        result = _result(system, network, version)
+        self._entries[key] = _Entry(version, network, result)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return {**result, "computation": computation}
+
+
+def _result(system: SystemState, network: FlowNetwork, version: int) -> dict[str, Any]:
+    ids = network.component_ids
+    cut_components, cut_edges = network.min_cut()
+    limiting: list[dict[str, Any]] = [
+        {"kind": "component", "component_id": ids[index], "capacity": round(network.capacities[index], 4)}
+        for index in cut_components
+    ]
+    for position in cut_edges:
+        source, target, relation_type, max_throughput, _ = network.edges[position]
+        limiting.append(
+            {
+                "kind": "edge",
+                "source_component_id": ids[source],
+                "target_component_id": ids[target],
+                "relation_type": relation_type,
+                "max_throughput": max_throughput,
+            }
+        )
+    paths = network.paths()
+    return {
+        "system_id": system.system_id,
+        "topology_version": version,
+        "sources": [ids[index] for index in network.sources],
+        "sinks": [ids[index] for index in network.sinks],
+        "max_flow": round(network.flow, 4),
+        "limiting": limiting,
+        "paths": [
+            {"component_ids": [ids[index] for index in route], "flow": round(amount, 4)}
+            for route, amount in paths[:MAX_REPORTED_PATHS]
+        ],
+        "paths_truncated": len(paths) > MAX_REPORTED_PATHS,
+        "edge_flows": [
+            {
+                "source_component_id": ids[source],
+                "target_component_id": ids[target],
+                "flow": round(network.arc_flow(arc), 4),
+                "max_throughput": max_throughput,
+                "saturated": max_throughput is not None and network.arc_flow(arc) >= max_throughput - 1e-6,
+            }
+            for source, target, _, max_throughput, arc in network.edges
+        ],
+    }
@@ -0,0 +1,324 @@
+"""Bounded in-memory change feed keyed by state version.
+
+After every simulation step and control action the engine hands each
+touched system to ``ChangeLog.record_system``, which compares it with the
+values last published for it and appends one entry per component whose
+load moved by more than ``LOAD_DEADBAND`` of its capacity, or whose
+capacity, health or operational state changed, plus an entry for each
+risk-level transition. Control actions get their own entry. Entries carry
+full current values rather than deltas, so a client applies them in
+version order and re-applying one is harmless.
+
+The log keeps the newest ``max_entries`` entries. ``floor`` is the highest
+version with an evicted entry: a client whose version is below it has
+missed changes and must resync from a full read. So must a client whose
+version is ahead of the engine or whose epoch differs, since versions
+restart at zero with every process.
+
+The log also remembers, without a bound, the version at which each
+component and each risk field last changed, plus the time of recent
+versions, so ``get_system_state(since_version=...)`` can return a per
+system delta: the changed components with their new telemetry points,
+the system's new telemetry points and the changed risk fields. A version
+whose time has been forgotten needs a resync like one below ``floor``.
+"""
+from __future__ import annotations
+
+import bisect
+import secrets
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from core.projection import clamp_telemetry_limit
+from core.state import COMPONENT_FIELDS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from core.state import SystemState, TelemetryRecord
+
+LOAD_DEADBAND = 0.01
+DEFAULT_MAX_ENTRIES = 20_000
+MAX_PAGE_ENTRIES = 5_000
+RISK_FIELDS: tuple[str, ...] = (
+    "risk_score",
+    "risk_level",
+    "bottlenecks",
+    "predicted_failures",
+    "recommendations",
+    "anomalies",
+    "constraint_violations",
+)
+_DELTA_COMPONENT_FIELDS = COMPONENT_FIELDS - {"telemetry"}
+
+
+class ChangeLog:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.epoch = secrets.token_hex(4)
+        self.floor = 0
+        self._max_entries = max_entries
+        self._entries: deque[tuple[int, str, dict[str, Any]]] = deque()
+        self._published: dict[str, tuple[float, float, str, str]] = {}
+        self._risk_levels: dict[str, str] = {}
+        self._component_versions: dict[str, int] = {}
+        self._risk_fields: dict[str, dict[str, tuple[Any, int]]] = {}
+        self._version_times: deque[tuple[int, datetime]] = deque(maxlen=max_entries)
+
+    def track(self, system: SystemState) -> None:
+        """Take ``system`` as already known to clients without emitting entries."""
+        for component in system.components:
+            self._published[component.component_id] = (
+                component.current_load,
+                component.capacity,
+                component.health_status.value,
+                component.operational_state.value,
+            )
+        self._risk_levels[system.system_id] = system.risk_state.risk_level.value
+        self._risk_fields[system.system_id] = {
+            name: (value, 0) for name, value in _risk_values(system).items()
+        }
+
+    def mark(self, version: int, now: datetime) -> None:
+        """Remember the simulated time at which ``version`` was produced."""
+        self._version_times.append((version, now))
+
+    def time_of(self, version: int) -> datetime | None:
+        index = bisect.bisect_left(self._version_times, version, key=lambda item: item[0])
+        if index < len(self._version_times) and self._version_times[index][0] == version:
+            return self._version_times[index][1]
+        return None
+
+    def component_version(self, component_id: str) -> int:
+        return self._component_versions.get(component_id, 0)
+
+    def risk_changes(self, system_id: str, version: int) -> dict[str, Any]:
+        """Risk fields of ``system_id`` that changed after ``version``, with their current values."""
+        return {
+            name: value
+            for name, (value, changed_at) in self._risk_fields.get(system_id, {}).items()
+            if changed_at > version
+        }
+
+    def _append(self, version: int, system_type: str, entry: dict[str, Any]) -> None:
+        self._entries.append((version, system_type, entry))
+        if len(self._entries) > self._max_entries:
+            self.floor = self._entries.popleft()[0]
+
+    def record_system(self, version: int, system: SystemState) -> None:
+        for component in system.components:
+            load = component.current_load
+            capacity = component.capacity
+            health = component.health_status.value
+            state = component.operational_state.value
+            published = self._published.get(component.component_id)
+            if published is not None:
+                last_load, last_capacity, last_health, last_state = published
+                if (
+                    abs(load - last_load) <= LOAD_DEADBAND * max(capacity, 1e-6)
+                    and capacity == last_capacity
+                    and health == last_health
+                    and state == last_state
+                ):
+                    continue
+            self._published[component.component_id] = (load, capacity, health, state)
+            self._component_versions[component.component_id] = version
+            self._append(
+                version,
+                system.system_type,
+                {
+                    "version": version,
+                    "kind": "component",
+                    "system_id": system.system_id,
+                    "component_id": component.component_id,
+                    "current_load": round(load, 4),
+                    "capacity": round(capacity, 4),
+                    "health_status": health,
+                    "operational_state": state,
+                },
+            )
+
+        fields = self._risk_fields.setdefault(system.system_id, {})
+        for name, value in _risk_values(system).items():
+            known = fields.get(name)
+            if known is None or known[0] != value:
+                fields[name] = (value, version)
+
+        level = system.risk_state.risk_level.value
+        previous = self._risk_levels.get(system.system_id)
+        if previous != level:
+            self._risk_levels[system.system_id] = level
+            self._append(
+                version,
+                system.system_type,
+                {
+                    "version": version,
+                    "kind": "risk",
+                    "system_id": system.system_id,
+                    "risk_level": level,
+                    "previous_risk_level": previous,
+                    "risk_score": round(system.risk_state.risk_score, 4),
+                },
+            )
+
+    def record_action(
+        self,
+        version: int,
+        system: SystemState,
+        action_type: str,
+        accepted: bool,
+        impacted: list[str],
+        message: str,
+    ) -> None:
+        self._append(
+            version,
+            system.system_type,
+            {
+                "version": version,
+                "kind": "action",
+                "system_id": system.system_id,
+                "action_type": action_type,
+                "accepted": accepted,
+                "impacted_components": list(impacted),
+                "message": message,
+            },
+        )
+
+    def since(
+        self,
+        version: int,
+        current_version: int,
+        system_id: str | None = None,
+        system_type: str | None = None,
+        limit: int = 1000,
+        epoch: str | None = None,
+    ) -> dict[str, Any]:
+        """Return the changes after ``version``, ending on a whole version when ``limit`` cuts in."""
+        limit = max(1, min(int(limit), MAX_PAGE_ENTRIES))
+        payload: dict[str, Any] = {
+            "epoch": self.epoch,
+            "since": version,
+            "version": current_version,
+            "oldest_version": self.floor,
+        }
+        reason: str | None = None
+        if epoch is not None and epoch != self.epoch:
+            reason = f"epoch {epoch} is from another engine instance (current epoch {self.epoch})"
+        elif version > current_version:
+            reason = f"version {version} is ahead of the engine (current version {current_version})"
+        elif version < self.floor:
+            reason = f"version {version} is older than the change log (oldest retained version {self.floor})"
+        if reason is not None:
+            return {
+                **payload,
+                "resync_required": True,
+                "reason": f"{reason}; reload full state and continue from version {current_version}",
+                "changes": [],
+                "next_version": current_version,
+                "complete": True,
+            }
+
+        start = bisect.bisect_right(self._entries, version, key=lambda item: item[0])
+        changes: list[dict[str, Any]] = []
+        next_version = current_version
+        complete = True
+        last_version: int | None = None
+        for entry_version, entry_type, entry in islice(self._entries, start, None):
+            if len(changes) >= limit and entry_version != last_version:
+                next_version = last_version if last_version is not None else version
+                complete = False
+                break
+            last_version = entry_version
+            if system_type is not None and entry_type != system_type:
+                continue
+            if system_id is not None and entry["system_id"] != system_id:
+                continue
+            changes.append(entry)
+
+        return {
+            **payload,
+            "resync_required": False,
+            "changes": changes,
+            "next_version": next_version,
+            "complete": complete,
+        }
+
+
+def _risk_values(system: SystemState) -> dict[str, Any]:
+    risk_state = system.risk_state.model_dump(mode="json", include=set(RISK_FIELDS))
+    risk_state["risk_score"] = round(risk_state["risk_score"], 4)
+    return risk_state
+
+
+def _points_since(
+    points: Iterable[TelemetryRecord],
+    since_time: datetime | None,
+    limit: int,
+) -> list[dict[str, Any]]:
+    """The newest ``limit`` points after ``since_time`` (all points when it is None)."""
+    if limit <= 0:
+        return []
+    newer = [point for point in points if since_time is None or point.timestamp > since_time]
+    return [point.to_model().model_dump(mode="json") for point in newer[-limit:]]
+
+
+def system_delta(
+    changes: ChangeLog,
+    system: SystemState,
+    since_version: int,
+    current_version: int,
+    include_components: bool = True,
+    telemetry_limit: int = 25,
+) -> dict[str, Any]:
+    """What changed in ``system`` after ``since_version``: components, telemetry and risk fields.
+
+    ``telemetry_limit`` (at most 100) bounds the system's and each changed component's new points.
+    """
+    payload: dict[str, Any] = {
+        "system_id": system.system_id,
+        "epoch": changes.epoch,
+        "since_version": since_version,
+        "version": current_version,
+    }
+    if since_version > current_version or since_version < 0:
+        return {
+            **payload,
+            "resync_required": True,
+            "reason": (
+                f"since_version {since_version} is not a version of this engine "
+                f"(current version {current_version}); reload full state"
+            ),
+        }
+
+    # Version 0 is the initial state, before any step was timed: everything retained is newer.
+    since_time = changes.time_of(since_version)
+    if since_time is None and since_version > 0:
+        return {
+            **payload,
+            "resync_required": True,
+            "reason": (
+                f"since_version {since_version} is older than the retained version history "
+                f"(current version {current_version}); reload full state"
+            ),
+        }
+
+    safe_limit = clamp_telemetry_limit(telemetry_limit)
+    payload["resync_required"] = False
+    payload["risk_state"] = changes.risk_changes(system.system_id, since_version)
+    if include_components:
+        changed = [
+            component
+            for component in system.components
+            if changes.component_version(component.component_id) > since_version
+        ]
+        payload["components"] = [
+            {
+                **component.to_model(fields=_DELTA_COMPONENT_FIELDS).model_dump(mode="json", exclude={"telemetry"}),
+                "telemetry": _points_since(component.telemetry, since_time, safe_limit),
+            }
+            for component in changed
+        ]
+        payload["unchanged_components"] = len(system.components) - len(changed)
+    payload["telemetry"] = _points_since(system.telemetry, since_time, safe_limit)
+    return payload
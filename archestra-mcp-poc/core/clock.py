@@ -0,0 +1,150 @@
+"""Injectable simulation clock.
+
+The engines read time only through a ``SimulationClock`` so that a whole
+simulation step shares one timestamp and the simulation can run detached
+from wall-clock time:
+
+* ``realtime``    - virtual time follows wall-clock time.
+* ``accelerated`` - virtual time runs ``speed`` times faster than wall-clock;
+  selecting it at speed 1.0 applies ``DEFAULT_ACCELERATION``.
+* ``fixed_step``  - time only moves when ``advance`` is called.
+* ``paused``      - time is frozen until ``resume`` is called.
+
+Servers expose these controls through the ``control_simulation_clock`` tool
+and the ``/clock`` endpoint, so a clock started in ``fixed_step`` or
+``paused`` mode can be advanced or resumed.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+CLOCK_MODES: frozenset[str] = frozenset({"realtime", "accelerated", "fixed_step", "paused"})
+
+# Largest single ``advance`` the engines simulate step by step on request.
+MAX_ADVANCE_SECONDS = 3600.0
+# Speed of accelerated mode when it is selected without a speed other than realtime's.
+DEFAULT_ACCELERATION = 10.0
+
+
+def _accelerated_speed(speed: float) -> float:
+    return DEFAULT_ACCELERATION if speed == 1.0 else speed
+
+
+class SimulationClock:
+    def __init__(
+        self,
+        mode: str = "realtime",
+        speed: float = 1.0,
+        start: datetime | None = None,
+    ) -> None:
+        if mode not in CLOCK_MODES:
+            raise ValueError(f"Unknown clock mode: {mode}. Valid: {sorted(CLOCK_MODES)}")
+        if speed <= 0.0:
+            raise ValueError("Clock speed must be greater than zero")
+        self._lock = threading.Lock()
+        self._mode = mode
+        self._speed = _accelerated_speed(speed) if mode == "accelerated" else 1.0
+        self._anchor_virtual = start or datetime.now(timezone.utc)
+        self._anchor_real = time.monotonic()
+        self._resume_mode = mode if mode != "paused" else "realtime"
+        self._resume_speed = self._speed
+
+    @classmethod
+    def from_env(cls) -> SimulationClock:
+        mode = os.getenv("SIM_CLOCK_MODE", "realtime").strip().lower() or "realtime"
+        raw_speed = os.getenv("SIM_CLOCK_SPEED", "1").strip()
+        try:
+            speed = float(raw_speed)
+        except ValueError as exc:
+            raise ValueError(f"Invalid SIM_CLOCK_SPEED: {raw_speed}") from exc
+        return cls(mode=mode, speed=speed)
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @property
+    def is_running(self) -> bool:
+        return self._mode in {"realtime", "accelerated"}
+
+    def _now_locked(self) -> datetime:
+        if not self.is_running:
+            return self._anchor_virtual
+        elapsed = (time.monotonic() - self._anchor_real) * self._speed
+        return self._anchor_virtual + timedelta(seconds=elapsed)
+
+    def _rebase_locked(self, mode: str, speed: float) -> None:
+        self._anchor_virtual = self._now_locked()
+        self._anchor_real = time.monotonic()
+        self._mode = mode
+        self._speed = speed
+
+    def now(self) -> datetime:
+        with self._lock:
+            return self._now_locked()
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            payload: dict[str, Any] = {
+                "mode": self._mode,
+                "speed": self._speed,
+                "running": self.is_running,
+                "now": self._now_locked().isoformat(),
+            }
+            if self._mode == "paused":
+                payload["resume_mode"] = self._resume_mode
+                payload["resume_speed"] = self._resume_speed
+            return payload
+
+    def advance(self, seconds: float) -> datetime:
+        """Move virtual time forward; works in every mode."""
+        if seconds < 0.0:
+            raise ValueError("Cannot move the simulation clock backwards")
+        with self._lock:
+            self._anchor_virtual += timedelta(seconds=seconds)
+            return self._now_locked()
+
+    def pause(self) -> None:
+        with self._lock:
+            if self._mode != "paused":
+                self._resume_mode = self._mode
+                self._resume_speed = self._speed
+                self._rebase_locked("paused", 1.0)
+
+    def resume(self) -> None:
+        with self._lock:
+            if self._mode == "paused":
+                self._rebase_locked(self._resume_mode, self._resume_speed)
+
+    def set_speed(self, speed: float) -> None:
+        """Switch to accelerated mode at ``speed`` (1.0 returns to realtime).
+
+        A paused clock stays paused and runs at ``speed`` once resumed.
+        """
+        if speed <= 0.0:
+            raise ValueError("Clock speed must be greater than zero")
+        mode = "realtime" if speed == 1.0 else "accelerated"
+        with self._lock:
+            if self._mode == "paused":
+                self._resume_mode = mode
+                self._resume_speed = speed
+            else:
+                self._rebase_locked(mode, speed)
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in CLOCK_MODES:
+            raise ValueError(f"Unknown clock mode: {mode}. Valid: {sorted(CLOCK_MODES)}")
+        with self._lock:
+            speed = self._resume_speed if self._mode == "paused" else self._speed
+            if mode == "paused" and self._mode != "paused":
+                self._resume_mode = self._mode
+                self._resume_speed = self._speed
+            self._rebase_locked(mode, _accelerated_speed(speed) if mode == "accelerated" else 1.0)
@@ -0,0 +1,60 @@
+"""Single-flight coalescing of identical concurrent tool calls.
+
+Calls to a read-only tool with the same arguments, made while the state
+version is unchanged, share one in-flight computation: the first caller
+starts it as a task and later callers await the same task. The task is
+shielded, so a caller that disconnects does not cancel the work for the
+others, and it is forgotten as soon as it finishes, so nothing is cached
+beyond the burst that shares it.
+
+Randomized tools are shared too: an unseeded Monte Carlo call draws from
+the state version, so equal calls at one version return the same samples.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+_ToolT = TypeVar("_ToolT", bound=Callable[..., Awaitable[Any]])
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved; every waiter re-raises it on its own.
+            task.exception()
+
+
+def coalesced(flight: SingleFlight, state_version: Callable[[], int]) -> Callable[[_ToolT], _ToolT]:
+    """Share one computation between concurrent calls with equal arguments at one state version."""
+
+    def decorator(fn: _ToolT) -> _ToolT:
+        name = fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = json.dumps(bound.arguments, sort_keys=True, default=str, separators=(",", ":"))
+            return await flight.run((name, arguments, state_version()), lambda: fn(*args, **kwargs))
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
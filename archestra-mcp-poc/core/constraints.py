@@ -0,0 +1,219 @@
+"""Operational constraint evaluation.
+
+Each system's ``operational_constraints`` are compiled once into rules that
+name the telemetry metric (or derived utilization) they bound and the
+components that report it. On every tick the latest value of each rule's
+metric is gathered into a flat array and compared against the bounds in
+one pass. Violations are tracked with their start time so that duration
+and hard/soft classification are available to risk scoring and tools.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Collection, Iterable
+
+from core.state import ComponentState, SystemState
+from models import OperationalConstraint, OperationalState
+
+UTILIZATION = "utilization"
+
+# Constraint names whose metric cannot be read off the name itself.
+CONSTRAINT_METRICS: dict[str, str] = {
+    "max_frequency_deviation": "frequency",
+    "max_line_loading": UTILIZATION,
+    "max_bus_loading": UTILIZATION,
+    "min_flow": "flow_rate",
+    "target_ph_min": "ph",
+    "target_ph_max": "ph",
+}
+
+# Component types a utilization constraint is restricted to, when present.
+CONSTRAINT_COMPONENT_TYPES: dict[str, tuple[str, ...]] = {
+    "max_line_loading": ("transmission_line", "distribution_feeder"),
+    "max_bus_loading": ("switchyard",),
+}
+
+
+def _constraint_metric(constraint: OperationalConstraint) -> str:
+    mapped = CONSTRAINT_METRICS.get(constraint.name)
+    if mapped is not None:
+        return mapped
+    name = constraint.name
+    for prefix in ("max_", "min_", "target_"):
+        name = name.removeprefix(prefix)
+    for suffix in ("_min", "_max"):
+        name = name.removesuffix(suffix)
+    return name
+
+
+@dataclass(slots=True)
+class CompiledRule:
+    constraint: OperationalConstraint
+    metric: str
+    lower: float
+    upper: float
+    components: list[ComponentState]
+
+
+@dataclass(slots=True)
+class ConstraintViolation:
+    system_id: str
+    constraint: str
+    component_id: str
+    metric: str
+    value: float
+    min_value: float | None
+    max_value: float | None
+    hard_limit: bool
+    started_at: datetime
+    last_seen: datetime
+    cleared_at: datetime | None = None
+    samples: int = field(default=1)
+
+    @property
+    def key(self) -> str:
+        return f"{self.component_id}:{self.constraint}"
+
+    def to_dict(self, now: datetime | None = None) -> dict[str, Any]:
+        end = self.cleared_at or now or self.last_seen
+        return {
+            "system_id": self.system_id,
+            "constraint": self.constraint,
+            "component_id": self.component_id,
+            "metric": self.metric,
+            "value": round(self.value, 4),
+            "min_value": self.min_value,
+            "max_value": self.max_value,
+            "hard_limit": self.hard_limit,
+            "started_at": self.started_at.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "cleared_at": self.cleared_at.isoformat() if self.cleared_at else None,
+            "duration_seconds": round(max(0.0, (end - self.started_at).total_seconds()), 3),
+            "samples": self.samples,
+        }
+
+
+class ConstraintEngine:
+    def __init__(self, max_history: int = 500) -> None:
+        self._rules: dict[str, list[CompiledRule]] = {}
+        self._latest: dict[tuple[str, str], float] = {}
+        self._active: dict[str, dict[tuple[str, str], ConstraintViolation]] = {}
+        self._history: deque[ConstraintViolation] = deque(maxlen=max_history)
+
+    def compile_system(self, system: SystemState) -> None:
+        rules: list[CompiledRule] = []
+        for constraint in system.operational_constraints:
+            metric = _constraint_metric(constraint)
+            allowed_types = CONSTRAINT_COMPONENT_TYPES.get(constraint.name)
+            components = list(system.components)
+            if allowed_types:
+                typed = [component for component in components if component.component_type in allowed_types]
+                components = typed or components
+            rules.append(
+                CompiledRule(
+                    constraint=constraint,
+                    metric=metric,
+                    lower=constraint.min_value if constraint.min_value is not None else -math.inf,
+                    upper=constraint.max_value if constraint.max_value is not None else math.inf,
+                    components=components,
+                )
+            )
+        self._rules[system.system_id] = rules
+        self._active.setdefault(system.system_id, {})
+
+    def observe(self, component_id: str, metric: str, value: float) -> None:
+        self._latest[(component_id, metric)] = value
+
+    def _values(self, rule: CompiledRule) -> array[float]:
+        if rule.metric == UTILIZATION:
+            return array(
+                "d",
+                (
+                    component.current_load / component.capacity if component.capacity > 0.0 else 0.0
+                    for component in rule.components
+                ),
+            )
+        latest = self._latest
+        metric = rule.metric
+        return array("d", (latest.get((component.component_id, metric), math.nan) for component in rule.components))
+
+    def evaluate(
+        self,
+        system: SystemState,
+        now: datetime,
+        metrics: Collection[str] | None = None,
+    ) -> list[ConstraintViolation]:
+        """Evaluate the compiled rules of ``system`` and return its active violations.
+
+        With ``metrics`` only the rules on those metrics are evaluated (``load``
+        also covers utilization) and violations of the other rules are kept.
+        """
+        rules = self._rules.get(system.system_id)
+        if rules is None:
+            self.compile_system(system)
+            rules = self._rules[system.system_id]
+        evaluated: set[str] | None = None
+        if metrics is not None:
+            wanted = set(metrics)
+            if "load" in wanted:
+                wanted.add(UTILIZATION)
+            rules = [rule for rule in rules if rule.metric in wanted]
+            evaluated = {rule.constraint.name for rule in rules}
+
+        active = self._active[system.system_id]
+        seen: set[tuple[str, str]] = set()
+        for rule in rules:
+            values = self._values(rule)
+            lower, upper = rule.lower, rule.upper
+            # NaN (no sample yet) compares False on both sides, so it never violates.
+            flags = [value < lower or value > upper for value in values]
+            if not any(flags):
+                continue
+            constraint = rule.constraint
+            for component, value, flagged in zip(rule.components, values, flags):
+                if not flagged or component.operational_state == OperationalState.OFFLINE:
+                    continue
+                key = (component.component_id, constraint.name)
+                seen.add(key)
+                violation = active.get(key)
+                if violation is None:
+                    active[key] = ConstraintViolation(
+                        system_id=system.system_id,
+                        constraint=constraint.name,
+                        component_id=component.component_id,
+                        metric=rule.metric,
+                        value=value,
+                        min_value=constraint.min_value,
+                        max_value=constraint.max_value,
+                        hard_limit=constraint.hard_limit,
+                        started_at=now,
+                        last_seen=now,
+                    )
+                else:
+                    violation.value = value
+                    violation.last_seen = now
+                    violation.samples += 1
+
+        for key in [key for key in active if key not in seen and (evaluated is None or key[1] in evaluated)]:
+            cleared = active.pop(key)
+            cleared.cleared_at = now
+            self._history.append(cleared)
+
+        return list(active.values())
+
+    def active(self, system_ids: Iterable[str]) -> list[ConstraintViolation]:
+        return [violation for system_id in system_ids for violation in self._active.get(system_id, {}).values()]
+
+    def cleared(self, system_ids: Iterable[str], limit: int = 50) -> list[ConstraintViolation]:
+        wanted = set(system_ids)
+        selected: list[ConstraintViolation] = []
+        for violation in reversed(self._history):
+            if violation.system_id in wanted:
+                selected.append(violation)
+                if len(selected) >= limit:
+                    break
+        return selected
@@ -0,0 +1,293 @@
+"""N-1 contingency analysis.
+
+A system is flattened into a picklable ``ContingencySpec`` (parallel
+arrays plus adjacency lists) so every outage case works on its own copy of
+the load vector. Each case takes one component OFFLINE through the
+engines' own ``operational_state_effect`` (as ``isolate_component`` does)
+and propagates the effect over the topology:
+
+* components no longer reachable from a live source are de-energized and
+  their load becomes unserved;
+* the isolated component's load shifts onto the alternates that can still
+  carry it (other feeders of its successors and same-type peers), split by
+  capacity, or becomes unserved when there are none.
+
+The post-contingency state is scored with the engines' risk formula, with
+utilization averaged over the components still in service: counting the
+lost components at zero load would read as relief and make most outages
+look like they lower risk. Cases are ranked by ``impact`` = unserved
+fraction of base load + risk increase.
+Cases run in chunks (in the shared process pool for large systems) in
+descending order of load, so a deadline cuts off the least likely worst
+cases first.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from core.dynamics import FAILURE_UTILIZATION
+from core.parallel import get_process_pool, worker_count
+from core.risk import risk_level, risk_score
+from core.state import SystemState, operational_state_effect
+from models import HealthStatus, OperationalState
+
+# Below this many node+edge visits in total a job is cheaper inline than in the pool.
+INLINE_WORK_LIMIT = 2_000_000
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass(frozen=True)
+class ContingencySpec:
+    system_id: str
+    component_ids: tuple[str, ...]
+    component_types: tuple[str, ...]
+    capacities: tuple[float, ...]
+    loads: tuple[float, ...]
+    critical: tuple[bool, ...]
+    degraded: tuple[bool, ...]
+    offline: tuple[bool, ...]
+    anomalous: tuple[bool, ...]
+    hard_violating: tuple[bool, ...]
+    successors: tuple[tuple[int, ...], ...]
+    predecessors: tuple[tuple[int, ...], ...]
+
+    @property
+    def size(self) -> int:
+        return len(self.component_ids)
+
+
+def contingency_spec(
+    system: SystemState,
+    anomalous_ids: set[str],
+    hard_violator_ids: set[str],
+) -> ContingencySpec:
+    components = system.components
+    position = {component.component_id: index for index, component in enumerate(components)}
+    successors: list[list[int]] = [[] for _ in components]
+    predecessors: list[list[int]] = [[] for _ in components]
+    for edge in system.topology_graph.edges:
+        source = position.get(edge.source_component_id)
+        target = position.get(edge.target_component_id)
+        if source is None or target is None or source == target:
+            continue
+        successors[source].append(target)
+        predecessors[target].append(source)
+
+    return ContingencySpec(
+        system_id=system.system_id,
+        component_ids=tuple(component.component_id for component in components),
+        component_types=tuple(component.component_type for component in components),
+        capacities=tuple(component.capacity for component in components),
+        loads=tuple(component.current_load for component in components),
+        critical=tuple(component.health_status == HealthStatus.CRITICAL for component in components),
+        degraded=tuple(component.health_status == HealthStatus.DEGRADED for component in components),
+        offline=tuple(component.operational_state == OperationalState.OFFLINE for component in components),
+        anomalous=tuple(component.component_id in anomalous_ids for component in components),
+        hard_violating=tuple(component.component_id in hard_violator_ids for component in components),
+        successors=tuple(tuple(items) for items in successors),
+        predecessors=tuple(tuple(items) for items in predecessors),
+    )
+
+
+def _energized(spec: ContingencySpec, offline: list[bool]) -> list[bool]:
+    """Components reachable from a live source (a component with no feeders)."""
+    reached = [False] * spec.size
+    queue = deque(
+        index for index in range(spec.size) if not offline[index] and not spec.predecessors[index]
+    )
+    for index in queue:
+        reached[index] = True
+    while queue:
+        index = queue.popleft()
+        for target in spec.successors[index]:
+            if not reached[target] and not offline[target]:
+                reached[target] = True
+                queue.append(target)
+    return reached
+
+
+def _take_offline(
+    spec: ContingencySpec,
+    index: int,
+    loads: list[float],
+    critical: list[bool],
+    degraded: list[bool],
+    offline: list[bool],
+) -> None:
+    health = (
+        HealthStatus.CRITICAL if critical[index] else HealthStatus.DEGRADED if degraded[index] else HealthStatus.HEALTHY
+    )
+    loads[index], health = operational_state_effect(
+        OperationalState.OFFLINE, loads[index], spec.capacities[index], health
+    )
+    offline[index] = True
+    critical[index] = health == HealthStatus.CRITICAL
+    degraded[index] = health == HealthStatus.DEGRADED
+
+
+def _score(
+    spec: ContingencySpec,
+    loads: list[float],
+    critical: list[bool],
+    degraded: list[bool],
+    offline: list[bool],
+    removed: frozenset[int] = frozenset(),
+) -> float:
+    """Risk score; utilization is averaged over the components not in ``removed``.
+
+    With nothing left in service none of the load can be carried, which counts as full utilization.
+    """
+    size = spec.size
+    remaining = size - len(removed)
+    utilization_total = sum(
+        loads[index] / max(spec.capacities[index], 1e-6) for index in range(size) if index not in removed
+    )
+    return risk_score(
+        utilization_total / remaining if remaining > 0 else 1.0,
+        sum(critical),
+        sum(degraded),
+        sum(1 for index in range(size) if spec.anomalous[index]),
+        sum(1 for index in range(size) if spec.hard_violating[index] and not offline[index]),
+        size,
+    )
+
+
+def base_risk_score(spec: ContingencySpec) -> float:
+    return _score(spec, list(spec.loads), list(spec.critical), list(spec.degraded), list(spec.offline))
+
+
+def evaluate_outage(spec: ContingencySpec, outage: int, base_energized: list[bool], base_score: float) -> dict[str, Any]:
+    loads = list(spec.loads)
+    offline = list(spec.offline)
+    critical = list(spec.critical)
+    degraded = list(spec.degraded)
+
+    lost_load = loads[outage]
+    _take_offline(spec, outage, loads, critical, degraded, offline)
+
+    unserved = 0.0
+    energized = _energized(spec, offline)
+    de_energized: list[int] = []
+    for index in range(spec.size):
+        if index != outage and base_energized[index] and not energized[index]:
+            de_energized.append(index)
+            unserved += loads[index]
+            _take_offline(spec, index, loads, critical, degraded, offline)
+
+    alternates: set[int] = set()
+    for successor in spec.successors[outage]:
+        alternates.update(
+            feeder for feeder in spec.predecessors[successor] if feeder != outage and energized[feeder]
+        )
+    outage_type = spec.component_types[outage]
+    alternates.update(
+        index
+        for index in range(spec.size)
+        if index != outage and energized[index] and spec.component_types[index] == outage_type
+    )
+
+    total_capacity = sum(spec.capacities[index] for index in alternates)
+    if total_capacity > 0.0:
+        for index in alternates:
+            loads[index] += lost_load * spec.capacities[index] / total_capacity
+            utilization = loads[index] / max(spec.capacities[index], 1e-6)
+            if utilization > FAILURE_UTILIZATION:
+                critical[index] = True
+                degraded[index] = False
+            elif utilization > 0.85 and not critical[index]:
+                degraded[index] = True
+    else:
+        unserved += lost_load
+
+    score = _score(spec, loads, critical, degraded, offline, frozenset([outage, *de_energized]))
+    base_load = sum(spec.loads)
+    unserved_fraction = unserved / base_load if base_load > 0.0 else 0.0
+    ids = spec.component_ids
+    return {
+        "component_id": ids[outage],
+        "component_type": outage_type,
+        "risk_score": round(score, 4),
+        "risk_level": risk_level(score).value,
+        "risk_delta": round(score - base_score, 4),
+        "unserved_load": round(unserved, 3),
+        "unserved_fraction": round(unserved_fraction, 4),
+        "impact": round(unserved_fraction + max(0.0, score - base_score), 4),
+        "de_energized": [ids[index] for index in de_energized],
+        "load_shifted_to": sorted(ids[index] for index in alternates) if total_capacity > 0.0 else [],
+        "overloaded": sorted(
+            ids[index] for index in alternates if loads[index] > spec.capacities[index]
+        ),
+        "newly_critical": sorted(
+            ids[index] for index in range(spec.size) if critical[index] and not spec.critical[index]
+        ),
+    }
+
+
+def evaluate_outages(spec: ContingencySpec, outages: list[int], deadline: float) -> list[dict[str, Any]]:
+    """Evaluate ``outages`` in order until done or wall-clock ``deadline``; module-level so it pickles."""
+    base_energized = _energized(spec, list(spec.offline))
+    base_score = base_risk_score(spec)
+    results: list[dict[str, Any]] = []
+    for outage in outages:
+        if time.time() >= deadline:
+            break
+        results.append(evaluate_outage(spec, outage, base_energized, base_score))
+    return results
+
+
+async def run_contingency_analysis(
+    spec: ContingencySpec,
+    deadline_seconds: float = 5.0,
+    limit: int | None = None,
+) -> dict[str, Any]:
+    if deadline_seconds <= 0.0:
+        raise ValueError("deadline_seconds must be greater than zero")
+
+    started = time.perf_counter()
+    deadline = time.time() + deadline_seconds
+    cases = sorted(
+        (index for index in range(spec.size) if not spec.offline[index]),
+        key=lambda index: spec.loads[index],
+        reverse=True,
+    )
+
+    edge_count = sum(len(items) for items in spec.successors)
+    work = len(cases) * (spec.size + edge_count)
+    results: list[dict[str, Any]] = []
+    if cases and work <= INLINE_WORK_LIMIT:
+        results = await asyncio.to_thread(evaluate_outages, spec, cases, deadline)
+    elif cases:
+        chunks = min(len(cases), worker_count() * CHUNKS_PER_WORKER)
+        # Strided chunks spread the heaviest cases over all workers.
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        futures = [
+            loop.run_in_executor(pool, evaluate_outages, spec, cases[offset::chunks], deadline)
+            for offset in range(chunks)
+        ]
+        done, pending = await asyncio.wait(futures, timeout=max(0.0, deadline - time.time()) + 0.5)
+        for future in pending:
+            future.cancel()
+        for future in done:
+            if future.exception() is None:
+                results.extend(future.result())
+
+    results.sort(key=lambda item: (-item["impact"], -item["risk_score"], item["component_id"]))
+    evaluated = {item["component_id"] for item in results}
+    base_score = base_risk_score(spec)
+    return {
+        "system_id": spec.system_id,
+        "base_risk_score": round(base_score, 4),
+        "base_risk_level": risk_level(base_score).value,
+        "total_cases": len(cases),
+        "evaluated": len(results),
+        "complete": len(results) == len(cases),
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "contingencies": results[:limit] if limit is not None else results,
+        "not_evaluated": [spec.component_ids[index] for index in cases if spec.component_ids[index] not in evaluated],
+        "already_offline": [spec.component_ids[index] for index in range(spec.size) if spec.offline[index]],
+    }
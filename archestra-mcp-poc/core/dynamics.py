@@ -0,0 +1,69 @@
+"""Stochastic per-step load dynamics shared by the engines and rollouts.
+
+Each function draws the next load of one component from ``rng`` in a
+fixed order, so the engines and the Monte Carlo rollouts in
+``core.montecarlo`` advance exactly the same model.
+"""
+from __future__ import annotations
+
+import math
+import random
+from typing import Callable
+
+# Utilization above which a component is marked CRITICAL.
+FAILURE_UTILIZATION = 0.98
+
+
+def next_power_load(capacity: float, timestamp: float, rng: random.Random) -> float:
+    oscillation = 0.5 + 0.5 * math.sin(timestamp / 30.0)
+    base = capacity * (0.55 + 0.3 * oscillation)
+    noise = rng.uniform(-2.5, 2.5)
+
+    if rng.random() < 0.08:
+        noise += rng.uniform(8.0, 16.0)
+
+    return max(0.0, min(capacity * 1.1, base + noise))
+
+
+def next_hydro_load(capacity: float, timestamp: float, rng: random.Random) -> float:
+    base = capacity * rng.uniform(0.45, 0.72)
+    surge = rng.uniform(10.0, 20.0) if rng.random() < 0.07 else 0.0
+    return max(0.0, min(capacity * 1.15, base + surge))
+
+
+def next_sewage_load(capacity: float, timestamp: float, rng: random.Random) -> float:
+    base = capacity * rng.uniform(0.5, 0.82)
+    overload = rng.uniform(6.0, 14.0) if rng.random() < 0.1 else 0.0
+    return max(0.0, min(capacity * 1.2, base + overload))
+
+
+def next_generic_load(capacity: float, timestamp: float, rng: random.Random) -> float:
+    base = capacity * rng.uniform(0.4, 0.75)
+    return max(0.0, min(capacity, base + rng.uniform(-1.0, 1.0)))
+
+
+LoadModel = Callable[[float, float, random.Random], float]
+
+LOAD_MODELS: dict[str, LoadModel] = {
+    "power_grid": next_power_load,
+    "hydro_plant": next_hydro_load,
+    "sewage_plant": next_sewage_load,
+}
+
+
+def load_model(system_type: str) -> LoadModel:
+    return LOAD_MODELS.get(system_type, next_generic_load)
+
+
+# Noise metrics reported by each component after its load, drawn uniformly in this order.
+NOISE_METRICS: dict[str, tuple[tuple[str, float, float, str], ...]] = {
+    "power_grid": (("voltage", 218.0, 242.0, "V"), ("frequency", 49.6, 50.4, "Hz")),
+    "hydro_plant": (("flow_rate", 35.0, 115.0, "m3/s"), ("turbidity", 2.0, 11.0, "NTU")),
+    "sewage_plant": (("ph", 6.4, 8.1, "pH"), ("do_level", 1.4, 8.6, "mg/L")),
+}
+
+LOAD_UNITS: dict[str, str] = {
+    "power_grid": "MW",
+    "hydro_plant": "MW",
+    "sewage_plant": "MLD",
+}
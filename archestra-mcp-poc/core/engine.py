@@ -0,0 +1,1368 @@
+"""The simulation engine shared by the universal server and the domain servers.
+
+``SimulationEngine`` owns the live systems and everything derived from
+them: the component index, the anomaly detector, the constraint engine, the
+change log, ingestion feeds, replay and capacity paths. Reads advance the
+simulation to the clock's current time first (see ``_tick_locked``); writes
+bump the state version. Every public method takes an optional
+``domain_filter`` ("power", "hydro", "sewage" or a system type) that scopes
+it to one domain, which is how the per-domain servers share one registry.
+
+``simulation.UniversalSimulationEngine`` and
+``core.infra_registry.InfrastructureStateRegistry`` only add how the world
+is built and shared.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import math
+import os
+from datetime import datetime
+from typing import Any, Callable, Coroutine, TypeVar
+
+from core.anomaly import AnomalyDetector
+from core.capacity import TOPOLOGY_ACTIONS, CapacityPaths
+from core.changelog import ChangeLog, system_delta
+from core.clock import CLOCK_MODES, MAX_ADVANCE_SECONDS, SimulationClock
+from core.constraints import ConstraintEngine
+from core.dynamics import FAILURE_UTILIZATION, LOAD_UNITS, NOISE_METRICS
+from core.forecasting import HourlyRecorder
+from core.indexes import ComponentIndex
+from core.ingest import LOAD_METRIC, FeedTracker, IngestBatch, default_units
+from core.memory import COMPONENT_TELEMETRY_CAP, SYSTEM_TELEMETRY_CAP, memory_report
+from core.replay import ReplaySettings, ReplaySource
+from core.risk import risk_level, risk_score
+from core.scenario import iter_scenario, paused_gc
+from core.state import ComponentState, SystemState, TelemetryRecord, operational_state_effect
+from core.tick import MAX_BLOCK_STEPS, StepSamples, SystemSamples, TickSampler
+from models import (
+    Component,
+    ControlActionResult,
+    HealthStatus,
+    OperationalConstraint,
+    OperationalState,
+    RiskEvaluation,
+    RiskState,
+    SystemModel,
+    TopologyEdge,
+    TopologyGraph,
+)
+
+_ReadT = TypeVar("_ReadT")
+
+DOMAIN_TYPES: dict[str, str] = {
+    "power": "power_grid",
+    "hydro": "hydro_plant",
+    "sewage": "sewage_plant",
+}
+
+
+async def _run_to_completion(steps: Coroutine[Any, Any, None]) -> None:
+    """Await ``steps`` even if the caller is cancelled meanwhile, then pass the cancellation on.
+
+    Steps run under the engine lock; stopping between sampling and applying a block would
+    leave the random streams and the clock ahead of the systems.
+    """
+    task = asyncio.ensure_future(steps)
+    cancelled = False
+    while True:
+        try:
+            await asyncio.shield(task)
+            break
+        except asyncio.CancelledError:
+            if task.done():
+                raise
+            cancelled = True
+    if cancelled:
+        raise asyncio.CancelledError
+
+
+class SimulationEngine:
+    def __init__(
+        self,
+        clock: SimulationClock | None = None,
+        max_catch_up_steps: int | None = None,
+        seed: int = 42,
+    ) -> None:
+        self._systems: dict[str, SystemState] = {}
+        self._component_index: dict[str, str] = {}
+        self._index = ComponentIndex()
+        self._anomalies = AnomalyDetector()
+        self._constraints = ConstraintEngine()
+        self._lock = asyncio.Lock()
+        self._sampler = TickSampler(seed)
+        self._feeds = FeedTracker()
+        self._replay: ReplaySource | None = None
+        self._capacity = CapacityPaths()
+        self._loads = HourlyRecorder()
+        self._clock = clock or SimulationClock()
+        # Catch up at most ten simulated seconds of steps per read, scaled by clock speed.
+        self._max_catch_up_steps = max(1, max_catch_up_steps or 10 * math.ceil(self._clock.speed))
+        self._last_tick = self._clock.now()
+        self._version = 0
+        self._changes = ChangeLog()
+
+    @property
+    def clock(self) -> SimulationClock:
+        return self._clock
+
+    @property
+    def load_history(self) -> HourlyRecorder:
+        """Hourly mean load per component id, for the forecasting adapters (``core.forecasting``)."""
+        return self._loads
+
+    @property
+    def version(self) -> int:
+        """Monotonic state version, bumped on every simulation step, control action and ingested batch."""
+        return self._version
+
+    def resolve_domain_filter(self, domain_filter: str) -> str:
+        normalized = domain_filter.strip().lower()
+        if normalized in DOMAIN_TYPES:
+            return DOMAIN_TYPES[normalized]
+        if normalized in DOMAIN_TYPES.values():
+            return normalized
+        raise ValueError(
+            f"Unknown domain filter: {domain_filter}. "
+            f"Available keys: {list(DOMAIN_TYPES.keys())}, "
+            f"values: {list(DOMAIN_TYPES.values())}"
+        )
+
+    def _normalize_domain_filter(self, domain_filter: str | None) -> str | None:
+        if domain_filter is None:
+            return None
+        return self.resolve_domain_filter(domain_filter)
+
+    def _validate_system_domain(self, system: SystemState, domain_filter: str | None) -> None:
+        normalized_filter = self._normalize_domain_filter(domain_filter)
+        if normalized_filter and system.system_type != normalized_filter:
+            raise KeyError(f"System {system.system_id} does not belong to domain {normalized_filter}")
+
+    def initialize_sample_systems(self, replicas: int = 1) -> None:
+        """Build the sample fleet; ``replicas`` > 1 adds suffixed copies of every system."""
+        systems = self._build_required_infrastructure_systems()
+        for replica in range(1, replicas):
+            systems.extend(self._build_required_infrastructure_systems(suffix=f"_r{replica:03d}"))
+
+        for built in systems:
+            self._add_system(SystemState.from_model(built))
+
+    def _add_system(self, system: SystemState) -> None:
+        if system.system_id in self._systems:
+            raise ValueError(f"System already exists: {system.system_id}")
+        for component in system.components:
+            if component.component_id in self._component_index:
+                raise ValueError(f"Component already exists: {component.component_id}")
+        self._systems[system.system_id] = system
+        for component in system.components:
+            self._component_index[component.component_id] = system.system_id
+        self._index.add_system(system.system_id, system.system_type, system.components)
+        self._sampler.add_system(system.system_id)
+        self._constraints.compile_system(system)
+        self._changes.track(system)
+
+    def load_scenario(self, path: str | os.PathLike[str]) -> int:
+        """Add the systems of the scenario file at ``path`` (see ``core.scenario``) and return how many."""
+        count = 0
+        with paused_gc():
+            for system in iter_scenario(path):
+                self._add_system(system)
+                count += 1
+        return count
+
+    def _build_required_infrastructure_systems(self, suffix: str = "") -> list[SystemModel]:
+        return [
+            self._build_power_grid(system_id=f"grid_001{suffix}", name="North Power Grid", location="North Region"),
+            self._build_power_grid(system_id=f"grid_002{suffix}", name="South Power Grid", location="South Region"),
+            self._build_hydro_plant(system_id=f"hydro_001{suffix}", name="Riverside Hydro Plant", location="Upper Valley"),
+            self._build_sewage_plant(system_id=f"sewage_001{suffix}", name="Central Sewage Plant", location="Industrial Zone"),
+            self._build_substation(system_id=f"substation_001{suffix}", name="Main Substation", location="Electronic Corridor"),
+            self._build_data_center(system_id=f"data_center_001{suffix}", name="Primary Data Center", location="Tech Park"),
+        ]
+
+    async def get_systems(self, domain_filter: str | None = None) -> list[SystemModel]:
+        async with self._lock:
+            await self._tick_locked()
+            systems = list(self._systems.values())
+            normalized_filter = self._normalize_domain_filter(domain_filter)
+            if normalized_filter:
+                systems = [s for s in systems if s.system_type == normalized_filter]
+            return [s.to_model() for s in systems]
+
+    async def get_system_state(self, system_id: str, domain_filter: str | None = None) -> SystemModel:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+
+            return system.to_model()
+
+    async def get_system_delta(
+        self,
+        system_id: str,
+        since_version: int,
+        include_components: bool = True,
+        telemetry_limit: int = 25,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+            return system_delta(
+                self._changes,
+                system,
+                since_version,
+                self._version,
+                include_components=include_components,
+                telemetry_limit=telemetry_limit,
+            )
+
+    async def get_component_state(self, component_id: str, domain_filter: str | None = None) -> Component:
+        async with self._lock:
+            await self._tick_locked()
+            system_id = self._component_index.get(component_id)
+            if system_id is None:
+                raise KeyError(f"Component not found: {component_id}")
+
+            system = self._systems[system_id]
+            self._validate_system_domain(system, domain_filter)
+
+            component = self._find_component(system, component_id)
+            if component is None:
+                raise KeyError(f"Component not found: {component_id}")
+            return component.to_model()
+
+    async def snapshot_system(
+        self,
+        system_id: str,
+        domain_filter: str | None = None,
+    ) -> tuple[int, SystemModel]:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+            return self._version, system.to_model()
+
+    async def read_systems(
+        self,
+        reader: Callable[[SystemState], _ReadT],
+        domain_filter: str | None = None,
+    ) -> list[_ReadT]:
+        """Run ``reader`` on each live system under the lock, without copying it."""
+        async with self._lock:
+            await self._tick_locked()
+            normalized_filter = self._normalize_domain_filter(domain_filter)
+            return [
+                reader(system)
+                for system in self._systems.values()
+                if not normalized_filter or system.system_type == normalized_filter
+            ]
+
+    async def read_system(
+        self,
+        system_id: str,
+        reader: Callable[[SystemState], _ReadT],
+        domain_filter: str | None = None,
+    ) -> _ReadT:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+            return reader(system)
+
+    async def read_component(
+        self,
+        component_id: str,
+        reader: Callable[[ComponentState], _ReadT],
+        domain_filter: str | None = None,
+    ) -> _ReadT:
+        async with self._lock:
+            await self._tick_locked()
+            system_id = self._component_index.get(component_id)
+            if system_id is None:
+                raise KeyError(f"Component not found: {component_id}")
+
+            system = self._systems[system_id]
+            self._validate_system_domain(system, domain_filter)
+
+            component = self._find_component(system, component_id)
+            if component is None:
+                raise KeyError(f"Component not found: {component_id}")
+            return reader(component)
+
+    async def find_components(
+        self,
+        filters: dict[str, Any],
+        limit: int = 100,
+        domain_filter: str | None = None,
+    ) -> list[dict[str, Any]]:
+        async with self._lock:
+            await self._tick_locked()
+            scoped = dict(filters)
+            normalized_filter = self._normalize_domain_filter(domain_filter)
+            if normalized_filter:
+                requested = scoped.get("system_type")
+                if requested is not None and normalized_filter not in ([requested] if isinstance(requested, str) else requested):
+                    return []
+                scoped["system_type"] = normalized_filter
+            matches = self._index.find(scoped)
+            return [
+                {"system_id": component.system_id, **self._snapshot_component(component)}
+                for component in matches[: max(0, limit)]
+            ]
+
+    async def get_anomalies(
+        self,
+        system_id: str | None = None,
+        limit: int = 50,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        async with self._lock:
+            await self._tick_locked()
+            if system_id is not None:
+                system = self._systems.get(system_id)
+                if system is None:
+                    raise KeyError(f"System not found: {system_id}")
+                self._validate_system_domain(system, domain_filter)
+                systems = [system]
+            else:
+                normalized_filter = self._normalize_domain_filter(domain_filter)
+                systems = [
+                    system
+                    for system in self._systems.values()
+                    if not normalized_filter or system.system_type == normalized_filter
+                ]
+            component_ids = [component.component_id for system in systems for component in system.components]
+            return {
+                "active": [anomaly.to_dict() for anomaly in self._anomalies.active(component_ids, self._clock.now())],
+                "recent": [anomaly.to_dict() for anomaly in self._anomalies.recent(component_ids, limit=limit)],
+            }
+
+    async def get_constraint_violations(
+        self,
+        system_id: str | None = None,
+        limit: int = 50,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        async with self._lock:
+            await self._tick_locked()
+            if system_id is not None:
+                system = self._systems.get(system_id)
+                if system is None:
+                    raise KeyError(f"System not found: {system_id}")
+                self._validate_system_domain(system, domain_filter)
+                system_ids = [system_id]
+            else:
+                normalized_filter = self._normalize_domain_filter(domain_filter)
+                system_ids = [
+                    system.system_id
+                    for system in self._systems.values()
+                    if not normalized_filter or system.system_type == normalized_filter
+                ]
+            now = self._clock.now()
+            return {
+                "active": [violation.to_dict(now) for violation in self._constraints.active(system_ids)],
+                "recently_cleared": [violation.to_dict() for violation in self._constraints.cleared(system_ids, limit=limit)],
+            }
+
+    async def forecast_failure_probability(
+        self,
+        system_id: str,
+        horizon_seconds: float = 300.0,
+        trials: int = 1000,
+        step_seconds: float = 1.0,
+        seed: int | None = None,
+        confidence: float = 0.95,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        """Estimate per-component failure probabilities over a horizon from seeded rollouts.
+
+        The rollouts run outside the engine lock; ``seed`` defaults to the state
+        version so repeated calls against the same state agree.
+        """
+        from core.montecarlo import estimate_failure_probabilities, rollout_spec
+
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+            spec = rollout_spec(system, self._clock.now(), horizon_seconds, step_seconds)
+            version = self._version
+
+        result = await estimate_failure_probabilities(
+            spec,
+            trials=trials,
+            seed=seed if seed is not None else version,
+            confidence=confidence,
+        )
+        return {"system_id": system_id, "version": version, **result}
+
+    async def contingency_analysis(
+        self,
+        system_id: str,
+        deadline_seconds: float = 5.0,
+        limit: int | None = None,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        """Rank single-component outages by impact; cases run outside the engine lock."""
+        from core.contingency import contingency_spec, run_contingency_analysis
+
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+            component_ids = [component.component_id for component in system.components]
+            spec = contingency_spec(
+                system,
+                anomalous_ids={
+                    anomaly.component_id for anomaly in self._anomalies.active(component_ids, self._clock.now())
+                },
+                hard_violator_ids={
+                    violation.component_id
+                    for violation in self._constraints.active([system_id])
+                    if violation.hard_limit
+                },
+            )
+            version = self._version
+
+        result = await run_contingency_analysis(spec, deadline_seconds=deadline_seconds, limit=limit)
+        return {"version": version, **result}
+
+    async def compute_capacity_paths(
+        self,
+        system_id: str,
+        source_component_ids: list[str] | None = None,
+        sink_component_ids: list[str] | None = None,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        """Max flow, limiting components and edges, and flow paths from sources to sinks (see ``core.capacity``).
+
+        Capacities only change through control actions, so this does not advance the simulation.
+        """
+        async with self._lock:
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+            return self._capacity.compute(system, source_component_ids, sink_component_ids)
+
+    async def get_changes_since(
+        self,
+        version: int,
+        system_id: str | None = None,
+        limit: int = 1000,
+        epoch: str | None = None,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        async with self._lock:
+            await self._tick_locked()
+            if system_id is not None:
+                system = self._systems.get(system_id)
+                if system is None:
+                    raise KeyError(f"System not found: {system_id}")
+                self._validate_system_domain(system, domain_filter)
+            return self._changes.since(
+                version,
+                self._version,
+                system_id=system_id,
+                system_type=self._normalize_domain_filter(domain_filter),
+                limit=limit,
+                epoch=epoch,
+            )
+
+    async def get_memory_report(
+        self,
+        top_components: int = 10,
+        tracemalloc_top: int = 0,
+        domain_filter: str | None = None,
+    ) -> dict[str, Any]:
+        """Estimate memory per system and component; the walk runs in a thread while the lock is held."""
+        async with self._lock:
+            normalized_filter = self._normalize_domain_filter(domain_filter)
+            systems = [
+                system
+                for system in self._systems.values()
+                if not normalized_filter or system.system_type == normalized_filter
+            ]
+            return await asyncio.to_thread(
+                memory_report,
+                systems,
+                self._engine_parts(),
+                top_components=top_components,
+                tracemalloc_top=tracemalloc_top,
+            )
+
+    async def ingest_telemetry(self, batch: IngestBatch, domain_filter: str | None = None) -> dict[str, Any]:
+        """Write ingested points (see ``core.ingest``) and re-evaluate the systems they touched."""
+        async with self._lock:
+            await self._tick_locked()
+            return self._ingest_locked(batch, self._normalize_domain_filter(domain_filter))
+
+    async def get_clock_status(self) -> dict[str, Any]:
+        async with self._lock:
+            await self._tick_locked()
+            return {**self._clock.status(), "version": self._version}
+
+    async def control_clock(
+        self,
+        mode: str | None = None,
+        speed: float | None = None,
+        advance_seconds: float | None = None,
+    ) -> dict[str, Any]:
+        """Switch the clock to ``mode`` (one of ``CLOCK_MODES`` or ``resume``), run it at ``speed``, or
+        simulate ``advance_seconds`` ahead in one-second steps; steps due so far are applied first."""
+        if mode is not None and mode != "resume" and mode not in CLOCK_MODES:
+            raise ValueError(f"Unknown clock mode: {mode}. Valid: {sorted(CLOCK_MODES | {'resume'})}")
+        if advance_seconds is not None and not 0.0 < advance_seconds <= MAX_ADVANCE_SECONDS:
+            raise ValueError(f"advance_seconds must be greater than zero and at most {MAX_ADVANCE_SECONDS:g}")
+        async with self._lock:
+            await self._tick_locked()
+            if mode == "resume":
+                self._clock.resume()
+            elif mode == "paused":
+                self._clock.pause()
+            elif mode is not None:
+                self._clock.set_mode(mode)
+            if speed is not None:
+                self._clock.set_speed(speed)
+            if mode is not None or speed is not None:
+                # Keep catch-up steps near one simulated second at the new speed.
+                self._max_catch_up_steps = max(self._max_catch_up_steps, 10 * math.ceil(self._clock.speed))
+            if advance_seconds is not None:
+                count = math.ceil(advance_seconds)
+                await _run_to_completion(self._run_steps_locked(self._advance_clock(count, advance_seconds / count)))
+            return {**self._clock.status(), "version": self._version}
+
+    async def start_replay(self, settings: ReplaySettings) -> dict[str, Any]:
+        """Play the recording named by ``settings`` (see ``core.replay``) from now, replacing any running replay."""
+        source = await asyncio.to_thread(ReplaySource, settings.path, settings.speed, settings.loop)
+        async with self._lock:
+            await self._tick_locked()
+            return self.begin_replay(source)
+
+    def begin_replay(self, source: ReplaySource) -> dict[str, Any]:
+        """Play ``source`` from now, replacing any running replay.
+
+        This does not take the engine lock; use ``start_replay`` from async code.
+        """
+        if self._replay is not None:
+            self._replay.close()
+        now = self._clock.now()
+        source.start(now)
+        self._replay = source
+        self._replay_locked(now)
+        return source.status(now)
+
+    async def get_replay_status(self) -> dict[str, Any]:
+        async with self._lock:
+            await self._tick_locked()
+            return self._require_replay().status(self._clock.now())
+
+    async def control_replay(
+        self,
+        speed: float | None = None,
+        position_seconds: float | None = None,
+        loop: bool | None = None,
+    ) -> dict[str, Any]:
+        """Change the running replay's speed or loop setting, or seek it to ``position_seconds``."""
+        async with self._lock:
+            await self._tick_locked()
+            replay = self._require_replay()
+            now = self._clock.now()
+            if loop is not None:
+                replay.set_loop(loop)
+            if speed is not None:
+                replay.set_speed(speed, now)
+            if position_seconds is not None:
+                replay.seek(position_seconds, now)
+                self._replay_locked(now)
+            return replay.status(now)
+
+    async def stop_replay(self) -> dict[str, Any]:
+        """Stop the running replay; replayed components return to simulation once their feed lapses."""
+        async with self._lock:
+            await self._tick_locked()
+            replay = self._require_replay()
+            status = replay.status(self._clock.now())
+            replay.close()
+            self._replay = None
+            return status
+
+    def _require_replay(self) -> ReplaySource:
+        if self._replay is None:
+            raise KeyError("No replay is running")
+        return self._replay
+
+    def _engine_parts(self) -> dict[str, Any]:
+        return {
+            "component_index": self._index,
+            "anomaly_detector": self._anomalies,
+            "constraint_engine": self._constraints,
+            "change_log": self._changes,
+            "ingest_feeds": self._feeds,
+            "capacity_paths": self._capacity,
+        }
+
+    async def get_system_topology(self, system_id: str, domain_filter: str | None = None) -> TopologyGraph:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+
+            return system.topology_graph.model_copy(deep=True)
+
+    async def evaluate_system_risk(self, system_id: str, domain_filter: str | None = None) -> RiskEvaluation:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+
+            risk_state = self._compute_risk_state(system)
+            system.risk_state = risk_state
+
+            return RiskEvaluation(
+                system_id=system.system_id,
+                risk_score=risk_state.risk_score,
+                risk_level=risk_state.risk_level,
+                bottlenecks=risk_state.bottlenecks,
+                predicted_failures=risk_state.predicted_failures,
+                recommendations=risk_state.recommendations,
+                anomalies=risk_state.anomalies,
+                constraint_violations=risk_state.constraint_violations,
+            )
+
+    async def execute_control_action(
+        self,
+        system_id: str,
+        action_type: str,
+        parameters: dict[str, Any],
+        domain_filter: str | None = None,
+    ) -> ControlActionResult:
+        async with self._lock:
+            await self._tick_locked()
+            system = self._systems.get(system_id)
+            if system is None:
+                raise KeyError(f"System not found: {system_id}")
+            self._validate_system_domain(system, domain_filter)
+
+            action = action_type.lower().strip()
+            if not action:
+                action = "auto_optimize"
+
+            before_state = self._snapshot_system(system)
+            before_loads = {
+                component.component_id: round(component.current_load, 3)
+                for component in system.components
+            }
+
+            accepted = False
+            execution_status = "rejected"
+            message = "No action executed"
+            impacted: list[str] = []
+
+            ranked_components = sorted(
+                system.components,
+                key=lambda component: self._component_utilization(component),
+                reverse=True,
+            )
+            overloaded = [component for component in ranked_components if component.operational_state != OperationalState.OFFLINE]
+            underutilized = [
+                component
+                for component in reversed(ranked_components)
+                if component.operational_state != OperationalState.OFFLINE
+            ]
+
+            def choose_component(param_name: str, fallback: list[ComponentState]) -> ComponentState | None:
+                requested = parameters.get(param_name)
+                selected = self._find_component(system, requested)
+                if selected is not None:
+                    return selected
+                return fallback[0] if fallback else None
+
+            if action in {"reroute_power", "rebalance_load", "redistribute_load", "auto_optimize"}:
+                source_component = choose_component("source_component_id", overloaded)
+                target_component = choose_component("target_component_id", underutilized)
+
+                if source_component is None or target_component is None:
+                    message = "Unable to identify source and target components for load rebalance"
+                elif source_component.component_id == target_component.component_id:
+                    message = "Source and target components must be different for load rebalance"
+                else:
+                    available_shift = min(
+                        source_component.current_load,
+                        max(0.0, target_component.capacity - target_component.current_load),
+                    )
+                    suggested_shift = max(0.0, available_shift * 0.35)
+                    requested_shift = self._safe_float(parameters.get("amount"), suggested_shift)
+                    shift = max(0.0, min(requested_shift, available_shift))
+
+                    if shift <= 0.0:
+                        message = "No transferable load available between selected components"
+                    else:
+                        source_component.current_load = max(0.0, source_component.current_load - shift)
+                        target_component.current_load = min(
+                            target_component.capacity,
+                            target_component.current_load + shift,
+                        )
+                        impacted = [source_component.component_id, target_component.component_id]
+                        accepted = True
+                        execution_status = "success"
+                        message = f"Rebalanced {shift:.2f} load units"
+
+            elif action in {"adjust_valve", "reduce_load", "throttle_component", "shed_load"}:
+                component = choose_component("component_id", overloaded)
+                if component is None:
+                    message = "No component available for load reduction"
+                else:
+                    requested_delta = self._safe_float(parameters.get("delta"), component.current_load * 0.15)
+                    reduction = max(0.0, requested_delta)
+                    reduction = min(reduction, component.current_load)
+                    component.current_load = max(0.0, component.current_load - reduction)
+                    impacted = [component.component_id]
+                    accepted = reduction > 0.0
+                    execution_status = "success" if accepted else "rejected"
+                    message = (
+                        f"Reduced load by {reduction:.2f} units"
+                        if accepted
+                        else "Component load already at minimum"
+                    )
+
+            elif action in {"increase_capacity", "scale_capacity", "expand_capacity"}:
+                component = choose_component("component_id", overloaded)
+                if component is None:
+                    message = "No component available for capacity scaling"
+                else:
+                    amount = self._safe_float(parameters.get("amount"), component.capacity * 0.1)
+                    capacity_delta = max(0.0, amount)
+                    component.capacity += capacity_delta
+                    impacted = [component.component_id]
+                    accepted = capacity_delta > 0.0
+                    execution_status = "success" if accepted else "rejected"
+                    message = (
+                        f"Increased capacity by {capacity_delta:.2f} units"
+                        if accepted
+                        else "Capacity increase amount must be greater than zero"
+                    )
+
+            elif action in {"isolate_component", "set_operational_state", "restore_component"}:
+                candidates = overloaded if action != "restore_component" else [
+                    component for component in system.components if component.operational_state == OperationalState.OFFLINE
+                ]
+                component = choose_component("component_id", candidates)
+
+                if component is None:
+                    message = "No component available for requested operational state change"
+                else:
+                    requested_state = str(parameters.get("state", "")).lower().strip()
+                    if action == "restore_component":
+                        new_state = OperationalState.RUNNING
+                    elif action == "isolate_component":
+                        new_state = OperationalState.OFFLINE
+                    else:
+                        state_map = {
+                            "running": OperationalState.RUNNING,
+                            "standby": OperationalState.STANDBY,
+                            "maintenance": OperationalState.MAINTENANCE,
+                            "offline": OperationalState.OFFLINE,
+                        }
+                        new_state = state_map.get(requested_state, component.operational_state)
+
+                    component.operational_state = new_state
+                    if new_state == OperationalState.OFFLINE:
+                        # An offline component reports nothing, so its anomalies would otherwise never clear.
+                        self._anomalies.forget(component.component_id)
+                    component.current_load, component.health_status = operational_state_effect(
+                        new_state, component.current_load, component.capacity, component.health_status
+                    )
+                    impacted = [component.component_id]
+                    accepted = True
+                    execution_status = "success"
+                    message = f"Updated operational_state to {new_state.value}"
+
+            else:
+                message = f"Unsupported action_type: {action_type}"
+
+            for component_id in impacted:
+                changed = self._find_component(system, component_id)
+                if changed is not None:
+                    self._index.update(changed)
+            if accepted and action in TOPOLOGY_ACTIONS:
+                self._capacity.invalidate(system.system_id)
+
+            self._version += 1
+            now = self._clock.now()
+            self._changes.mark(self._version, now)
+            self._update_system_telemetry(system, now)
+            self._constraints.evaluate(system, now)
+            system.risk_state = self._compute_risk_state(system, now)
+            self._changes.record_action(self._version, system, action, accepted, impacted, message)
+            self._changes.record_system(self._version, system)
+
+            after_state = self._snapshot_system(system)
+            after_loads = {
+                component.component_id: round(component.current_load, 3)
+                for component in system.components
+            }
+
+            before_components = before_state.get("components", {})
+            after_components = after_state.get("components", {})
+            affected_components = [
+                {
+                    "component_id": component_id,
+                    "before": before_components.get(component_id, {}),
+                    "after": after_components.get(component_id, {}),
+                }
+                for component_id in impacted
+            ]
+
+            if accepted and execution_status == "rejected":
+                execution_status = "partial"
+
+            return ControlActionResult(
+                system_id=system_id,
+                action_type=action_type,
+                accepted=accepted,
+                simulated=True,
+                message=message,
+                impacted_components=impacted,
+                before=before_loads,
+                after=after_loads,
+                action_performed=action,
+                target_system_id=system_id,
+                affected_components=affected_components,
+                state_before_action=before_state,
+                state_after_action=after_state,
+                execution_status=execution_status,
+                executed_at=now,
+            )
+
+    def _component_utilization(self, component: ComponentState) -> float:
+        if component.capacity <= 0.0:
+            return 0.0
+        return component.current_load / component.capacity
+
+    def _safe_float(self, raw_value: Any, fallback: float) -> float:
+        try:
+            if raw_value is None:
+                return float(fallback)
+            return float(raw_value)
+        except (TypeError, ValueError):
+            return float(fallback)
+
+    def _snapshot_component(self, component: ComponentState) -> dict[str, Any]:
+        return {
+            "component_id": component.component_id,
+            "component_type": component.component_type,
+            "operational_state": component.operational_state.value,
+            "health_status": component.health_status.value,
+            "capacity": round(component.capacity, 4),
+            "current_load": round(component.current_load, 4),
+            "utilization": round(self._component_utilization(component), 6),
+        }
+
+    def _snapshot_system(self, system: SystemState) -> dict[str, Any]:
+        total_capacity = sum(component.capacity for component in system.components)
+        total_load = sum(component.current_load for component in system.components)
+        component_states = {
+            component.component_id: self._snapshot_component(component)
+            for component in system.components
+        }
+        return {
+            "system_id": system.system_id,
+            "system_type": system.system_type,
+            "risk_score": round(system.risk_state.risk_score, 6),
+            "risk_level": system.risk_state.risk_level.value,
+            "total_capacity": round(total_capacity, 4),
+            "total_load": round(total_load, 4),
+            "average_utilization": round((total_load / total_capacity) if total_capacity > 0 else 0.0, 6),
+            "components": component_states,
+        }
+
+    async def _tick_locked(self) -> None:
+        now = self._clock.now()
+        elapsed = now - self._last_tick
+
+        if elapsed.total_seconds() < 1.0:
+            self._replay_locked(now)
+            return
+
+        cadence = min(self._max_catch_up_steps, max(1, int(elapsed.total_seconds())))
+        step = elapsed / cadence
+        self._last_tick = now
+
+        await _run_to_completion(
+            self._run_steps_locked([now - step * (cadence - index - 1) for index in range(cadence)])
+        )
+
+    async def _run_steps_locked(self, times: list[datetime]) -> None:
+        # Draw each block first (possibly on the worker pool), then apply it step by step.
+        start = 0
+        while start < len(times):
+            block = times[start : start + MAX_BLOCK_STEPS]
+            if self._replay is not None:
+                self._replay_locked(block[0])
+                next_due = self._replay.next_due()
+                if next_due is not None:
+                    # End the block before the next recorded frame is due, so it lands between the right steps.
+                    block = block[: max(1, bisect.bisect_left(block, next_due))]
+            fed = self._feeds.active(block[0])
+            lapses_at = self._feeds.lapses_at()
+            if fed and lapses_at is not None:
+                # End the block where the first feed lapses, so that component is simulated again from there.
+                block = block[: max(1, bisect.bisect_right(block, lapses_at))]
+            samples = await self._sampler.sample(self._systems.values(), [now.timestamp() for now in block], skip=fed)
+            for index, now in enumerate(block):
+                self._step_locked(now, samples, index)
+            start += len(block)
+
+    def _step_locked(self, now: datetime, samples: dict[str, SystemSamples], index: int) -> None:
+        self._version += 1
+        self._changes.mark(self._version, now)
+        for system in self._systems.values():
+            self._simulate_system_once(system, now, samples[system.system_id][index])
+            self._update_system_telemetry(system, now)
+            self._constraints.evaluate(system, now)
+            system.risk_state = self._compute_risk_state(system, now)
+            self._changes.record_system(self._version, system)
+
+    def _advance_clock(self, count: int, step_seconds: float) -> list[datetime]:
+        times = [self._clock.advance(step_seconds) for _ in range(count)]
+        if times:
+            self._last_tick = times[-1]
+        return times
+
+    def run_steps(self, count: int, step_seconds: float = 1.0) -> None:
+        """Advance the clock and simulate ``count`` steps back to back.
+
+        This does not take the engine lock and cannot run inside an event loop; use ``advance`` from async code.
+        """
+        asyncio.run(self._run_steps_locked(self._advance_clock(count, step_seconds)))
+
+    async def advance(self, count: int, step_seconds: float = 1.0) -> int:
+        async with self._lock:
+            await _run_to_completion(self._run_steps_locked(self._advance_clock(count, step_seconds)))
+            return self._version
+
+    def _ingest_locked(
+        self,
+        batch: IngestBatch,
+        system_type: str | None = None,
+        now: datetime | None = None,
+    ) -> dict[str, Any]:
+        now = now or self._clock.now()
+        # Per component id: the live component and its default units, or why its points are rejected.
+        targets: dict[str, tuple[ComponentState, dict[str, str]] | str] = {}
+        touched: dict[str, set[str]] = {}
+        loaded: dict[str, ComponentState] = {}
+        accepted = 0
+        # The per-point work of ``_append_telemetry``, inlined; buffers are trimmed once per batch below.
+        detect = self._anomalies.update
+        observe = self._constraints.observe
+        record_load = self._loads.record
+        for position, (component_id, metric_name, value, timestamp, units) in enumerate(batch.rows):
+            target = targets.get(component_id)
+            if target is None:
+                target = targets[component_id] = self._ingest_target(component_id, system_type)
+            if isinstance(target, str):
+                batch.reject(batch.lines[position], target)
+                continue
+            component, units_by_metric = target
+            timestamp = timestamp or now
+            if metric_name == LOAD_METRIC:
+                component.current_load = value
+                loaded[component_id] = component
+                record_load(component_id, timestamp, value)
+            detect(component_id, metric_name, value, timestamp)
+            observe(component_id, metric_name, value)
+            component.telemetry.append(
+                TelemetryRecord(timestamp, metric_name, value, units or units_by_metric.get(metric_name, "units"))
+            )
+            metrics = touched.get(component.system_id)
+            if metrics is None:
+                metrics = touched[component.system_id] = set()
+            metrics.add(metric_name)
+            accepted += 1
+
+        for component in loaded.values():
+            self._update_health(component)
+            self._index.update(component)
+        fed = [target[0] for target in targets.values() if not isinstance(target, str)]
+        for component in fed:
+            if len(component.telemetry) > COMPONENT_TELEMETRY_CAP:
+                del component.telemetry[:-COMPONENT_TELEMETRY_CAP]
+        self._feeds.touch([component.component_id for component in fed], now)
+
+        if touched:
+            self._version += 1
+            self._changes.mark(self._version, now)
+            for system_id, metrics in touched.items():
+                system = self._systems[system_id]
+                if LOAD_METRIC in metrics:
+                    self._update_system_telemetry(system, now)
+                self._constraints.evaluate(system, now, metrics=metrics)
+                system.risk_state = self._compute_risk_state(system, now)
+                self._changes.record_system(self._version, system)
+        return batch.summary(accepted, self._version, len(touched), len(self._feeds))
+
+    def _replay_locked(self, until: datetime) -> None:
+        """Ingest the recorded frames due by ``until``, each at its own due time."""
+        if self._replay is None:
+            return
+        for due, batch in self._replay.pop_due(until):
+            self._replay.record(self._ingest_locked(batch, now=due))
+
+    def _ingest_target(
+        self,
+        component_id: str,
+        system_type: str | None,
+    ) -> tuple[ComponentState, dict[str, str]] | str:
+        component = self._index.get(component_id)
+        if component is None:
+            return f"Component not found: {component_id}"
+        system = self._systems[component.system_id]
+        if system_type is not None and system.system_type != system_type:
+            return f"Component {component_id} does not belong to domain {system_type}"
+        return component, default_units(system.system_type)
+
+    def _simulate_system_once(self, system: SystemState, now: datetime, samples: StepSamples) -> None:
+        metrics = NOISE_METRICS.get(system.system_type, ())
+        load_units = LOAD_UNITS.get(system.system_type, "units")
+        for component, sample in zip(system.components, samples):
+            if sample is None:
+                continue
+
+            component.current_load = sample[0]
+            for (metric_name, _, _, units), value in zip(metrics, sample[1:]):
+                self._append_telemetry(component, metric_name, value, units, now)
+            self._append_telemetry(component, "load", component.current_load, load_units, now)
+            self._loads.record(component.component_id, now, component.current_load)
+
+            self._update_health(component)
+            self._index.update(component)
+
+    def _update_health(self, component: ComponentState) -> None:
+        utilization = component.current_load / max(component.capacity, 1e-6)
+        if utilization > FAILURE_UTILIZATION:
+            component.health_status = HealthStatus.CRITICAL
+        elif utilization > 0.85:
+            component.health_status = HealthStatus.DEGRADED
+        elif component.health_status != HealthStatus.CRITICAL:
+            component.health_status = HealthStatus.HEALTHY
+
+    def _update_system_telemetry(self, system: SystemState, now: datetime) -> None:
+        total_capacity = sum(component.capacity for component in system.components)
+        total_load = sum(component.current_load for component in system.components)
+        avg_utilization = (total_load / total_capacity) if total_capacity > 0 else 0.0
+
+        system.telemetry.append(
+            TelemetryRecord(
+                timestamp=now,
+                metric_name="aggregate_load",
+                metric_value=total_load,
+                units="units",
+            )
+        )
+        system.telemetry.append(
+            TelemetryRecord(
+                timestamp=now,
+                metric_name="average_utilization",
+                metric_value=avg_utilization,
+                units="ratio",
+            )
+        )
+
+        if len(system.telemetry) > SYSTEM_TELEMETRY_CAP:
+            del system.telemetry[:-SYSTEM_TELEMETRY_CAP]
+
+    def _compute_risk_state(self, system: SystemState, now: datetime | None = None) -> RiskState:
+        now = now or self._clock.now()
+        utilizations: list[tuple[str, float]] = []
+        predicted_failures: list[str] = []
+
+        critical_count = 0
+        degraded_count = 0
+
+        for component in system.components:
+            utilization = component.current_load / max(component.capacity, 1e-6)
+            utilizations.append((component.component_id, utilization))
+
+            if component.health_status == HealthStatus.CRITICAL:
+                critical_count += 1
+                predicted_failures.append(component.component_id)
+            elif component.health_status == HealthStatus.DEGRADED:
+                degraded_count += 1
+
+            if utilization > 1.0:
+                predicted_failures.append(component.component_id)
+
+        anomalous = sorted(
+            {
+                f"{anomaly.component_id}:{anomaly.metric_name}"
+                for anomaly in self._anomalies.active((component_id for component_id, _ in utilizations), now)
+            }
+        )
+        anomalous_components = {entry.split(":", 1)[0] for entry in anomalous}
+
+        violations = self._constraints.active([system.system_id])
+        hard_violators = {violation.component_id for violation in violations if violation.hard_limit}
+        predicted_failures.extend(hard_violators)
+
+        utilizations.sort(key=lambda item: item[1], reverse=True)
+        bottlenecks = [component_id for component_id, util in utilizations[:3] if util > 0.8]
+
+        avg_utilization = sum(util for _, util in utilizations) / max(len(utilizations), 1)
+        score = risk_score(
+            avg_utilization,
+            critical_count,
+            degraded_count,
+            len(anomalous_components),
+            len(hard_violators),
+            len(utilizations),
+        )
+        level = risk_level(score)
+
+        recommendations: list[str] = []
+        if bottlenecks:
+            recommendations.append("Reroute workload away from bottleneck components")
+        if critical_count > 0:
+            recommendations.append("Isolate or inspect critical components immediately")
+        if avg_utilization > 0.85:
+            recommendations.append("Increase reserve capacity or reduce upstream inflow")
+        if hard_violators:
+            recommendations.append(
+                "Bring hard-limit constraint violations back within bounds on " + ", ".join(sorted(hard_violators))
+            )
+        elif violations:
+            recommendations.append("Review soft operational constraint violations")
+        if anomalous:
+            recommendations.append("Investigate anomalous telemetry on " + ", ".join(sorted(anomalous_components)))
+        if not recommendations:
+            recommendations.append("Maintain current operating profile and continue monitoring")
+
+        return RiskState(
+            risk_score=score,
+            risk_level=level,
+            bottlenecks=bottlenecks,
+            predicted_failures=sorted(set(predicted_failures)),
+            recommendations=recommendations,
+            anomalies=anomalous,
+            constraint_violations=sorted(violation.key for violation in violations),
+            updated_at=now,
+        )
+
+    def _find_component(self, system: SystemState, component_id: Any) -> ComponentState | None:
+        if not isinstance(component_id, str):
+            return None
+        return self._index.get_in_system(system.system_id, component_id)
+
+    def _append_telemetry(
+        self,
+        component: ComponentState,
+        metric_name: str,
+        metric_value: float,
+        units: str,
+        timestamp: datetime,
+    ) -> None:
+        self._anomalies.update(component.component_id, metric_name, metric_value, timestamp)
+        self._constraints.observe(component.component_id, metric_name, metric_value)
+        component.telemetry.append(
+            TelemetryRecord(
+                timestamp=timestamp,
+                metric_name=metric_name,
+                metric_value=metric_value,
+                units=units,
+            )
+        )
+        if len(component.telemetry) > COMPONENT_TELEMETRY_CAP:
+            del component.telemetry[:-COMPONENT_TELEMETRY_CAP]
+
+    def _build_power_grid(self, system_id: str, name: str, location: str) -> SystemModel:
+        substation_id = f"{system_id}_substation_a"
+        transformer_id = f"{system_id}_transformer_b"
+        line_id = f"{system_id}_line_c"
+        feeder_id = f"{system_id}_feeder_d"
+        components = [
+            Component(component_id=substation_id, component_type="substation", system_id=system_id, capacity=120.0, current_load=65.0),
+            Component(component_id=transformer_id, component_type="transformer", system_id=system_id, capacity=90.0, current_load=50.0),
+            Component(component_id=line_id, component_type="transmission_line", system_id=system_id, capacity=105.0, current_load=58.0),
+            Component(component_id=feeder_id, component_type="distribution_feeder", system_id=system_id, capacity=70.0, current_load=42.0),
+        ]
+
+        return SystemModel(
+            system_id=system_id,
+            system_type="power_grid",
+            name=name,
+            location=location,
+            components=components,
+            topology_graph=TopologyGraph(
+                nodes=[component.component_id for component in components],
+                edges=[
+                    TopologyEdge(source_component_id=substation_id, target_component_id=transformer_id, max_throughput=110.0),
+                    TopologyEdge(source_component_id=transformer_id, target_component_id=line_id, max_throughput=95.0),
+                    TopologyEdge(source_component_id=line_id, target_component_id=feeder_id, max_throughput=80.0),
+                ],
+            ),
+            operational_constraints=[
+                OperationalConstraint(name="max_frequency_deviation", min_value=49.5, max_value=50.5, units="Hz"),
+                OperationalConstraint(name="max_line_loading", max_value=1.05, units="ratio"),
+            ],
+            metadata={
+                "status": "critical",
+                "load": 0.94,
+                "temperature": 72.0,
+            },
+        )
+
+    def _build_hydro_plant(self, system_id: str, name: str, location: str) -> SystemModel:
+        intake_id = f"{system_id}_intake_a"
+        turbine_id = f"{system_id}_turbine_b"
+        generator_id = f"{system_id}_generator_c"
+        spillway_id = f"{system_id}_spillway_d"
+        components = [
+            Component(component_id=intake_id, component_type="intake_gate", system_id=system_id, capacity=90.0, current_load=46.0),
+            Component(component_id=turbine_id, component_type="turbine", system_id=system_id, capacity=100.0, current_load=54.0),
+            Component(component_id=generator_id, component_type="generator", system_id=system_id, capacity=96.0, current_load=53.0),
+            Component(component_id=spillway_id, component_type="spillway", system_id=system_id, capacity=85.0, current_load=34.0),
+        ]
+
+        return SystemModel(
+            system_id=system_id,
+            system_type="hydro_plant",
+            name=name,
+            location=location,
+            components=components,
+            topology_graph=TopologyGraph(
+                nodes=[component.component_id for component in components],
+                edges=[
+                    TopologyEdge(source_component_id=intake_id, target_component_id=turbine_id, max_throughput=88.0),
+                    TopologyEdge(source_component_id=turbine_id, target_component_id=generator_id, max_throughput=97.0),
+                    TopologyEdge(source_component_id=intake_id, target_component_id=spillway_id, relation_type="safety_bypass", max_throughput=70.0),
+                ],
+            ),
+            operational_constraints=[
+                OperationalConstraint(name="max_turbidity", max_value=12.0, units="NTU"),
+                OperationalConstraint(name="min_flow", min_value=25.0, units="m3/s"),
+            ],
+            metadata={
+                "status": "risk",
+                "load": 0.74,
+                "temperature": 61.0,
+            },
+        )
+
+    def _build_sewage_plant(self, system_id: str, name: str, location: str) -> SystemModel:
+        inlet_id = f"{system_id}_inlet_a"
+        aeration_id = f"{system_id}_aeration_b"
+        clarifier_id = f"{system_id}_clarifier_c"
+        discharge_id = f"{system_id}_discharge_d"
+        components = [
+            Component(component_id=inlet_id, component_type="inlet_pump", system_id=system_id, capacity=75.0, current_load=41.0),
+            Component(component_id=aeration_id, component_type="aeration_tank", system_id=system_id, capacity=88.0, current_load=55.0),
+            Component(component_id=clarifier_id, component_type="clarifier", system_id=system_id, capacity=92.0, current_load=49.0),
+            Component(component_id=discharge_id, component_type="discharge_unit", system_id=system_id, capacity=78.0, current_load=40.0),
+        ]
+
+        return SystemModel(
+            system_id=system_id,
+            system_type="sewage_plant",
+            name=name,
+            location=location,
+            components=components,
+            topology_graph=TopologyGraph(
+                nodes=[component.component_id for component in components],
+                edges=[
+                    TopologyEdge(source_component_id=inlet_id, target_component_id=aeration_id, max_throughput=72.0),
+                    TopologyEdge(source_component_id=aeration_id, target_component_id=clarifier_id, max_throughput=80.0),
+                    TopologyEdge(source_component_id=clarifier_id, target_component_id=discharge_id, max_throughput=75.0),
+                ],
+            ),
+            operational_constraints=[
+                OperationalConstraint(name="target_ph_min", min_value=6.5, units="pH"),
+                OperationalConstraint(name="target_ph_max", max_value=8.0, units="pH"),
+                OperationalConstraint(name="min_do_level", min_value=2.0, units="mg/L"),
+            ],
+            metadata={
+                "status": "risk",
+                "load": 0.81,
+                "temperature": 58.0,
+            },
+        )
+
+    def _build_substation(self, system_id: str, name: str, location: str) -> SystemModel:
+        switchyard_id = f"{system_id}_switchyard_a"
+        transformer_id = f"{system_id}_transformer_b"
+        components = [
+            Component(component_id=switchyard_id, component_type="switchyard", system_id=system_id, capacity=82.0, current_load=66.0),
+            Component(component_id=transformer_id, component_type="distribution_transformer", system_id=system_id, capacity=78.0, current_load=63.0),
+        ]
+
+        return SystemModel(
+            system_id=system_id,
+            system_type="substation",
+            name=name,
+            location=location,
+            components=components,
+            topology_graph=TopologyGraph(
+                nodes=[component.component_id for component in components],
+                edges=[
+                    TopologyEdge(source_component_id=switchyard_id, target_component_id=transformer_id, max_throughput=74.0),
+                ],
+            ),
+            operational_constraints=[
+                OperationalConstraint(name="max_bus_loading", max_value=0.98, units="ratio"),
+            ],
+            metadata={
+                "status": "critical",
+                "load": 0.91,
+                "temperature": 69.0,
+            },
+        )
+
+    def _build_data_center(self, system_id: str, name: str, location: str) -> SystemModel:
+        rack_id = f"{system_id}_rack_a"
+        chiller_id = f"{system_id}_chiller_b"
+        components = [
+            Component(component_id=rack_id, component_type="compute_rack", system_id=system_id, capacity=96.0, current_load=72.0),
+            Component(component_id=chiller_id, component_type="cooling_chiller", system_id=system_id, capacity=88.0, current_load=67.0),
+        ]
+
+        return SystemModel(
+            system_id=system_id,
+            system_type="data_center",
+            name=name,
+            location=location,
+            components=components,
+            topology_graph=TopologyGraph(
+                nodes=[component.component_id for component in components],
+                edges=[
+                    TopologyEdge(source_component_id=rack_id, target_component_id=chiller_id, relation_type="thermal_dependency", max_throughput=80.0),
+                ],
+            ),
+            operational_constraints=[
+                OperationalConstraint(name="max_temperature", max_value=28.0, units="C"),
+                OperationalConstraint(name="max_power_usage_effectiveness", max_value=1.65, units="ratio"),
+            ],
+            metadata={
+                "status": "risk",
+                "load": 0.83,
+                "temperature": 64.0,
+            },
+        )
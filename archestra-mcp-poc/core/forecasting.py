@@ -0,0 +1,495 @@
+"""Seasonal time-series forecasting shared by the domain adapters.
+
+Each series is modelled with harmonic regression: a level, a damped linear
+trend and Fourier terms for daily and weekly seasonality. Series that share
+a sampling grid (same length and step) share one projection matrix, so a
+batch of entities is fitted with a single small matrix solve followed by one
+dot product per entity.
+
+Histories come from ``HourlyRecorder``, which the simulation engine feeds
+with every component load it records, and fall back to ``SimulatedHistory``
+for entities without enough recorded hours.
+"""
+from __future__ import annotations
+
+import math
+import operator
+import random
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Mapping, Protocol, Sequence
+
+HOURS_PER_DAY = 24.0
+HOURS_PER_WEEK = 168.0
+SECONDS_PER_HOUR = 3600.0
+
+
+@dataclass(frozen=True)
+class MetricHistory:
+    """Evenly spaced samples of one metric, oldest first."""
+
+    start: datetime
+    step_hours: float
+    values: tuple[float, ...]
+
+    @property
+    def end(self) -> datetime:
+        return self.start + timedelta(hours=self.step_hours * max(len(self.values) - 1, 0))
+
+
+@dataclass(frozen=True)
+class MetricProfile:
+    """Shape of a synthetic metric used when no recorded telemetry exists."""
+
+    base: float
+    daily_amplitude: float = 0.0
+    weekly_amplitude: float = 0.0
+    noise: float = 0.0
+    minimum: float | None = None
+    maximum: float | None = None
+    peak_hour: float = 18.0
+
+
+@dataclass(frozen=True)
+class HarmonicFit:
+    coefficients: tuple[float, ...]
+    n_samples: int
+    step_hours: float
+    end: datetime
+    fitted_at: float = field(default_factory=time.monotonic)
+
+
+def _periods(harmonics: int, weekly: bool) -> list[float]:
+    periods = [HOURS_PER_DAY / k for k in range(1, harmonics + 1)]
+    if weekly:
+        periods.append(HOURS_PER_WEEK)
+    return periods
+
+
+def _solve(matrix: list[list[float]], rhs: list[list[float]]) -> list[list[float]]:
+    """Solve ``matrix @ X = rhs`` with Gauss-Jordan elimination and partial pivoting."""
+    size = len(matrix)
+    width = len(rhs[0])
+    augmented = [list(matrix[row]) + list(rhs[row]) for row in range(size)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda row: abs(augmented[row][col]))
+        if abs(augmented[pivot][col]) < 1e-12:
+            raise ValueError("Singular design matrix")
+        augmented[col], augmented[pivot] = augmented[pivot], augmented[col]
+        pivot_row = augmented[col]
+        scale = pivot_row[col]
+        for j in range(col, size + width):
+            pivot_row[j] /= scale
+        for row in range(size):
+            if row == col:
+                continue
+            factor = augmented[row][col]
+            if factor == 0.0:
+                continue
+            target = augmented[row]
+            for j in range(col, size + width):
+                target[j] -= factor * pivot_row[j]
+    return [augmented[row][size:] for row in range(size)]
+
+
+class SeasonalForecaster:
+    """Fits and caches per-series harmonic regression models.
+
+    A cached fit is reused until it is older than ``max_age_seconds`` or the
+    history it was fitted on has gained a newer sample.
+    """
+
+    def __init__(
+        self,
+        harmonics: int = 3,
+        weekly: bool = True,
+        trend_damping: float = 0.98,
+        max_age_seconds: float = 900.0,
+        max_cached_fits: int = 100_000,
+    ) -> None:
+        self._periods = _periods(harmonics, weekly)
+        self._trend_damping = trend_damping
+        self._max_age_seconds = max_age_seconds
+        self._max_cached_fits = max_cached_fits
+        self._fits: OrderedDict[str, HarmonicFit] = OrderedDict()
+        self._projections: dict[tuple[int, float], list[list[float]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def parameter_count(self) -> int:
+        return 2 + 2 * len(self._periods)
+
+    def _features(self, t: float) -> list[float]:
+        row = [1.0, t]
+        for period in self._periods:
+            angle = 2.0 * math.pi * t / period
+            row.append(math.sin(angle))
+            row.append(math.cos(angle))
+        return row
+
+    def _projection(self, n_samples: int, step_hours: float) -> list[list[float]]:
+        """Return ``(X^T X)^-1 X^T`` for a grid of ``n_samples`` points."""
+        key = (n_samples, step_hours)
+        cached = self._projections.get(key)
+        if cached is not None:
+            return cached
+
+        design = [self._features(i * step_hours) for i in range(n_samples)]
+        width = self.parameter_count
+        gram = [[0.0] * width for _ in range(width)]
+        for row in design:
+            for i in range(width):
+                value = row[i]
+                gram_row = gram[i]
+                for j in range(width):
+                    gram_row[j] += value * row[j]
+        transposed = [[row[i] for row in design] for i in range(width)]
+        projection = _solve(gram, transposed)
+        self._projections[key] = projection
+        return projection
+
+    def _is_fresh(self, fit: HarmonicFit, history: MetricHistory, now: float) -> bool:
+        if now - fit.fitted_at > self._max_age_seconds:
+            return False
+        return fit.n_samples == len(history.values) and fit.end >= history.end
+
+    def fit_many(self, histories: Mapping[str, MetricHistory]) -> dict[str, HarmonicFit]:
+        """Fit every stale series, grouping them by sampling grid."""
+        now = time.monotonic()
+        results: dict[str, HarmonicFit] = {}
+        groups: dict[tuple[int, float], list[str]] = {}
+
+        with self._lock:
+            for key, history in histories.items():
+                cached = self._fits.get(key)
+                if cached is not None and self._is_fresh(cached, history, now):
+                    self._fits.move_to_end(key)
+                    results[key] = cached
+                    continue
+                if len(history.values) < self.parameter_count + 1:
+                    raise ValueError(
+                        f"Need at least {self.parameter_count + 1} samples to forecast {key}, "
+                        f"got {len(history.values)}"
+                    )
+                groups.setdefault((len(history.values), history.step_hours), []).append(key)
+
+            for (n_samples, step_hours), keys in groups.items():
+                projection = self._projection(n_samples, step_hours)
+                for key in keys:
+                    history = histories[key]
+                    values = history.values
+                    fit = HarmonicFit(
+                        coefficients=tuple(sum(map(operator.mul, row, values)) for row in projection),
+                        n_samples=n_samples,
+                        step_hours=step_hours,
+                        end=history.end,
+                        fitted_at=now,
+                    )
+                    self._fits[key] = fit
+                    self._fits.move_to_end(key)
+                    results[key] = fit
+
+            while len(self._fits) > self._max_cached_fits:
+                self._fits.popitem(last=False)
+
+        return results
+
+    def project(self, fit: HarmonicFit, horizon_hours: int) -> list[float]:
+        """Evaluate a fit hourly for ``horizon_hours`` steps after its last sample."""
+        coefficients = fit.coefficients
+        last_t = (fit.n_samples - 1) * fit.step_hours
+        level = coefficients[0] + coefficients[1] * last_t
+        slope = coefficients[1]
+
+        # Advance every Fourier term with an angle-addition recurrence instead of
+        # calling sin/cos per point; drift stays below 1e-12 over a full year.
+        states: list[tuple[float, float, float, float, float, float]] = []
+        for index, period in enumerate(self._periods):
+            amplitude_sin = coefficients[2 + 2 * index]
+            amplitude_cos = coefficients[3 + 2 * index]
+            angle = 2.0 * math.pi * last_t / period
+            step = 2.0 * math.pi / period
+            states.append(
+                (amplitude_sin, amplitude_cos, math.sin(angle), math.cos(angle), math.sin(step), math.cos(step))
+            )
+        sines = [state[2] for state in states]
+        cosines = [state[3] for state in states]
+
+        damping = self._trend_damping
+        trend = 0.0
+        weight = 1.0
+        values: list[float] = []
+        for _ in range(horizon_hours):
+            weight *= damping
+            trend += slope * weight
+            total = level + trend
+            for index, (amplitude_sin, amplitude_cos, _, _, step_sin, step_cos) in enumerate(states):
+                sin_value = sines[index]
+                cos_value = cosines[index]
+                sin_value, cos_value = (
+                    sin_value * step_cos + cos_value * step_sin,
+                    cos_value * step_cos - sin_value * step_sin,
+                )
+                sines[index] = sin_value
+                cosines[index] = cos_value
+                total += amplitude_sin * sin_value + amplitude_cos * cos_value
+            values.append(total)
+        return values
+
+    def forecast_many(
+        self,
+        histories: Mapping[str, MetricHistory],
+        horizon_hours: int,
+    ) -> dict[str, list[float]]:
+        fits = self.fit_many(histories)
+        return {key: self.project(fit, horizon_hours) for key, fit in fits.items()}
+
+
+class HistorySource(Protocol):
+    """Hourly histories of ``metrics`` per entity, as ``build_forecast_points`` reads them."""
+
+    @property
+    def metrics(self) -> list[str]: ...
+
+    def history(self, entity_id: str, metric: str, now: datetime | None = None) -> MetricHistory: ...
+
+    def clamp(self, metric: str, value: float) -> float: ...
+
+
+class _HourlySeries:
+    __slots__ = ("hour", "total", "count", "start_hour", "means")
+
+    def __init__(self, hour: int, value: float) -> None:
+        self.hour = hour
+        self.total = value
+        self.count = 1
+        self.start_hour = hour
+        self.means = array("d")
+
+
+class HourlyRecorder:
+    """Hourly means of one metric per entity, recorded as telemetry arrives.
+
+    Samples are averaged per hour of their timestamp. An hour is closed by
+    the first sample of a later hour, and hours without any sample repeat
+    the previous mean so the grid stays even. At most ``window_hours``
+    closed hours are kept per entity; samples older than the open hour are
+    dropped.
+    """
+
+    def __init__(self, window_hours: int = 336) -> None:
+        self._window_hours = window_hours
+        self._series: dict[str, _HourlySeries] = {}
+        # Forecasts read histories on worker threads while the engine records.
+        self._lock = threading.Lock()
+
+    def record(self, entity_id: str, timestamp: datetime, value: float) -> None:
+        hour = int(timestamp.timestamp() // SECONDS_PER_HOUR)
+        with self._lock:
+            series = self._series.get(entity_id)
+            if series is None:
+                self._series[entity_id] = _HourlySeries(hour, value)
+                return
+            if hour == series.hour:
+                series.total += value
+                series.count += 1
+                return
+            if hour < series.hour:
+                return
+            mean = series.total / series.count
+            series.means.extend([mean] * min(hour - series.hour, self._window_hours))
+            excess = len(series.means) - self._window_hours
+            if excess > 0:
+                del series.means[:excess]
+            series.start_hour = hour - len(series.means)
+            series.hour = hour
+            series.total = value
+            series.count = 1
+
+    def history(self, entity_id: str) -> MetricHistory | None:
+        """The closed hours recorded for ``entity_id``, or None before the first one closes."""
+        with self._lock:
+            series = self._series.get(entity_id)
+            if series is None or not series.means:
+                return None
+            start = datetime.fromtimestamp(series.start_hour * SECONDS_PER_HOUR, tz=timezone.utc)
+            return MetricHistory(start=start, step_hours=1.0, values=tuple(series.means))
+
+
+def _hashed_noise(index: int) -> float:
+    mixed = (index * 0x9E3779B1 + 0x85EBCA77) & 0xFFFFFFFF
+    mixed ^= mixed >> 15
+    mixed = (mixed * 0x2C1B3C6D) & 0xFFFFFFFF
+    mixed ^= mixed >> 12
+    return mixed / 2147483648.0 - 1.0
+
+
+# Noise in [-1, 1) shared by all series. A series reads it at an offset derived
+# from its seed, so a given (series, hour) always sees the same value and
+# overlapping history windows agree.
+_NOISE_TABLE_SIZE = 8192
+_NOISE_TABLE = [_hashed_noise(index) for index in range(_NOISE_TABLE_SIZE)]
+
+
+class SimulatedHistory:
+    """Deterministic hourly telemetry for entities without recorded data.
+
+    Every entity gets its own phase, scale and noise stream derived from its
+    id, and all histories end on the current hour so that they share a grid.
+    """
+
+    def __init__(self, profiles: Mapping[str, MetricProfile], window_hours: int = 336) -> None:
+        self._profiles = dict(profiles)
+        self._window_hours = window_hours
+        self._cache: OrderedDict[tuple[str, str, datetime], MetricHistory] = OrderedDict()
+        self._max_cached = 50_000
+        self._tables: dict[tuple[float, float], tuple[list[float], list[float], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self) -> list[str]:
+        return list(self._profiles)
+
+    def _seasonal_tables(self, start_hours: float, peak_hour: float) -> tuple[list[float], list[float], list[float]]:
+        key = (start_hours, peak_hour)
+        # Histories are generated on worker threads (``core.registry.forecast_batch``).
+        with self._lock:
+            cached = self._tables.get(key)
+        if cached is not None:
+            return cached
+        daily_angles = [2.0 * math.pi * (start_hours + i - peak_hour) / HOURS_PER_DAY for i in range(self._window_hours)]
+        tables = (
+            [math.cos(angle) for angle in daily_angles],
+            [math.sin(angle) for angle in daily_angles],
+            [math.cos(2.0 * math.pi * (start_hours + i) / HOURS_PER_WEEK) for i in range(self._window_hours)],
+        )
+        with self._lock:
+            if len(self._tables) >= 16:
+                self._tables.clear()
+            self._tables[key] = tables
+        return tables
+
+    def _generate(self, entity_id: str, metric: str, end: datetime) -> MetricHistory:
+        profile = self._profiles[metric]
+        seed = zlib.crc32(f"{entity_id}:{metric}".encode())
+        rng = random.Random(seed)
+        scale = rng.uniform(0.85, 1.15)
+        phase = 2.0 * math.pi * rng.uniform(-2.0, 2.0) / HOURS_PER_DAY
+        start = end - timedelta(hours=self._window_hours - 1)
+        start_hours = start.timestamp() / 3600.0
+        daily_cos, daily_sin, weekly_cos = self._seasonal_tables(start_hours, profile.peak_hour)
+
+        # cos(angle - phase) expanded so the per-entity work is two multiplies.
+        base = profile.base * scale
+        daily_c = profile.daily_amplitude * scale * math.cos(phase)
+        daily_s = profile.daily_amplitude * scale * math.sin(phase)
+        weekly = profile.weekly_amplitude * scale
+        values = [
+            base + daily_c * c + daily_s * s + weekly * w
+            for c, s, w in zip(daily_cos, daily_sin, weekly_cos)
+        ]
+        if profile.noise:
+            offset = (int(start_hours) + seed) % _NOISE_TABLE_SIZE
+            noise = _NOISE_TABLE[offset : offset + self._window_hours]
+            while len(noise) < self._window_hours:
+                noise += _NOISE_TABLE[: self._window_hours - len(noise)]
+            amplitude = profile.noise
+            values = [value + amplitude * n for value, n in zip(values, noise)]
+        return MetricHistory(start=start, step_hours=1.0, values=tuple(values))
+
+    def history(self, entity_id: str, metric: str, now: datetime | None = None) -> MetricHistory:
+        current = now or datetime.now(timezone.utc)
+        end = current.replace(minute=0, second=0, microsecond=0)
+        key = (entity_id, metric, end)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+        generated = self._generate(entity_id, metric, end)
+        with self._lock:
+            self._cache[key] = generated
+            while len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+        return generated
+
+    def clamp(self, metric: str, value: float) -> float:
+        profile = self._profiles[metric]
+        if profile.minimum is not None:
+            value = max(profile.minimum, value)
+        if profile.maximum is not None:
+            value = min(profile.maximum, value)
+        return value
+
+
+class RecordedHistory:
+    """Recorded hourly histories where ``recorded`` has at least ``min_hours`` of a metric, synthetic otherwise."""
+
+    def __init__(
+        self,
+        profiles: Mapping[str, MetricProfile],
+        recorded: Mapping[str, HourlyRecorder],
+        min_hours: int = 48,
+        fallback: SimulatedHistory | None = None,
+    ) -> None:
+        unknown = set(recorded) - set(profiles)
+        if unknown:
+            raise ValueError(f"Recorded metrics without a profile: {sorted(unknown)}")
+        self._recorded = dict(recorded)
+        self._min_hours = min_hours
+        self._fallback = fallback or SimulatedHistory(profiles)
+
+    @property
+    def metrics(self) -> list[str]:
+        return self._fallback.metrics
+
+    def history(self, entity_id: str, metric: str, now: datetime | None = None) -> MetricHistory:
+        recorder = self._recorded.get(metric)
+        if recorder is not None:
+            recorded = recorder.history(entity_id)
+            if recorded is not None and len(recorded.values) >= self._min_hours:
+                return recorded
+        return self._fallback.history(entity_id, metric, now)
+
+    def clamp(self, metric: str, value: float) -> float:
+        return self._fallback.clamp(metric, value)
+
+
+def build_forecast_points(
+    entity_ids: Sequence[str],
+    horizons: Sequence[int],
+    source: HistorySource,
+    forecaster: SeasonalForecaster,
+    now: datetime | None = None,
+) -> list[list[dict[str, float | str]]]:
+    """Forecast every metric of ``source`` for each entity over its horizon."""
+    current = now or datetime.now(timezone.utc)
+    metrics = source.metrics
+    histories: dict[str, MetricHistory] = {}
+    for entity_id in entity_ids:
+        anchor = current
+        for metric in metrics:
+            # Synthetic metrics end where the first metric does, so one timestamp serves the whole point.
+            history = histories[f"{entity_id}\x1f{metric}"] = source.history(entity_id, metric, anchor)
+            anchor = history.end
+
+    longest = max(horizons, default=0)
+    projected = forecaster.forecast_many(histories, longest)
+
+    results: list[list[dict[str, float | str]]] = []
+    for entity_id, horizon in zip(entity_ids, horizons):
+        anchor = histories[f"{entity_id}\x1f{metrics[0]}"].end if metrics else current
+        series = {metric: projected[f"{entity_id}\x1f{metric}"] for metric in metrics}
+        points: list[dict[str, float | str]] = []
+        for i in range(horizon):
+            point: dict[str, float | str] = {"timestamp": (anchor + timedelta(hours=i + 1)).isoformat()}
+            for metric in metrics:
+                point[metric] = round(source.clamp(metric, series[metric][i]), 3)
+            points.append(point)
+        results.append(points)
+    return results
@@ -0,0 +1,129 @@
+"""In-memory component indexes shared by the simulation engines.
+
+``ComponentIndex`` keeps a primary index by component id, a per-system
+index, and fleet-wide secondary indexes for the attributes operators filter
+on. Engines call ``update`` whenever a component's load, capacity, health or
+operational state changes; each call is O(1) and only touches the buckets
+whose key actually moved.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+from core.state import ComponentState
+
+INDEXED_FIELDS: tuple[str, ...] = (
+    "system_id",
+    "system_type",
+    "component_type",
+    "health_status",
+    "operational_state",
+    "utilization_band",
+)
+
+UTILIZATION_BANDS: tuple[tuple[str, float], ...] = (
+    ("low", 0.5),
+    ("normal", 0.85),
+    ("high", 1.0),
+)
+
+
+def utilization_band(component: ComponentState) -> str:
+    utilization = component.current_load / component.capacity if component.capacity > 0.0 else 0.0
+    for band, upper in UTILIZATION_BANDS:
+        if utilization < upper:
+            return band
+    return "overloaded"
+
+
+class ComponentIndex:
+    def __init__(self) -> None:
+        self._components: dict[str, ComponentState] = {}
+        self._by_system: dict[str, dict[str, ComponentState]] = {}
+        self._system_types: dict[str, str] = {}
+        self._keys: dict[str, tuple[str, ...]] = {}
+        self._buckets: dict[str, dict[str, set[str]]] = {field: {} for field in INDEXED_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._components)
+
+    def add_system(self, system_id: str, system_type: str, components: Iterable[ComponentState]) -> None:
+        self._system_types[system_id] = system_type
+        by_system = self._by_system.setdefault(system_id, {})
+        buckets = [self._buckets[field] for field in INDEXED_FIELDS]
+        for component in components:
+            component_id = component.component_id
+            by_system[component_id] = component
+            self._components[component_id] = component
+            if component_id in self._keys:
+                self.update(component)
+                continue
+            # New component: no old buckets to leave, so insert the key directly.
+            key = self._key(component)
+            for field_buckets, value in zip(buckets, key):
+                bucket = field_buckets.get(value)
+                if bucket is None:
+                    field_buckets[value] = {component_id}
+                else:
+                    bucket.add(component_id)
+            self._keys[component_id] = key
+
+    def get(self, component_id: str) -> ComponentState | None:
+        return self._components.get(component_id)
+
+    def get_in_system(self, system_id: str, component_id: str) -> ComponentState | None:
+        return self._by_system.get(system_id, {}).get(component_id)
+
+    def _key(self, component: ComponentState) -> tuple[str, ...]:
+        return (
+            component.system_id,
+            self._system_types.get(component.system_id, ""),
+            component.component_type,
+            component.health_status.value,
+            component.operational_state.value,
+            utilization_band(component),
+        )
+
+    def update(self, component: ComponentState) -> None:
+        component_id = component.component_id
+        new_key = self._key(component)
+        old_key = self._keys.get(component_id)
+        if old_key == new_key:
+            return
+
+        for position, field in enumerate(INDEXED_FIELDS):
+            new_value = new_key[position]
+            if old_key is not None:
+                old_value = old_key[position]
+                if old_value == new_value:
+                    continue
+                bucket = self._buckets[field].get(old_value)
+                if bucket is not None:
+                    bucket.discard(component_id)
+                    if not bucket:
+                        del self._buckets[field][old_value]
+            self._buckets[field].setdefault(new_value, set()).add(component_id)
+        self._keys[component_id] = new_key
+
+    def find(self, filters: Mapping[str, Any]) -> list[ComponentState]:
+        """Return components matching every filter; list values match any of their items."""
+        candidate_sets: list[set[str]] = []
+        for field, raw in filters.items():
+            if raw is None:
+                continue
+            if field not in self._buckets:
+                raise ValueError(f"Unsupported filter: {field}. Valid: {list(INDEXED_FIELDS)}")
+            values = [raw] if isinstance(raw, str) else list(raw)
+            buckets = self._buckets[field]
+            matched: set[str] = set()
+            for value in values:
+                matched |= buckets.get(str(value).strip().lower() if field != "system_id" else str(value), set())
+            candidate_sets.append(matched)
+
+        if not candidate_sets:
+            ids: Iterable[str] = self._components.keys()
+        else:
+            candidate_sets.sort(key=len)
+            smallest, *rest = candidate_sets
+            ids = [component_id for component_id in smallest if all(component_id in other for other in rest)]
+        return [self._components[component_id] for component_id in sorted(ids)]
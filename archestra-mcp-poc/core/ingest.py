@@ -0,0 +1,409 @@
+"""Live telemetry ingestion.
+
+Real measurements (a SCADA export, a historian feed) can be written into
+the engines in place of simulated values. A batch is a list of points with
+the same field names as ``TelemetryPoint`` plus the component they belong
+to, either as NDJSON, one point per line::
+
+    {"component_id": "sub_a", "metric_name": "load", "metric_value": 71.5, "timestamp": "2026-10-19T08:00:00Z"}
+
+or as CSV with a header naming at least ``component_id``, ``metric_name``
+and ``metric_value`` (``timestamp`` and ``units`` are optional columns).
+Timestamps are ISO 8601 or epoch seconds and default to the simulation
+clock; naive ones are taken as UTC. Units default to the ones the
+simulation reports for the metric. A ``load`` point also sets the
+component's ``current_load``.
+
+Batches arrive as ``POST /ingest`` bodies (``application/x-ndjson`` or
+``text/csv``) or as an NDJSON stream on the Unix socket named by
+``SIM_INGEST_SOCKET``, where ``{server}`` is replaced by the server name so
+that several servers can share one setting. The socket is read a chunk at a
+time and each chunk of complete lines is applied as one batch; when the
+client shuts down its side it gets one JSON summary line back. Request
+bodies are capped at ``SIM_INGEST_MAX_BYTES`` (default 32 MiB, 413 above
+it) and socket lines at ``MAX_LINE_BYTES``; a longer line ends the stream
+with its summary.
+
+A component that received any point is *fed*: the simulation stops drawing
+values for it until no point has arrived for ``SIM_INGEST_HOLD_SECONDS``
+(default 60) of simulated time. Each batch bumps the state version once,
+and only the systems it touched have their constraints (just the rules on
+the metrics it carried) and risk re-evaluated.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import functools
+import importlib
+import importlib.util
+import io
+import json
+import logging
+import math
+import os
+import socket
+import stat
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Iterable
+
+from core.dynamics import LOAD_UNITS, NOISE_METRICS
+
+logger = logging.getLogger("infra.ingest")
+
+_orjson: Any = None
+if importlib.util.find_spec("orjson") is not None:
+    _orjson = importlib.import_module("orjson")
+
+INGEST_FORMATS: dict[str, str] = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/x-jsonlines": "ndjson",
+    "text/csv": "csv",
+}
+LOAD_METRIC = "load"
+MAX_REPORTED_ERRORS = 20
+SOCKET_READ_BYTES = 1 << 20
+# One point is a few hundred bytes; anything longer than this is not a telemetry line.
+MAX_LINE_BYTES = 1 << 16
+DEFAULT_MAX_BODY_BYTES = 32 << 20
+DEFAULT_HOLD_SECONDS = 60.0
+_TIMESTAMP_CACHE_SIZE = 4096
+
+# (component_id, metric_name, metric_value, timestamp or None, units or None)
+IngestRow = tuple[str, str, float, datetime | None, str | None]
+
+
+@dataclass(slots=True)
+class IngestBatch:
+    rows: list[IngestRow] = field(default_factory=list)
+    # Source line of each row, for error messages.
+    lines: list[int] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    rejected: int = 0
+
+    def reject(self, line: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line}: {message}")
+
+    def summary(self, accepted: int, version: int, systems: int, fed_components: int) -> dict[str, Any]:
+        return {
+            "accepted": accepted,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "systems_updated": systems,
+            "fed_components": fed_components,
+            "version": version,
+        }
+
+
+def ingest_hold_seconds() -> float:
+    raw = os.getenv("SIM_INGEST_HOLD_SECONDS", "").strip()
+    if not raw:
+        return DEFAULT_HOLD_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid SIM_INGEST_HOLD_SECONDS: {raw}") from exc
+
+
+def ingest_max_bytes() -> int:
+    raw = os.getenv("SIM_INGEST_MAX_BYTES", "").strip()
+    if not raw:
+        return DEFAULT_MAX_BODY_BYTES
+    try:
+        return max(1, int(raw))
+    except ValueError as exc:
+        raise ValueError(f"Invalid SIM_INGEST_MAX_BYTES: {raw}") from exc
+
+
+def ingest_socket_path(server: str) -> str | None:
+    raw = os.getenv("SIM_INGEST_SOCKET", "").strip()
+    return raw.replace("{server}", server) if raw else None
+
+
+def batch_format(content_type: str | None) -> str | None:
+    """Ingestion format for a ``Content-Type`` header, or None when unsupported."""
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return INGEST_FORMATS.get(media_type)
+
+
+@functools.lru_cache(maxsize=None)
+def default_units(system_type: str) -> dict[str, str]:
+    units = {name: unit for name, _, _, unit in NOISE_METRICS.get(system_type, ())}
+    units[LOAD_METRIC] = LOAD_UNITS.get(system_type, "units")
+    return units
+
+
+class _Timestamps:
+    """Parses point timestamps; ``seen`` keeps recent ones since a batch usually repeats a few."""
+
+    def __init__(self) -> None:
+        self.seen: dict[Any, datetime] = {}
+
+    def parse(self, raw: Any) -> datetime | None:
+        if raw is None or raw == "":
+            return None
+        parsed = self.seen.get(raw)
+        if parsed is not None:
+            return parsed
+        try:
+            parsed = _timestamp(raw)
+        except (OverflowError, OSError, ValueError):
+            # Epoch seconds out of the platform's range overflow rather than fail to parse.
+            raise ValueError(f"Invalid timestamp: {raw!r}") from None
+        if len(self.seen) >= _TIMESTAMP_CACHE_SIZE:
+            self.seen.clear()
+        self.seen[raw] = parsed
+        return parsed
+
+
+def _timestamp(raw: Any) -> datetime:
+    if isinstance(raw, bool):
+        raise ValueError(raw)
+    if isinstance(raw, (int, float)):
+        return datetime.fromtimestamp(raw, timezone.utc)
+    if not isinstance(raw, str):
+        raise ValueError(raw)
+    try:
+        seconds = float(raw)
+    except ValueError:
+        parsed = datetime.fromisoformat(raw)
+        return parsed if parsed.tzinfo is not None else parsed.replace(tzinfo=timezone.utc)
+    return datetime.fromtimestamp(seconds, timezone.utc)
+
+
+def _value(raw: Any) -> float:
+    if isinstance(raw, bool) or raw is None:
+        raise ValueError(f"Invalid metric_value: {raw!r}")
+    value = float(raw)
+    if not math.isfinite(value):
+        raise ValueError(f"metric_value must be finite, got {raw!r}")
+    return value
+
+
+def _loads(data: bytes) -> Any:
+    return _orjson.loads(data) if _orjson is not None else json.loads(data)
+
+
+def _ndjson_records(body: bytes, batch: IngestBatch, first_line: int) -> list[tuple[int, Any]]:
+    # Each line is decoded on its own: joining lines into one array would accept an object split
+    # across lines or several values on one line, as long as the counts happened to match.
+    parsed: list[tuple[int, Any]] = []
+    for number, line in enumerate(body.splitlines(), first_line):
+        if not line.strip():
+            continue
+        try:
+            parsed.append((number, _loads(line)))
+        except ValueError as error:
+            batch.reject(number, f"Invalid JSON: {error}")
+    return parsed
+
+
+def parse_ndjson(body: bytes, first_line: int = 1) -> IngestBatch:
+    batch = IngestBatch()
+    rows = batch.rows
+    lines = batch.lines
+    timestamps = _Timestamps()
+    seen = timestamps.seen
+    isfinite = math.isfinite
+    for number, record in _ndjson_records(body, batch, first_line):
+        try:
+            if type(record) is not dict:
+                raise ValueError("Expected a JSON object")
+            component_id = record["component_id"]
+            metric_name = record["metric_name"]
+            if type(component_id) is not str or type(metric_name) is not str:
+                raise ValueError("component_id and metric_name must be strings")
+            value = record["metric_value"]
+            if type(value) is not float or not isfinite(value):
+                value = _value(value)
+            raw_timestamp = record.get("timestamp")
+            units = record.get("units")
+            if units is not None and type(units) is not str:
+                raise ValueError("units must be a string")
+            rows.append(
+                (component_id, metric_name, value, seen.get(raw_timestamp) or timestamps.parse(raw_timestamp), units)
+            )
+            lines.append(number)
+        except KeyError as error:
+            batch.reject(number, f"Missing field: {error.args[0]}")
+        except (TypeError, ValueError) as error:
+            batch.reject(number, str(error))
+    return batch
+
+
+def parse_csv(body: bytes) -> IngestBatch:
+    reader = csv.reader(io.StringIO(body.decode("utf-8-sig")))
+    header = next(reader, None)
+    columns = {name.strip(): position for position, name in enumerate(header or ())}
+    missing = [name for name in ("component_id", "metric_name", "metric_value") if name not in columns]
+    if missing:
+        raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+    component_at = columns["component_id"]
+    metric_at = columns["metric_name"]
+    value_at = columns["metric_value"]
+    timestamp_at = columns.get("timestamp")
+    units_at = columns.get("units")
+
+    batch = IngestBatch()
+    rows = batch.rows
+    lines = batch.lines
+    timestamps = _Timestamps()
+    seen = timestamps.seen
+    for number, row in enumerate(reader, 2):
+        if not row:
+            continue
+        try:
+            rows.append(
+                (
+                    row[component_at],
+                    row[metric_at],
+                    _value(row[value_at]),
+                    (seen.get(row[timestamp_at]) or timestamps.parse(row[timestamp_at]))
+                    if timestamp_at is not None
+                    else None,
+                    (row[units_at] or None) if units_at is not None else None,
+                )
+            )
+            lines.append(number)
+        except IndexError:
+            batch.reject(number, f"Expected {len(columns)} columns, got {len(row)}")
+        except ValueError as error:
+            batch.reject(number, str(error))
+    return batch
+
+
+def parse_batch(body: bytes, fmt: str) -> IngestBatch:
+    """Parse a request body in ``fmt`` (see ``batch_format``); a bad CSV header raises ``ValueError``."""
+    if fmt == "csv":
+        return parse_csv(body)
+    if fmt == "ndjson":
+        return parse_ndjson(body)
+    raise ValueError(f"Unsupported ingestion format: {fmt}. Valid: {sorted(set(INGEST_FORMATS.values()))}")
+
+
+class FeedTracker:
+    """Components currently driven by ingested data instead of the simulation."""
+
+    def __init__(self, hold_seconds: float | None = None) -> None:
+        self._hold = timedelta(seconds=ingest_hold_seconds() if hold_seconds is None else hold_seconds)
+        self._last: dict[str, datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._last)
+
+    def touch(self, component_ids: Iterable[str], at: datetime) -> None:
+        last = self._last
+        for component_id in component_ids:
+            last[component_id] = at
+
+    def active(self, now: datetime) -> frozenset[str]:
+        """Ids fed within the hold period before ``now``; older feeds are dropped."""
+        if not self._last:
+            return frozenset()
+        cutoff = now - self._hold
+        for component_id in [component_id for component_id, at in self._last.items() if at < cutoff]:
+            del self._last[component_id]
+        return frozenset(self._last)
+
+    def lapses_at(self) -> datetime | None:
+        """Time after which the oldest current feed is no longer active."""
+        return min(self._last.values()) + self._hold if self._last else None
+
+
+IngestHandler = Callable[[IngestBatch], Awaitable[dict[str, Any]]]
+
+
+class IngestSocket:
+    """Unix socket accepting NDJSON telemetry streams; see the module docstring."""
+
+    def __init__(self, path: str | None, ingest: IngestHandler) -> None:
+        self._path = path
+        self._ingest = ingest
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def path(self) -> str | None:
+        return self._path
+
+    async def start(self) -> None:
+        """Start listening once; a no-op without a path or when already started."""
+        if self._path is None or self._server is not None:
+            return
+        _remove_stale_socket(self._path)
+        # A larger stream buffer lets each read return a bigger batch, so per-batch evaluation is amortized.
+        self._server = await asyncio.start_unix_server(self._handle, path=self._path, limit=SOCKET_READ_BYTES)
+        logger.info("Telemetry ingestion socket listening on %s", self._path)
+
+    async def close(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        if self._path is not None:
+            _remove_stale_socket(self._path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        totals = {"accepted": 0, "rejected": 0, "batches": 0}
+        errors: list[str] = []
+        pending = b""
+        line = 1
+
+        async def apply(data: bytes) -> None:
+            nonlocal line
+            batch = await asyncio.to_thread(parse_ndjson, data, line)
+            line += data.count(b"\n")
+            result = await self._ingest(batch)
+            totals["accepted"] += result["accepted"]
+            totals["rejected"] += result["rejected"]
+            totals["batches"] += 1
+            errors.extend(result["errors"][: MAX_REPORTED_ERRORS - len(errors)])
+
+        try:
+            while chunk := await reader.read(SOCKET_READ_BYTES):
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                pending = data[cut:]
+                if cut:
+                    await apply(data[:cut])
+                if len(pending) > MAX_LINE_BYTES:
+                    # Stop buffering a line that never ends; the client gets its summary and is dropped.
+                    totals["rejected"] += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"line {line}: longer than {MAX_LINE_BYTES} bytes; stream closed")
+                    pending = b""
+                    break
+            if pending.strip():
+                await apply(pending)
+            if totals["rejected"]:
+                logger.warning("Ingestion stream rejected %d points: %s", totals["rejected"], errors[:3])
+            writer.write(json.dumps({**totals, "errors": errors}).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket left behind by a previous process; refuse to take over a live one."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"Ingestion socket path exists and is not a socket: {path}")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise ValueError(f"Ingestion socket is already in use: {path}")
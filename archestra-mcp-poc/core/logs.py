@@ -0,0 +1,214 @@
+"""Non-blocking structured logging.
+
+``configure_logging`` installs a single ``QueueHandler`` on the root logger
+in place of any handlers already there (FastMCP installs one when it is
+constructed); a ``QueueListener`` thread owns the stderr handler, so a log
+call on the event loop only enqueues a record. Importing a module never
+configures logging: the entry points call it (the MCP servers' ``__main__``,
+the apps' lifespan and ``batch_runner``), which leaves a host such as a
+test runner in charge of its own handlers. Records are rendered as JSON lines by
+default (``LOG_FORMAT=text`` for the classic layout), and any ``fields``
+passed through ``extra`` become top-level keys. A forked child (the
+``MCP_PREFORK`` supervisor imports the apps before forking) inherits the
+handler but not the listener thread, so it gets a fresh queue and listener.
+
+``logged_tool`` wraps an MCP tool function and emits one ``tool_call``
+record per invocation with its arguments, outcome and latency. Successful
+and cancelled calls are sampled per tool from ``LOG_SAMPLE_RATES`` (for
+example ``get_system_state=0.05,find_components=0.2,*=1``); failures are
+always logged, as warnings.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+import inspect
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, TypeVar
+
+_ToolT = TypeVar("_ToolT", bound=Callable[..., Awaitable[Any]])
+
+_MAX_ARG_CHARS = 200
+
+_configure_lock = threading.Lock()
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict):
+            payload.update(fields)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if isinstance(fields, dict) and fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+def configure_logging() -> None:
+    """Route all logging through a background queue listener; safe to call repeatedly."""
+    global _listener
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        level_name = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+        level = logging.getLevelName(level_name)
+        if not isinstance(level, int):
+            raise ValueError(f"Invalid LOG_LEVEL: {level_name}")
+
+        stream_handler = logging.StreamHandler(sys.stderr)
+        stream_handler.setFormatter(
+            TextFormatter() if os.getenv("LOG_FORMAT", "json").strip().lower() == "text" else JsonFormatter()
+        )
+
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+def _restart_listener_after_fork() -> None:
+    global _configure_lock, _listener
+    _configure_lock = threading.Lock()
+    inherited = _listener
+    if inherited is None:
+        return
+    atexit.unregister(inherited.stop)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(log_queue, *inherited.handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+class SamplingPolicy:
+    def __init__(self, rates: dict[str, float] | None = None, default: float = 1.0) -> None:
+        self._rates = dict(rates or {})
+        self._default = default
+
+    @classmethod
+    def from_env(cls) -> SamplingPolicy:
+        rates: dict[str, float] = {}
+        default = 1.0
+        raw = os.getenv("LOG_SAMPLE_RATES", "").strip()
+        for entry in filter(None, (part.strip() for part in raw.split(","))):
+            name, separator, value = entry.partition("=")
+            try:
+                rate = min(1.0, max(0.0, float(value)))
+            except ValueError as exc:
+                raise ValueError(f"Invalid LOG_SAMPLE_RATES entry: {entry}") from exc
+            if not separator:
+                raise ValueError(f"Invalid LOG_SAMPLE_RATES entry: {entry}")
+            if name.strip() == "*":
+                default = rate
+            else:
+                rates[name.strip()] = rate
+        return cls(rates, default)
+
+    def rate(self, tool: str) -> float:
+        return self._rates.get(tool, self._default)
+
+    def set_rate(self, tool: str, rate: float) -> None:
+        self._rates[tool] = min(1.0, max(0.0, rate))
+
+    def should_log(self, tool: str) -> bool:
+        rate = self.rate(tool)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+sampling = SamplingPolicy.from_env()
+
+
+def _loggable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return text if len(text) <= _MAX_ARG_CHARS else text[:_MAX_ARG_CHARS] + "..."
+
+
+def logged_tool(logger: logging.Logger) -> Callable[[_ToolT], _ToolT]:
+    """Log one sampled ``tool_call`` record with arguments and latency per call."""
+
+    def decorator(fn: _ToolT) -> _ToolT:
+        name = fn.__name__
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            status = "ok"
+            error: BaseException | None = None
+            try:
+                return await fn(*args, **kwargs)
+            except asyncio.CancelledError:
+                # The client went away or the server is shutting down; not a tool failure.
+                status = "cancelled"
+                raise
+            except BaseException as exc:
+                status = "error"
+                error = exc
+                raise
+            finally:
+                if error is not None or sampling.should_log(name):
+                    bound = signature.bind_partial(*args, **kwargs)
+                    fields: dict[str, Any] = {
+                        "event": "tool_call",
+                        "tool": name,
+                        "args": {key: _loggable(value) for key, value in bound.arguments.items()},
+                        "status": status,
+                        "latency_ms": round((time.perf_counter() - started) * 1000.0, 3),
+                        "sample_rate": sampling.rate(name),
+                    }
+                    if error is not None:
+                        fields["error"] = str(error)
+                    logger.log(
+                        logging.INFO if error is None else logging.WARNING,
+                        "tool_call %s",
+                        name,
+                        extra={"fields": fields},
+                    )
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,224 @@
+"""Memory accounting for the simulated world.
+
+``memory_report`` walks the live systems and estimates the bytes held by
+each system, its components and its telemetry buffers with a recursive
+``sys.getsizeof``. Every object is counted once, at its first owner in walk
+order, and enum members, classes and functions are treated as shared and
+not counted, so the figures add up to the retained size of the world
+rather than to a sum of overlapping views. The ``pydantic_overhead_bytes`` total is the part
+of that spent on model instances, their ``__dict__`` and their field sets,
+as opposed to the field values themselves.
+
+Process-wide figures come from ``gc`` and, when the process was started
+with ``PYTHONTRACEMALLOC`` set, the top ``tracemalloc`` allocators.
+"""
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+import types
+from collections import Counter, deque
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Iterable
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from core.state import SystemState
+
+SYSTEM_TELEMETRY_CAP = 500
+COMPONENT_TELEMETRY_CAP = 300
+
+_SHARED = (Enum, type, types.FunctionType, types.MethodType, types.BuiltinFunctionType, types.ModuleType)
+_ATOMIC = (str, bytes, int, float, bool, complex, date, datetime, time, timedelta, type(None))
+
+
+class _Sizer:
+    def __init__(self) -> None:
+        self._seen: set[int] = set()
+        self.object_counts: Counter[str] = Counter()
+        self.pydantic_overhead = 0
+
+    def size(self, root: Any) -> int:
+        total = 0
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, _SHARED) or id(obj) in self._seen:
+                continue
+            self._seen.add(id(obj))
+            size = sys.getsizeof(obj)
+            total += size
+            if isinstance(obj, _ATOMIC):
+                continue
+            if isinstance(obj, BaseModel):
+                self.object_counts[type(obj).__name__] += 1
+                fields = obj.__dict__
+                fields_set = obj.__pydantic_fields_set__
+                self.pydantic_overhead += size
+                for container in (fields, fields_set):
+                    if id(container) not in self._seen:
+                        self._seen.add(id(container))
+                        container_size = sys.getsizeof(container)
+                        total += container_size
+                        self.pydantic_overhead += container_size
+                stack.extend(fields.values())
+                stack.extend(fields_set)
+                extra = obj.__pydantic_extra__
+                if extra:
+                    stack.append(extra)
+            elif isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+                stack.extend(obj)
+            else:
+                self.object_counts[type(obj).__name__] += 1
+                if hasattr(obj, "__dict__"):
+                    stack.append(obj.__dict__)
+                for slot in getattr(type(obj), "__slots__", ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+        return total
+
+
+def _system_report(sizer: _Sizer, system: SystemState) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    components: list[dict[str, Any]] = []
+    component_bytes = 0
+    component_telemetry_bytes = 0
+    component_points = 0
+    for component in system.components:
+        telemetry_bytes = sizer.size(component.telemetry)
+        size = telemetry_bytes + sizer.size(component)
+        component_bytes += size
+        component_telemetry_bytes += telemetry_bytes
+        component_points += len(component.telemetry)
+        components.append(
+            {
+                "component_id": component.component_id,
+                "system_id": system.system_id,
+                "bytes": size,
+                "telemetry_points": len(component.telemetry),
+                "telemetry_bytes": telemetry_bytes,
+            }
+        )
+
+    telemetry_bytes = sizer.size(system.telemetry)
+    topology_bytes = sizer.size(system.topology_graph)
+    rest_bytes = sizer.size(system)
+    count = len(system.components)
+    return (
+        {
+            "system_id": system.system_id,
+            "system_type": system.system_type,
+            "bytes": component_bytes + telemetry_bytes + topology_bytes + rest_bytes,
+            "topology_bytes": topology_bytes,
+            "telemetry": {
+                "points": len(system.telemetry),
+                "cap": SYSTEM_TELEMETRY_CAP,
+                "bytes": telemetry_bytes,
+            },
+            "components": {
+                "count": count,
+                "bytes": component_bytes,
+                "bytes_per_component": round(component_bytes / count) if count else 0,
+                "telemetry_points": component_points,
+                "telemetry_cap_per_component": COMPONENT_TELEMETRY_CAP,
+                "telemetry_fill": round(component_points / (count * COMPONENT_TELEMETRY_CAP), 4) if count else 0.0,
+                "telemetry_bytes": component_telemetry_bytes,
+            },
+        },
+        components,
+    )
+
+
+def _gc_report() -> dict[str, Any]:
+    return {
+        "enabled": gc.isenabled(),
+        "counts": list(gc.get_count()),
+        "thresholds": list(gc.get_threshold()),
+        "generations": gc.get_stats(),
+        "frozen": gc.get_freeze_count(),
+    }
+
+
+def _tracemalloc_report(top: int) -> dict[str, Any]:
+    if not tracemalloc.is_tracing():
+        return {
+            "enabled": False,
+            "hint": "start the server with PYTHONTRACEMALLOC=1 (or a larger frame count) to collect allocators",
+        }
+    current, peak = tracemalloc.get_traced_memory()
+    statistics = tracemalloc.take_snapshot().statistics("lineno")[:top]
+    return {
+        "enabled": True,
+        "traced_bytes": current,
+        "peak_traced_bytes": peak,
+        "top": [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in statistics
+        ],
+    }
+
+
+def _max_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return int(rss) if sys.platform == "darwin" else int(rss) * 1024
+
+
+def memory_report(
+    systems: Iterable[SystemState],
+    engine_parts: dict[str, Any] | None = None,
+    top_components: int = 10,
+    tracemalloc_top: int = 0,
+) -> dict[str, Any]:
+    """Estimate retained bytes per system, component and telemetry buffer; see the module docstring."""
+    sizer = _Sizer()
+    system_reports: list[dict[str, Any]] = []
+    components: list[dict[str, Any]] = []
+    for system in systems:
+        report, system_components = _system_report(sizer, system)
+        system_reports.append(report)
+        components.extend(system_components)
+
+    parts = {name: sizer.size(part) for name, part in (engine_parts or {}).items()}
+    systems_bytes = sum(report["bytes"] for report in system_reports)
+    telemetry_points = sum(
+        report["telemetry"]["points"] + report["components"]["telemetry_points"] for report in system_reports
+    )
+    telemetry_bytes = sum(
+        report["telemetry"]["bytes"] + report["components"]["telemetry_bytes"] for report in system_reports
+    )
+    components.sort(key=lambda item: (-item["bytes"], item["component_id"]))
+
+    payload: dict[str, Any] = {
+        "totals": {
+            "systems": len(system_reports),
+            "components": len(components),
+            "systems_bytes": systems_bytes,
+            "telemetry_points": telemetry_points,
+            "telemetry_bytes": telemetry_bytes,
+            "bytes_per_telemetry_point": round(telemetry_bytes / telemetry_points) if telemetry_points else 0,
+            "pydantic_overhead_bytes": sizer.pydantic_overhead,
+            "engine_bytes": parts,
+            "max_rss_bytes": _max_rss_bytes(),
+        },
+        "object_counts": dict(sizer.object_counts.most_common()),
+        "systems": system_reports,
+        "largest_components": components[: max(0, top_components)],
+        "gc": _gc_report(),
+    }
+    if tracemalloc_top > 0:
+        payload["tracemalloc"] = _tracemalloc_report(tracemalloc_top)
+    return payload
@@ -0,0 +1,215 @@
+"""Monte Carlo failure-probability estimation.
+
+A system is reduced to a picklable ``RolloutSpec`` and its stochastic load
+dynamics (``core.dynamics``) are rolled forward over a horizon in many
+independent trials, each with its own seeded RNG. A component fails in a
+trial the first time its utilization crosses ``FAILURE_UTILIZATION``.
+Trials are split into chunks that run in the shared process pool, so the
+estimate scales with the available cores; small jobs run inline on a
+thread to avoid the pool round trip. A request is held to ``MAX_WORK``
+component-steps by running fewer trials; trials are seeded by index, so
+the capped run is the prefix of the full one. Probabilities are reported
+with Wilson score intervals.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from statistics import NormalDist
+from typing import Any
+
+from core.dynamics import FAILURE_UTILIZATION, load_model
+from core.parallel import get_process_pool, worker_count
+from core.state import SystemState
+from models import HealthStatus, OperationalState
+
+MAX_TRIALS = 20_000
+MAX_HORIZON_STEPS = 3_600
+# Most component-steps (trials x horizon steps x online components) one estimate may roll out.
+MAX_WORK = 20_000_000
+# Below this many component-steps a job is cheaper inline than in the pool.
+INLINE_WORK_LIMIT = 200_000
+
+
+@dataclass(frozen=True)
+class RolloutComponent:
+    component_id: str
+    component_type: str
+    capacity: float
+    offline: bool
+    critical: bool
+
+
+@dataclass(frozen=True)
+class RolloutSpec:
+    system_type: str
+    components: tuple[RolloutComponent, ...]
+    start_timestamp: float
+    step_seconds: float
+    horizon_steps: int
+
+
+@dataclass
+class RolloutCounts:
+    failures: list[int]
+    first_failure_steps: list[int]
+    any_failures: int
+    trials: int
+
+    def merge(self, other: RolloutCounts) -> None:
+        self.failures = [left + right for left, right in zip(self.failures, other.failures)]
+        self.first_failure_steps = [
+            left + right for left, right in zip(self.first_failure_steps, other.first_failure_steps)
+        ]
+        self.any_failures += other.any_failures
+        self.trials += other.trials
+
+
+def rollout_spec(system: SystemState, now: datetime, horizon_seconds: float, step_seconds: float) -> RolloutSpec:
+    if step_seconds <= 0.0:
+        raise ValueError("step_seconds must be greater than zero")
+    horizon_steps = int(horizon_seconds / step_seconds)
+    if horizon_steps < 1 or horizon_steps > MAX_HORIZON_STEPS:
+        raise ValueError(f"horizon_seconds / step_seconds must be between 1 and {MAX_HORIZON_STEPS} steps")
+    return RolloutSpec(
+        system_type=system.system_type,
+        components=tuple(
+            RolloutComponent(
+                component_id=component.component_id,
+                component_type=component.component_type,
+                capacity=component.capacity,
+                offline=component.operational_state == OperationalState.OFFLINE,
+                critical=component.health_status == HealthStatus.CRITICAL,
+            )
+            for component in system.components
+        ),
+        start_timestamp=now.timestamp(),
+        step_seconds=step_seconds,
+        horizon_steps=horizon_steps,
+    )
+
+
+def run_rollouts(spec: RolloutSpec, seed: int, first_trial: int, trials: int) -> RolloutCounts:
+    """Run trials ``first_trial .. first_trial + trials - 1``; module-level so it pickles."""
+    model = load_model(spec.system_type)
+    active = [index for index, component in enumerate(spec.components) if not component.offline]
+    capacities = [spec.components[index].capacity for index in active]
+    thresholds = [max(capacity, 1e-6) * FAILURE_UTILIZATION for capacity in capacities]
+    timestamps = [spec.start_timestamp + step * spec.step_seconds for step in range(1, spec.horizon_steps + 1)]
+
+    size = len(spec.components)
+    failures = [0] * size
+    first_failure_steps = [0] * size
+    any_failures = 0
+    for trial in range(first_trial, first_trial + trials):
+        # String seeds hash to independent, reproducible streams per trial.
+        rng = random.Random(f"{seed}:{trial}")
+        remaining = len(active)
+        failed = [False] * len(active)
+        for step, timestamp in enumerate(timestamps, start=1):
+            for position, capacity in enumerate(capacities):
+                load = model(capacity, timestamp, rng)
+                if not failed[position] and load > thresholds[position]:
+                    failed[position] = True
+                    remaining -= 1
+                    index = active[position]
+                    failures[index] += 1
+                    first_failure_steps[index] += step
+            if remaining == 0:
+                break
+        if remaining < len(active):
+            any_failures += 1
+
+    return RolloutCounts(
+        failures=failures,
+        first_failure_steps=first_failure_steps,
+        any_failures=any_failures,
+        trials=trials,
+    )
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> tuple[float, float]:
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1.0 + z * z / trials
+    centre = (p + z * z / (2.0 * trials)) / denominator
+    margin = z * math.sqrt(p * (1.0 - p) / trials + z * z / (4.0 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+async def estimate_failure_probabilities(
+    spec: RolloutSpec,
+    trials: int,
+    seed: int,
+    confidence: float = 0.95,
+) -> dict[str, Any]:
+    if trials < 1 or trials > MAX_TRIALS:
+        raise ValueError(f"trials must be between 1 and {MAX_TRIALS}")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+
+    trial_work = spec.horizon_steps * max(1, sum(not component.offline for component in spec.components))
+    if trial_work > MAX_WORK:
+        raise ValueError(
+            f"One trial would roll out {trial_work} component-steps, more than {MAX_WORK}; "
+            "shorten the horizon or lengthen step_seconds"
+        )
+    requested_trials = trials
+    trials = min(trials, MAX_WORK // trial_work)
+    work = trials * trial_work
+    if work <= INLINE_WORK_LIMIT:
+        counts = await asyncio.to_thread(run_rollouts, spec, seed, 0, trials)
+    else:
+        chunks = min(trials, worker_count() * 2)
+        bounds = [trials * index // chunks for index in range(chunks + 1)]
+        loop = asyncio.get_running_loop()
+        pool = get_process_pool()
+        parts = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, run_rollouts, spec, seed, bounds[index], bounds[index + 1] - bounds[index])
+                for index in range(chunks)
+            )
+        )
+        counts = parts[0]
+        for part in parts[1:]:
+            counts.merge(part)
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    components: list[dict[str, Any]] = []
+    for index, component in enumerate(spec.components):
+        failures = counts.failures[index]
+        low, high = wilson_interval(failures, counts.trials, z)
+        components.append(
+            {
+                "component_id": component.component_id,
+                "component_type": component.component_type,
+                "failure_probability": round(failures / counts.trials, 4),
+                "ci_low": round(low, 4),
+                "ci_high": round(high, 4),
+                "expected_seconds_to_failure": (
+                    round(counts.first_failure_steps[index] / failures * spec.step_seconds, 1) if failures else None
+                ),
+                "currently_critical": component.critical,
+                "offline": component.offline,
+            }
+        )
+    components.sort(key=lambda item: item["failure_probability"], reverse=True)
+
+    any_low, any_high = wilson_interval(counts.any_failures, counts.trials, z)
+    return {
+        "horizon_seconds": spec.horizon_steps * spec.step_seconds,
+        "step_seconds": spec.step_seconds,
+        "trials": counts.trials,
+        "requested_trials": requested_trials,
+        "seed": seed,
+        "confidence": confidence,
+        "failure_utilization": FAILURE_UTILIZATION,
+        "system_failure_probability": round(counts.any_failures / counts.trials, 4),
+        "system_ci_low": round(any_low, 4),
+        "system_ci_high": round(any_high, 4),
+        "components": components,
+    }
@@ -0,0 +1,167 @@
+"""Cursor-based paging over system snapshots.
+
+A cursor is an opaque token naming a system, the state version its first
+page was read at, the section being paged and the next offset. The
+snapshot for that version is kept in a small LRU, so later pages slice the
+same frozen state instead of rebuilding the payload. A cursor whose
+snapshot has been evicted is rejected and the client restarts paging.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from models import SystemModel
+
+PAGE_SECTIONS: frozenset[str] = frozenset({"components", "telemetry", "edges"})
+MAX_PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class Cursor:
+    system_id: str
+    version: int
+    section: str
+    offset: int
+    page_size: int
+
+    def encode(self) -> str:
+        raw = json.dumps(
+            {"s": self.system_id, "v": self.version, "k": self.section, "o": self.offset, "n": self.page_size},
+            separators=(",", ":"),
+        ).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> Cursor:
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            cursor = cls(
+                system_id=str(data["s"]),
+                version=int(data["v"]),
+                section=str(data["k"]),
+                offset=int(data["o"]),
+                page_size=int(data["n"]),
+            )
+        except (binascii.Error, ValueError, KeyError, TypeError) as error:
+            raise ValueError("Invalid cursor") from error
+        if cursor.section not in PAGE_SECTIONS or cursor.offset < 0 or cursor.page_size < 1:
+            raise ValueError("Invalid cursor")
+        return cursor
+
+
+def clamp_page_size(page_size: int) -> int:
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    return min(int(page_size), MAX_PAGE_SIZE)
+
+
+class SnapshotPager:
+    """Serves fixed-size pages from version-pinned system snapshots."""
+
+    def __init__(self, max_snapshots: int = 32) -> None:
+        self._snapshots: OrderedDict[tuple[str, int], SystemModel] = OrderedDict()
+        self._max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+
+    def _remember(self, version: int, system: SystemModel) -> None:
+        with self._lock:
+            self._snapshots[(system.system_id, version)] = system
+            self._snapshots.move_to_end((system.system_id, version))
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+
+    def _recall(self, cursor: Cursor) -> SystemModel:
+        with self._lock:
+            system = self._snapshots.get((cursor.system_id, cursor.version))
+            if system is not None:
+                self._snapshots.move_to_end((cursor.system_id, cursor.version))
+        if system is None:
+            raise ValueError(
+                f"Cursor expired: snapshot {cursor.version} of {cursor.system_id} is no longer available; "
+                "restart paging without a cursor"
+            )
+        return system
+
+    async def page(
+        self,
+        system_id: str,
+        section: str,
+        page_size: int,
+        cursor: str | None,
+        load_snapshot: Callable[[str], Awaitable[tuple[int, SystemModel]]],
+    ) -> dict[str, Any]:
+        """Return one page of ``section`` for ``system_id``.
+
+        ``load_snapshot`` is only awaited for the first page; it must return
+        the current state version together with a detached copy of the system.
+        """
+        if cursor:
+            position = Cursor.decode(cursor)
+            if position.system_id != system_id:
+                raise ValueError(f"Cursor belongs to system {position.system_id}, not {system_id}")
+            system = self._recall(position)
+        else:
+            if section not in PAGE_SECTIONS:
+                raise ValueError(f"Unknown page section: {section}. Valid: {sorted(PAGE_SECTIONS)}")
+            version, system = await load_snapshot(system_id)
+            self._remember(version, system)
+            position = Cursor(system_id, version, section, 0, clamp_page_size(page_size))
+
+        items = _section_items(system, position.section)
+        end = position.offset + position.page_size
+        next_cursor = (
+            Cursor(system_id, position.version, position.section, end, position.page_size).encode()
+            if end < len(items)
+            else None
+        )
+        return {
+            "system": system,
+            "section": position.section,
+            "items": items[position.offset : end],
+            "page": {
+                "section": position.section,
+                "snapshot_version": position.version,
+                "offset": position.offset,
+                "page_size": position.page_size,
+                "total": len(items),
+                "next_cursor": next_cursor,
+            },
+        }
+
+
+def _section_items(system: SystemModel, section: str) -> list[Any]:
+    if section == "components":
+        return system.components
+    if section == "telemetry":
+        return system.telemetry
+    return system.topology_graph.edges
+
+
+def system_page_view(page: dict[str, Any]) -> dict[str, Any]:
+    """Shape a ``SnapshotPager.page`` result for ``get_system_state``."""
+    system: SystemModel = page["system"]
+    payload = system.model_dump(
+        mode="json",
+        include={"system_id", "system_type", "name", "location", "risk_state"},
+    )
+    payload[page["section"]] = [item.model_dump(mode="json") for item in page["items"]]
+    payload["page"] = page["page"]
+    return payload
+
+
+def topology_page_view(page: dict[str, Any]) -> dict[str, Any]:
+    """Shape a ``SnapshotPager.page`` result for ``get_system_topology``."""
+    system: SystemModel = page["system"]
+    payload: dict[str, Any] = {"edges": [edge.model_dump(mode="json") for edge in page["items"]]}
+    if page["page"]["offset"] == 0:
+        payload["nodes"] = list(system.topology_graph.nodes)
+    payload["page"] = page["page"]
+    return payload
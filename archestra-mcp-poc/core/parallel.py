@@ -0,0 +1,66 @@
+"""Lazily created worker pools shared by CPU-bound tools.
+
+Process workers are started with ``forkserver`` where available (``spawn``
+elsewhere) so that forking never copies the event loop, its threads or the
+engine locks into a child. The thread pool is only worth using for CPU work
+on free-threaded builds. Pool sizes come from ``SIM_WORKERS`` and default
+to the CPU count.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+_pool: ProcessPoolExecutor | None = None
+_thread_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    raw = os.getenv("SIM_WORKERS", "").strip()
+    if raw:
+        try:
+            return max(1, int(raw))
+        except ValueError as exc:
+            raise ValueError(f"Invalid SIM_WORKERS: {raw}") from exc
+    return os.cpu_count() or 1
+
+
+def free_threaded() -> bool:
+    """True when running on a build with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _pool
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=worker_count(), thread_name_prefix="sim-worker")
+        return _thread_pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool, _thread_pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _thread_pool is not None:
+            _thread_pool.shutdown(wait=False, cancel_futures=True)
+            _thread_pool = None
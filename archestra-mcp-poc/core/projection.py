@@ -0,0 +1,172 @@
+"""Field projection for read tools.
+
+Callers pass dotted paths such as ``risk_state.risk_level`` or
+``components.component_id``; a path through a list applies to every element.
+The paths are turned into a Pydantic ``include`` spec so that only the
+requested fields are converted from engine state and dumped, and derived
+system metrics (status, load, temperature, component_count) are computed
+only when asked for.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from core.state import ComponentState, SystemState
+
+FieldTree = dict[str, "FieldTree"]
+
+SYSTEM_DERIVED_FIELDS: frozenset[str] = frozenset({"status", "load", "temperature", "component_count", "topology"})
+# Most telemetry points per system or component a read tool returns; larger limits are clamped to it.
+MAX_TELEMETRY_LIMIT = 100
+
+
+def clamp_telemetry_limit(telemetry_limit: int) -> int:
+    return max(0, min(int(telemetry_limit), MAX_TELEMETRY_LIMIT))
+
+
+def parse_fields(fields: Iterable[str] | str | None) -> FieldTree | None:
+    """Turn ``["a.b", "a.c", "d"]`` (or ``"a.b,a.c,d"``) into a nested tree."""
+    if fields is None:
+        return None
+    if isinstance(fields, str):
+        fields = fields.split(",")
+
+    tree: FieldTree = {}
+    for raw in fields:
+        path = [part.strip() for part in str(raw).strip().lstrip("$").strip(".").split(".") if part.strip()]
+        if not path:
+            continue
+        node = tree
+        for index, part in enumerate(path):
+            if part in {"*", "[*]"}:
+                continue
+            part = part.removesuffix("[*]")
+            child = node.get(part)
+            if child is not None and not child and index < len(path) - 1:
+                # A shorter path already selected this whole subtree.
+                break
+            if index == len(path) - 1:
+                node[part] = {}
+                break
+            node = node.setdefault(part, {})
+    return tree or None
+
+
+def _list_field_names(model: type[BaseModel]) -> set[str]:
+    names: set[str] = set()
+    for name, info in model.model_fields.items():
+        origin = getattr(info.annotation, "__origin__", None)
+        if origin is list:
+            names.add(name)
+    return names
+
+
+def _include_spec(
+    model: type[BaseModel],
+    tree: FieldTree,
+    path: str = "",
+    derived: frozenset[str] = frozenset(),
+) -> dict[str, Any]:
+    list_fields = _list_field_names(model)
+    spec: dict[str, Any] = {}
+    for name, subtree in tree.items():
+        if name in derived:
+            continue
+        info = model.model_fields.get(name)
+        if info is None:
+            valid = sorted({*model.model_fields, *derived})
+            raise ValueError(f"Unknown field '{path}{name}'. Valid fields: {valid}")
+        if not subtree:
+            spec[name] = True
+            continue
+
+        nested_model = _nested_model(info.annotation)
+        if nested_model is None:
+            raise ValueError(f"Field '{path}{name}' has no sub-fields")
+        nested = _include_spec(nested_model, subtree, f"{path}{name}.")
+        spec[name] = {"__all__": nested} if name in list_fields else nested
+    return spec
+
+
+def _nested_model(annotation: Any) -> type[BaseModel] | None:
+    candidates = [annotation, *getattr(annotation, "__args__", ())]
+    for candidate in candidates:
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+def _system_status(system: SystemState) -> str:
+    level = system.risk_state.risk_level.value
+    if level == "critical":
+        return "critical"
+    if level in {"high", "medium"}:
+        return "risk"
+    return "healthy"
+
+
+def _system_load(system: SystemState) -> float:
+    total_capacity = sum(component.capacity for component in system.components)
+    total_load = sum(component.current_load for component in system.components)
+    if total_capacity > 0.0:
+        return max(0.0, min(1.0, total_load / total_capacity))
+    return 0.0
+
+
+def _system_temperature(system: SystemState) -> float:
+    temperatures = [
+        point.metric_value
+        for component in system.components
+        for point in component.telemetry
+        if point.metric_name == "temperature"
+    ]
+    if temperatures:
+        return sum(temperatures) / len(temperatures)
+    return 0.0
+
+
+def project_system(system: SystemState, tree: FieldTree, telemetry_limit: int | None = None) -> dict[str, Any]:
+    """Serialize only the fields in ``tree`` from ``system``.
+
+    ``telemetry_limit`` (clamped to ``MAX_TELEMETRY_LIMIT``) keeps only the
+    newest points of the system's and of each component's telemetry.
+    """
+    include = _include_spec(system.model_type, tree, derived=SYSTEM_DERIVED_FIELDS)
+
+    tail = None if telemetry_limit is None else clamp_telemetry_limit(telemetry_limit)
+    payload = (
+        system.to_model(
+            fields=include.keys(),
+            telemetry_tail=tail,
+            component_telemetry_tail=tail,
+        ).model_dump(mode="json", include=include)
+        if include
+        else {}
+    )
+
+    if "status" in tree:
+        payload["status"] = _system_status(system)
+    if "load" in tree:
+        payload["load"] = _system_load(system)
+    if "temperature" in tree:
+        payload["temperature"] = _system_temperature(system)
+    if "component_count" in tree:
+        payload["component_count"] = len(system.components)
+    if "topology" in tree:
+        topology_include = _include_spec(system.model_type, {"topology_graph": tree["topology"]})["topology_graph"]
+        payload["topology"] = system.topology_graph.model_dump(
+            mode="json",
+            include=None if topology_include is True else topology_include,
+        )
+    return payload
+
+
+def project_model(model: BaseModel | ComponentState, tree: FieldTree) -> dict[str, Any]:
+    """Serialize only the fields in ``tree`` from a Pydantic model or an engine state object."""
+    if isinstance(model, BaseModel):
+        return model.model_dump(mode="json", include=_include_spec(type(model), tree))
+    include = _include_spec(model.model_type, tree)
+    return model.to_model(fields=include.keys()).model_dump(mode="json", include=include)
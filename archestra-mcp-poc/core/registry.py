@@ -1,8 +1,10 @@
 """Domain plugin registry with Protocol-based interface."""
 from __future__ import annotations
 
-from typing import Protocol, runtime_checkable
+import asyncio
+from typing import Any, Awaitable, Callable, Protocol, Sequence, TypeVar, runtime_checkable
 
+from core.forecasting import HistorySource, SeasonalForecaster, build_forecast_points
 from core.schemas import (
     ActionRequest,
     ActionResult,
@@ -12,6 +14,9 @@ from core.schemas import (
     RiskResult,
 )
 
+_RequestT = TypeVar("_RequestT")
+_ResultT = TypeVar("_ResultT")
+
 
 @runtime_checkable
 class DomainAdapter(Protocol):
@@ -20,14 +25,51 @@ class DomainAdapter(Protocol):
 
     async def forecast(self, request: ForecastRequest) -> ForecastResult: ...
 
+    async def forecast_many(self, requests: Sequence[ForecastRequest]) -> list[ForecastResult]: ...
+
     async def evaluate_risk(self, request: RiskRequest) -> RiskResult: ...
 
+    async def evaluate_risk_many(self, requests: Sequence[RiskRequest]) -> list[RiskResult]: ...
+
     async def execute_action(self, request: ActionRequest) -> ActionResult: ...
 
 
+async def forecast_batch(
+    domain: str,
+    requests: Sequence[ForecastRequest],
+    history: HistorySource,
+    forecaster: SeasonalForecaster,
+) -> list[ForecastResult]:
+    """``forecast_many`` for adapters backed by ``core.forecasting``; the batch runs in a worker thread."""
+    if not requests:
+        return []
+    batch = await asyncio.to_thread(
+        build_forecast_points,
+        [request.entity_id for request in requests],
+        [request.horizon_hours for request in requests],
+        history,
+        forecaster,
+    )
+    return [
+        ForecastResult(
+            entity_id=request.entity_id,
+            domain=domain,
+            horizon_hours=request.horizon_hours,
+            points=points,
+        )
+        for request, points in zip(requests, batch)
+    ]
+
+
 class DomainRegistry:
-    def __init__(self) -> None:
+    def __init__(self, max_concurrency: int = 8, batch_size: int = 256) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
         self._domains: dict[str, DomainAdapter] = {}
+        self._max_concurrency = max_concurrency
+        self._batch_size = batch_size
 
     def register(self, adapter: DomainAdapter) -> None:
         self._domains[adapter.name] = adapter
@@ -41,5 +83,52 @@ class DomainRegistry:
     def available(self) -> list[str]:
         return list(self._domains.keys())
 
+    async def forecast_many(
+        self,
+        requests: Sequence[tuple[str, ForecastRequest]],
+    ) -> list[ForecastResult]:
+        """Forecast ``(domain, request)`` pairs; results follow input order."""
+        return await self._fan_out(requests, lambda adapter: adapter.forecast_many)
+
+    async def evaluate_risk_many(
+        self,
+        requests: Sequence[tuple[str, RiskRequest]],
+    ) -> list[RiskResult]:
+        """Evaluate ``(domain, request)`` pairs; results follow input order."""
+        return await self._fan_out(requests, lambda adapter: adapter.evaluate_risk_many)
+
+    async def _fan_out(
+        self,
+        requests: Sequence[tuple[str, _RequestT]],
+        method: Callable[[DomainAdapter], Callable[[Sequence[_RequestT]], Awaitable[list[_ResultT]]]],
+    ) -> list[_ResultT]:
+        # Group by domain first so unknown domains fail before any work starts,
+        # then split each group into batches that run under one semaphore.
+        positions: dict[str, list[int]] = {}
+        for index, (domain, _) in enumerate(requests):
+            positions.setdefault(domain, []).append(index)
+        adapters = {domain: self.get(domain) for domain in positions}
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        results: list[Any] = [None] * len(requests)
+
+        async def run_batch(domain: str, indices: list[int]) -> None:
+            async with semaphore:
+                batch = [requests[index][1] for index in indices]
+                outputs = await method(adapters[domain])(batch)
+            if len(outputs) != len(indices):
+                raise RuntimeError(
+                    f"Domain '{domain}' returned {len(outputs)} results for {len(indices)} requests"
+                )
+            for index, output in zip(indices, outputs):
+                results[index] = output
+
+        async with asyncio.TaskGroup() as group:
+            for domain, indices in positions.items():
+                for offset in range(0, len(indices), self._batch_size):
+                    group.create_task(run_batch(domain, indices[offset : offset + self._batch_size]))
+
+        return results
+
 
 registry = DomainRegistry()
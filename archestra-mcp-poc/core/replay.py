@@ -0,0 +1,342 @@
+"""Replay of recorded telemetry through the engines.
+
+A recording is either a capture in the NDJSON ingestion format of
+``core.ingest`` with every line carrying a ``timestamp`` and lines sorted by
+it, or the output directory (or ``manifest.json``) of ``batch_runner.py``,
+whose ``telemetry`` table is converted once into such a capture in a
+temporary file. The capture is memory-mapped and indexed into *frames*, the
+byte ranges of lines sharing a timestamp, so only the frame being played is
+ever copied out of the page cache and parsed.
+
+Playback maps recorded time onto the engine's simulation clock at
+``speed`` (1, 10 and 100 are the usual settings): the frame recorded at
+``t`` is due at ``anchor + (t - position) / speed`` of simulated time. The
+engine applies due frames through the same path as live ingestion, stamped
+with their due time, before each simulation step, so replayed components
+stop being simulated while they are fed and every tool reads them exactly
+as it reads live data. ``seek`` moves to a position in the recording and
+``loop`` restarts it one frame period after its last frame. Like the
+simulation, playback skips ahead instead of applying more than
+``MAX_CATCH_UP_FRAMES`` frames in one go.
+
+``SIM_REPLAY`` names a recording to start playing once the world is built,
+with ``SIM_REPLAY_SPEED`` and ``SIM_REPLAY_LOOP``.
+"""
+from __future__ import annotations
+
+import bisect
+import gzip
+import importlib.util
+import json
+import mmap
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from core.ingest import MAX_REPORTED_ERRORS, IngestBatch, _Timestamps, parse_ndjson
+
+MAX_CATCH_UP_FRAMES = 1000
+_TIMESTAMP_FIELD = re.compile(rb'"timestamp"\s*:\s*(?:"([^"\\]*)"|(-?[0-9][0-9.eE+-]*))')
+
+
+@dataclass(frozen=True, slots=True)
+class ReplaySettings:
+    path: str
+    speed: float = 1.0
+    loop: bool = False
+
+
+def replay_settings() -> ReplaySettings | None:
+    path = os.getenv("SIM_REPLAY", "").strip()
+    if not path:
+        return None
+    raw_speed = os.getenv("SIM_REPLAY_SPEED", "1").strip() or "1"
+    try:
+        speed = float(raw_speed)
+    except ValueError as exc:
+        raise ValueError(f"Invalid SIM_REPLAY_SPEED: {raw_speed}") from exc
+    loop = os.getenv("SIM_REPLAY_LOOP", "false").lower() in {"1", "true", "yes"}
+    return ReplaySettings(path=path, speed=speed, loop=loop)
+
+
+def _check_speed(speed: float) -> float:
+    if not speed > 0.0:
+        raise ValueError("Replay speed must be greater than zero")
+    return float(speed)
+
+
+def _read_part(path: Path, fmt: str) -> dict[str, list[Any]]:
+    columns: dict[str, list[Any]]
+    if fmt == "parquet":
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ValueError("Replaying parquet output requires the optional 'pyarrow' package")
+        import pyarrow.parquet as pq
+
+        columns = pq.read_table(path).to_pydict()
+        return columns
+    with gzip.open(path, "rt", encoding="utf-8") as handle:
+        columns = json.load(handle)["columns"]
+    return columns
+
+
+def capture_from_batch_output(directory: Path, target: Path) -> None:
+    """Write the ``telemetry`` table of a ``batch_runner.py`` output as an NDJSON capture."""
+    manifest_path = directory / "manifest.json"
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise ValueError(f"Replay directory has no manifest.json: {directory}") from None
+    table = manifest.get("tables", {}).get("telemetry")
+    if table is None:
+        raise ValueError(f"Batch output has no telemetry table: {directory}")
+    with target.open("w", encoding="utf-8") as out:
+        for part in table["parts"]:
+            columns = _read_part(directory / part["path"], manifest.get("format", "json.gz"))
+            for timestamp, component_id, metric_name, metric_value, units in zip(
+                columns["timestamp"],
+                columns["component_id"],
+                columns["metric_name"],
+                columns["metric_value"],
+                columns["units"],
+            ):
+                out.write(
+                    json.dumps(
+                        {
+                            "component_id": component_id,
+                            "metric_name": metric_name,
+                            "metric_value": metric_value,
+                            "timestamp": timestamp,
+                            "units": units,
+                        },
+                        separators=(",", ":"),
+                    )
+                )
+                out.write("\n")
+
+
+class ReplaySource:
+    def __init__(self, path: str | os.PathLike[str], speed: float = 1.0, loop: bool = False) -> None:
+        self._path = Path(path)
+        self._speed = _check_speed(speed)
+        self._loop = loop
+        self._temporary: Path | None = None
+        capture = self._path
+        if self._path.is_dir() or self._path.name == "manifest.json":
+            directory = self._path if self._path.is_dir() else self._path.parent
+            descriptor, name = tempfile.mkstemp(prefix="replay-", suffix=".ndjson")
+            os.close(descriptor)
+            self._temporary = capture = Path(name)
+            try:
+                capture_from_batch_output(directory, capture)
+            except BaseException:
+                self._discard_temporary()
+                raise
+        elif not self._path.is_file():
+            raise ValueError(f"Replay file not found: {self._path}")
+
+        with capture.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                self._discard_temporary()
+                raise ValueError(f"Replay file is empty: {self._path}")
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._times, self._offsets = self._index()
+        except BaseException:
+            self.close()
+            raise
+        duration = self._times[-1] - self._times[0]
+        # Gap between the last frame and the first one of the next cycle when looping.
+        self._period = duration / (len(self._times) - 1) if len(self._times) > 1 else 1.0
+        self._next = 0
+        self._anchor_sim: datetime | None = None
+        self._anchor_recorded = self._times[0]
+        self.cycles = 0
+        self.frames_played = 0
+        self.frames_skipped = 0
+        self.points_accepted = 0
+        self.points_rejected = 0
+        self.errors: list[str] = []
+
+    def _index(self) -> tuple[list[float], list[int]]:
+        """Scan the mapped capture once for frame boundaries (first line of each new timestamp)."""
+        timestamps = _Timestamps()
+        data = self._map
+        times: list[float] = []
+        offsets: list[int] = []
+        last_raw: bytes | None = None
+        for match in _TIMESTAMP_FIELD.finditer(data):
+            raw = match.group(1) if match.group(1) is not None else match.group(2)
+            if raw == last_raw:
+                continue
+            last_raw = raw
+            try:
+                parsed = timestamps.parse(raw.decode() if match.group(1) is not None else float(raw))
+            except (UnicodeDecodeError, ValueError) as error:
+                raise ValueError(f"Replay file {self._path} at byte {match.start()}: {error}") from None
+            assert parsed is not None
+            moment = parsed.timestamp()
+            if times and moment <= times[-1]:
+                if moment == times[-1]:
+                    continue
+                raise ValueError(
+                    f"Replay file {self._path} is not sorted by timestamp at byte {match.start()}"
+                )
+            times.append(moment)
+            offsets.append(0 if not offsets else data.rfind(b"\n", 0, match.start()) + 1)
+        if not times:
+            raise ValueError(f"Replay file has no timestamped points: {self._path}")
+        return times, offsets
+
+    @property
+    def speed(self) -> float:
+        return self._speed
+
+    @property
+    def loop(self) -> bool:
+        return self._loop
+
+    @property
+    def finished(self) -> bool:
+        return not self._loop and self._next >= len(self._times)
+
+    def close(self) -> None:
+        self._map.close()
+        self._discard_temporary()
+
+    def _discard_temporary(self) -> None:
+        if self._temporary is not None:
+            try:
+                self._temporary.unlink()
+            except FileNotFoundError:
+                pass
+            self._temporary = None
+
+    def _due(self, index: int) -> datetime:
+        assert self._anchor_sim is not None
+        return self._anchor_sim + timedelta(seconds=(self._times[index] - self._anchor_recorded) / self._speed)
+
+    def _recorded_at(self, now: datetime) -> float:
+        """Recorded time playing at simulated time ``now``, before any loop wrap-around."""
+        assert self._anchor_sim is not None
+        return self._anchor_recorded + (now - self._anchor_sim).total_seconds() * self._speed
+
+    def _move_to(self, recorded: float, now: datetime) -> None:
+        """Make the recording position ``recorded`` (wrapped when looping) play at ``now``."""
+        first, last = self._times[0], self._times[-1]
+        if self._loop and recorded > last:
+            cycle = last - first + self._period
+            wraps, offset = divmod(recorded - first, cycle)
+            self.cycles += int(wraps)
+            recorded = first + offset
+        recorded = max(first, recorded)
+        self._anchor_sim = now
+        self._anchor_recorded = recorded
+        self._next = bisect.bisect_left(self._times, recorded)
+
+    def start(self, now: datetime, position_seconds: float = 0.0) -> None:
+        self._anchor_sim = now
+        self.seek(position_seconds, now)
+
+    def seek(self, position_seconds: float, now: datetime) -> None:
+        """Play from ``position_seconds`` after the first recorded frame, starting at ``now``."""
+        if position_seconds < 0.0:
+            raise ValueError("Replay position must not be negative")
+        self._move_to(self._times[0] + position_seconds, now)
+
+    def set_speed(self, speed: float, now: datetime) -> None:
+        speed = _check_speed(speed)
+        if self._anchor_sim is not None and now > self._anchor_sim:
+            self._anchor_recorded = self._recorded_at(now)
+            self._anchor_sim = now
+        self._speed = speed
+
+    def set_loop(self, loop: bool) -> None:
+        self._loop = loop
+
+    def next_due(self) -> datetime | None:
+        """Simulated time at which the next frame is due, or None when playback has ended."""
+        if self._anchor_sim is None:
+            return None
+        if self._next >= len(self._times):
+            if not self._loop:
+                return None
+            return self._due(len(self._times) - 1) + timedelta(seconds=self._period / self._speed)
+        return self._due(self._next)
+
+    def _wrap(self) -> None:
+        self._anchor_sim = self._due(len(self._times) - 1) + timedelta(seconds=self._period / self._speed)
+        self._anchor_recorded = self._times[0]
+        self._next = 0
+        self.cycles += 1
+
+    def pop_due(self, until: datetime) -> list[tuple[datetime, IngestBatch]]:
+        """Frames due by ``until`` in order, each parsed with its points left to be stamped on apply."""
+        frames: list[tuple[datetime, IngestBatch]] = []
+        if self._anchor_sim is None:
+            return frames
+        count = len(self._times)
+        while len(frames) < MAX_CATCH_UP_FRAMES:
+            if self._next >= count:
+                if not self._loop:
+                    return frames
+                self._wrap()
+            due = self._due(self._next)
+            if due > until:
+                return frames
+            frames.append((due, self._frame(self._next)))
+            self._next += 1
+        # Still behind after the cap: skip to the frame playing at ``until``, like the simulation's catch-up.
+        position, cycles = self._next, self.cycles
+        self._move_to(self._recorded_at(until), until)
+        self.frames_skipped += (self.cycles - cycles) * count + self._next - position
+        return frames
+
+    def _frame(self, index: int) -> IngestBatch:
+        start = self._offsets[index]
+        end = self._offsets[index + 1] if index + 1 < len(self._offsets) else len(self._map)
+        batch = parse_ndjson(self._map[start:end])
+        # Replayed points are stamped with their due time, not their recorded one.
+        batch.rows = [(component_id, metric, value, None, units) for component_id, metric, value, _, units in batch.rows]
+        return batch
+
+    def record(self, result: dict[str, Any]) -> None:
+        self.frames_played += 1
+        self.points_accepted += result["accepted"]
+        self.points_rejected += result["rejected"]
+        for error in result["errors"]:
+            if len(self.errors) >= MAX_REPORTED_ERRORS:
+                break
+            self.errors.append(f"frame {self.frames_played}: {error}")
+
+    def status(self, now: datetime) -> dict[str, Any]:
+        first, last = self._times[0], self._times[-1]
+        if self.finished:
+            position = last - first
+        elif self._anchor_sim is None:
+            position = 0.0
+        elif self._next < len(self._times):
+            position = min(max(self._recorded_at(now), first), self._times[self._next]) - first
+        else:
+            position = last - first
+        next_due = self.next_due()
+        return {
+            "path": str(self._path),
+            "frames": len(self._times),
+            "recorded_start": datetime.fromtimestamp(first, tz=now.tzinfo).isoformat(),
+            "duration_seconds": round(last - first, 3),
+            "position_seconds": round(position, 3),
+            "speed": self._speed,
+            "loop": self._loop,
+            "finished": self.finished,
+            "cycles": self.cycles,
+            "next_frame_due": next_due.isoformat() if next_due is not None else None,
+            "frames_played": self.frames_played,
+            "frames_skipped": self.frames_skipped,
+            "points_accepted": self.points_accepted,
+            "points_rejected": self.points_rejected,
+            "errors": self.errors,
+        }
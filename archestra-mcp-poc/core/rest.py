@@ -0,0 +1,206 @@
+"""Cached REST snapshots for dashboard polling.
+
+Dashboards poll a handful of read-only resources. Each response body is
+encoded once per state version and kept in a small LRU together with its
+gzip variant (and zstd, when the optional ``zstandard`` package is
+installed). The strong ETag is a hash of the body plus the content
+encoding, so it only changes when the resource itself does, not whenever
+any other system ticks; a poll whose ``If-None-Match`` still matches gets an
+empty 304 carrying the same ETag a 200 would, and any poll at an unchanged
+state version is a cache lookup instead of a model dump.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib
+import importlib.util
+import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, TypeVar
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from core.state import SYSTEM_FIELDS
+
+if TYPE_CHECKING:
+    from core.state import ComponentState, SystemState
+
+_LiveT = TypeVar("_LiveT")
+
+# Bodies smaller than this are sent uncompressed; the framing would eat the saving.
+MIN_COMPRESS_BYTES = 512
+TELEMETRY_LIMIT = 25
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+_SNAPSHOT_FIELDS = SYSTEM_FIELDS - {"topology_graph"}
+
+_zstd_compressor: Any = None
+if importlib.util.find_spec("zstandard") is not None:
+    _zstd_compressor = importlib.import_module("zstandard").ZstdCompressor(level=ZSTD_LEVEL)
+
+SUPPORTED_ENCODINGS: tuple[str, ...] = ("zstd", "gzip") if _zstd_compressor is not None else ("gzip",)
+
+
+class EncodedSnapshot:
+    """One JSON body at a given version, with compressed variants built on first use."""
+
+    def __init__(self, version: int, body: bytes) -> None:
+        self.version = version
+        self.body = body
+        self.tag = hashlib.blake2b(body, digest_size=12).hexdigest()
+        self._variants: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str = "identity") -> str:
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.tag}{suffix}"'
+
+    def encoded(self, encoding: str) -> bytes:
+        if encoding == "identity":
+            return self.body
+        with self._lock:
+            variant = self._variants.get(encoding)
+            if variant is None:
+                if encoding == "zstd":
+                    variant = _zstd_compressor.compress(self.body)
+                else:
+                    variant = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+                self._variants[encoding] = variant
+            return variant
+
+
+class SnapshotCache:
+    """LRU of encoded snapshots keyed by resource; an entry is only served at its own version."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self._entries: OrderedDict[tuple[str, ...], EncodedSnapshot] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, ...], version: int) -> EncodedSnapshot | None:
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is None or snapshot.version != version:
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def put(self, key: tuple[str, ...], version: int, payload: Any) -> EncodedSnapshot:
+        snapshot = EncodedSnapshot(version, json.dumps(payload, separators=(",", ":")).encode())
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current.version > version:
+                return snapshot
+            self._entries[key] = snapshot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return snapshot
+
+
+def negotiate_encoding(accept_encoding: str | None, size: int) -> str:
+    if not accept_encoding or size < MIN_COMPRESS_BYTES:
+        return "identity"
+    weights: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            weights[name.strip().lower()] = quality
+    wildcard = weights.get("*", 0.0)
+    for encoding in SUPPORTED_ENCODINGS:
+        if weights.get(encoding, wildcard) > 0.0:
+            return encoding
+    return "identity"
+
+
+def _client_tags(if_none_match: str | None) -> tuple[bool, set[str]]:
+    """Return (matches anything, opaque tags without encoding suffix) from ``If-None-Match``."""
+    if not if_none_match:
+        return False, set()
+    tags: set[str] = set()
+    for raw in if_none_match.split(","):
+        tag = raw.strip()
+        if tag == "*":
+            return True, set()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        for encoding in ("gzip", "zstd"):
+            tag = tag.removesuffix(f"-{encoding}")
+        tags.add(tag)
+    return False, tags
+
+
+def system_snapshot(system: SystemState) -> dict[str, Any]:
+    return system.to_model(fields=_SNAPSHOT_FIELDS, telemetry_tail=TELEMETRY_LIMIT).model_dump(
+        mode="json", exclude={"topology_graph"}
+    )
+
+
+def risk_snapshot(system: SystemState) -> dict[str, Any]:
+    return {"system_id": system.system_id, **system.risk_state.model_dump(mode="json")}
+
+
+def component_snapshot(component: ComponentState) -> dict[str, Any]:
+    return component.to_model().model_dump(mode="json")
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes | None:
+    """The request body, or None as soon as it is known to exceed ``max_bytes``."""
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_bytes:
+        return None
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            return None
+    return bytes(body)
+
+
+async def snapshot_response(
+    request: Request,
+    cache: SnapshotCache,
+    key: tuple[str, ...],
+    current_version: Callable[[], int],
+    read: Callable[[Callable[[_LiveT], Any]], Awaitable[Any]],
+    build: Callable[[_LiveT], Any],
+) -> Response:
+    """Serve ``build(live)`` for the resource behind ``read`` with ETag/304 and compression.
+
+    ``read`` runs its reader under the owning engine's lock, so the version
+    and the payload always agree. The payload is only built on a cache miss,
+    at most once per resource and state version.
+    """
+    match_any, client_tags = _client_tags(request.headers.get("if-none-match"))
+
+    def reader(live: _LiveT) -> tuple[int, EncodedSnapshot | None, Any]:
+        version = current_version()
+        cached = cache.get(key, version)
+        return version, cached, build(live) if cached is None else None
+
+    try:
+        version, snapshot, payload = await read(reader)
+    except KeyError as error:
+        return JSONResponse(content={"detail": str(error.args[0]) if error.args else str(error)}, status_code=404)
+
+    if snapshot is None:
+        snapshot = cache.put(key, version, payload)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(snapshot.body))
+    headers = {"Cache-Control": "no-cache", "Vary": "Accept-Encoding", "ETag": snapshot.etag(encoding)}
+    if match_any or snapshot.tag in client_tags:
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=snapshot.encoded(encoding), media_type="application/json", headers=headers)
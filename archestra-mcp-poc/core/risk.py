@@ -0,0 +1,29 @@
+"""Risk score formula shared by the engines and contingency analysis."""
+from __future__ import annotations
+
+from models import RiskLevel
+
+
+def risk_score(
+    avg_utilization: float,
+    critical_count: int,
+    degraded_count: int,
+    anomalous_count: int,
+    hard_violation_count: int,
+    component_count: int,
+) -> float:
+    size = max(component_count, 1)
+    score = (0.50 * min(avg_utilization, 1.0)) + (0.30 * (critical_count / size)) + (0.20 * (degraded_count / size))
+    score += 0.10 * (anomalous_count / size)
+    score += 0.15 * (hard_violation_count / size)
+    return max(0.0, min(1.0, score))
+
+
+def risk_level(score: float) -> RiskLevel:
+    if score >= 0.85:
+        return RiskLevel.CRITICAL
+    if score >= 0.65:
+        return RiskLevel.HIGH
+    if score >= 0.35:
+        return RiskLevel.MEDIUM
+    return RiskLevel.LOW
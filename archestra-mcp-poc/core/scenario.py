@@ -0,0 +1,355 @@
+"""Declarative scenario files for the simulated fleet.
+
+A scenario lists systems with the same field names as ``SystemModel``::
+
+    {
+      "name": "two feeders",
+      "systems": [
+        {
+          "system_id": "grid_001",
+          "system_type": "power_grid",
+          "name": "North Power Grid",
+          "location": "North Region",
+          "components": [
+            {"component_id": "sub_a", "component_type": "substation", "capacity": 120.0, "current_load": 65.0}
+          ],
+          "topology_graph": {"edges": [{"source_component_id": "sub_a", "target_component_id": "tx_b"}]},
+          "operational_constraints": [{"name": "max_line_loading", "max_value": 1.05, "units": "ratio"}],
+          "metadata": {}
+        }
+      ]
+    }
+
+``current_load`` is the initial load; ``topology_graph.nodes`` defaults to
+the component ids. Files ending in ``.json`` hold one such document, and
+``.jsonl``/``.ndjson`` files hold one system per line. ``.yaml``/``.yml``
+files, which need the optional PyYAML package, hold either such documents
+or one system per YAML document.
+
+Systems are parsed one at a time, so a large ``systems`` array is never
+held as a whole parsed document. Each system is turned straight into engine
+state without building Pydantic components: components become plain
+``ComponentState`` objects checked inline, and edges and constraints are
+validated a whole list at a time by pydantic-core. ``SIM_SCENARIO`` names
+the file the servers load at startup in place of the built-in sample fleet.
+"""
+from __future__ import annotations
+
+import gc
+import importlib
+import importlib.util
+import json
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from core.state import ComponentState, SystemState
+from models import HealthStatus, OperationalConstraint, OperationalState, RiskState, TopologyEdge, TopologyGraph
+
+_yaml: Any = None
+if importlib.util.find_spec("yaml") is not None:
+    _yaml = importlib.import_module("yaml")
+
+JSON_SUFFIXES: frozenset[str] = frozenset({".json"})
+JSON_LINES_SUFFIXES: frozenset[str] = frozenset({".jsonl", ".ndjson"})
+YAML_SUFFIXES: frozenset[str] = frozenset({".yaml", ".yml"})
+READ_CHUNK_CHARS = 1 << 20
+
+_OPERATIONAL_STATES = {state.value: state for state in OperationalState}
+_HEALTH_STATUSES = {status.value: status for status in HealthStatus}
+_WHITESPACE = " \t\n\r"
+# Edges and constraints are validated a whole list at a time, which pydantic-core does faster than
+# a Python loop of ``model_construct`` calls.
+_EDGES: TypeAdapter[list[TopologyEdge]] = TypeAdapter(list[TopologyEdge])
+_CONSTRAINTS: TypeAdapter[list[OperationalConstraint]] = TypeAdapter(list[OperationalConstraint])
+_NODES: TypeAdapter[list[str]] = TypeAdapter(list[str])
+
+
+def scenario_path() -> str | None:
+    raw = os.getenv("SIM_SCENARIO", "").strip()
+    return raw or None
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Hold off cyclic garbage collection while a scenario is loaded.
+
+    Loading allocates hundreds of thousands of long-lived, acyclic objects,
+    which would otherwise trigger repeated full collections that free nothing.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class _JsonStream:
+    """Incremental reader of one JSON document that decodes a value at a time."""
+
+    def __init__(self, handle: Any) -> None:
+        self._handle = handle
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        # Read at least as much as is buffered so re-decoding a long value stays linear overall.
+        chunk = self._handle.read(max(READ_CHUNK_CHARS, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, token: str) -> None:
+        found = self.peek()
+        if found != token:
+            raise ValueError(f"Expected '{token}' in scenario JSON, found {found or 'end of file'!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid scenario JSON: {error.msg}") from error
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._buffer) and not self._eof and isinstance(value, (int, float)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_json_systems(handle: Any) -> Iterator[dict[str, Any]]:
+    stream = _JsonStream(handle)
+    if stream.peek() == "[":
+        yield from _iter_json_array(stream)
+        return
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == "systems":
+            yield from _iter_json_array(stream)
+        else:
+            stream.value()
+        if stream.peek() == "}":
+            return
+        stream.expect(",")
+
+
+def _iter_json_array(stream: _JsonStream) -> Iterator[dict[str, Any]]:
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.expect("]")
+        return
+    while True:
+        yield stream.value()
+        if stream.peek() == "]":
+            stream.expect("]")
+            return
+        stream.expect(",")
+
+
+def _iter_json_lines(handle: Any) -> Iterator[dict[str, Any]]:
+    for number, line in enumerate(handle, start=1):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"Invalid scenario JSON on line {number}: {error}") from error
+
+
+def _iter_yaml_systems(handle: Any) -> Iterator[dict[str, Any]]:
+    if _yaml is None:
+        raise ValueError("YAML scenarios need the PyYAML package; install it or use a JSON scenario")
+    loader = getattr(_yaml, "CSafeLoader", _yaml.SafeLoader)
+    for document in _yaml.load_all(handle, Loader=loader):
+        if document is None:
+            continue
+        if isinstance(document, dict) and "systems" in document:
+            yield from document["systems"] or []
+        elif isinstance(document, list):
+            yield from document
+        else:
+            yield document
+
+
+def _component_error(raw: Any, where: str, component_ids: set[str]) -> ValueError:
+    """Explain why ``raw`` was rejected by the fast path in ``_components``."""
+    if not isinstance(raw, dict) or not all(key in raw for key in ("component_id", "component_type", "capacity")):
+        return ValueError(f"{where}: component_id, component_type and capacity are required")
+    component_id = raw["component_id"]
+    if not isinstance(component_id, str) or not component_id:
+        return ValueError(f"{where}: component_id must be a non-empty string")
+    if component_id in component_ids:
+        return ValueError(f"{where}: duplicate component_id {component_id}")
+    for field in ("capacity", "current_load"):
+        value = raw.get(field, 0.0)
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return ValueError(f"{where}: {field} must be a number, got {value!r}")
+        if not number >= 0.0:
+            return ValueError(f"{where}: {field} must be a non-negative number, got {value!r}")
+    for field, values, default in (
+        ("operational_state", _OPERATIONAL_STATES, "running"),
+        ("health_status", _HEALTH_STATUSES, "healthy"),
+    ):
+        value = raw.get(field, default)
+        if not isinstance(value, str) or value not in values:
+            return ValueError(f"{where}: unknown {field} {value!r}. Valid: {sorted(values)}")
+    return ValueError(f"{where}: invalid component")
+
+
+def _components(raw_components: Any, system_id: str, component_ids: set[str]) -> list[ComponentState]:
+    if not isinstance(raw_components, list):
+        raise ValueError(f"System {system_id}: components must be a list")
+    components: list[ComponentState] = []
+    append = components.append
+    seen = component_ids.add
+    for index, raw in enumerate(raw_components):
+        # Fast path: every check is inline; _component_error works out the message on failure.
+        try:
+            component_id = raw["component_id"]
+            capacity = float(raw["capacity"])
+            current_load = float(raw.get("current_load", 0.0))
+            valid = (
+                type(component_id) is str
+                and component_id != ""
+                and component_id not in component_ids
+                and capacity >= 0.0
+                and current_load >= 0.0
+            )
+            if valid:
+                operational_state = _OPERATIONAL_STATES[raw.get("operational_state", "running")]
+                health_status = _HEALTH_STATUSES[raw.get("health_status", "healthy")]
+                component_type = str(raw["component_type"])
+        except (KeyError, TypeError, ValueError):
+            valid = False
+        if not valid:
+            raise _component_error(raw, f"System {system_id} component {index}", component_ids)
+        seen(component_id)
+        metadata = raw.get("metadata")
+        append(
+            ComponentState(
+                component_id,
+                component_type,
+                system_id,
+                capacity,
+                current_load,
+                operational_state,
+                health_status,
+                None,
+                dict(metadata) if metadata else None,
+            )
+        )
+    return components
+
+
+def _validated(adapter: TypeAdapter[Any], raw: Any, what: str) -> Any:
+    try:
+        return adapter.validate_python(raw)
+    except ValidationError as error:
+        first = error.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        raise ValueError(f"{what} {location}: {first['msg']}") from error
+
+
+def _topology(raw: Any, system_id: str, components: list[ComponentState]) -> TopologyGraph:
+    raw = raw or {}
+    if not isinstance(raw, dict):
+        raise ValueError(f"System {system_id}: topology_graph must be an object")
+    nodes = raw.get("nodes")
+    if nodes is None:
+        nodes = [component.component_id for component in components]
+    else:
+        nodes = _validated(_NODES, nodes, f"System {system_id} node")
+    edges: list[TopologyEdge] = _validated(_EDGES, raw.get("edges") or [], f"System {system_id} edge")
+    known = {component.component_id for component in components}
+    for index, edge in enumerate(edges):
+        for endpoint in (edge.source_component_id, edge.target_component_id):
+            if endpoint not in known:
+                raise ValueError(f"System {system_id} edge {index}: unknown component {endpoint!r}")
+    return TopologyGraph.model_construct(nodes=nodes, edges=edges)
+
+
+def build_system(raw: Any, component_ids: set[str] | None = None) -> SystemState:
+    """Turn one parsed scenario system into engine state; see the module docstring."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"Scenario systems must be objects, got {type(raw).__name__}")
+    try:
+        system_id = raw["system_id"]
+        system_type = raw["system_type"]
+    except KeyError as error:
+        raise ValueError(f"Scenario system is missing {error.args[0]}") from error
+    if not isinstance(system_id, str) or not system_id:
+        raise ValueError("Scenario system_id must be a non-empty string")
+    components = _components(raw.get("components") or [], system_id, set() if component_ids is None else component_ids)
+    metadata = raw.get("metadata")
+    return SystemState(
+        system_id=system_id,
+        system_type=str(system_type),
+        name=str(raw.get("name", system_id)),
+        location=str(raw.get("location", "")),
+        components=components,
+        topology_graph=_topology(raw.get("topology_graph"), system_id, components),
+        telemetry=[],
+        operational_constraints=_validated(
+            _CONSTRAINTS, raw.get("operational_constraints") or [], f"System {system_id} constraint"
+        ),
+        risk_state=RiskState.model_construct(),
+        metadata=dict(metadata) if metadata else {},
+    )
+
+
+def iter_scenario(path: str | os.PathLike[str]) -> Iterator[SystemState]:
+    """Yield the systems of the scenario at ``path`` one by one, in file order."""
+    scenario = Path(path)
+    suffix = scenario.suffix.lower()
+    if suffix in JSON_SUFFIXES:
+        parse = _iter_json_systems
+    elif suffix in JSON_LINES_SUFFIXES:
+        parse = _iter_json_lines
+    elif suffix in YAML_SUFFIXES:
+        parse = _iter_yaml_systems
+    else:
+        valid = sorted(JSON_SUFFIXES | JSON_LINES_SUFFIXES | YAML_SUFFIXES)
+        raise ValueError(f"Unsupported scenario file type: {scenario.name}. Valid suffixes: {valid}")
+    if not scenario.is_file():
+        raise ValueError(f"Scenario file not found: {scenario}")
+
+    system_ids: set[str] = set()
+    component_ids: set[str] = set()
+    with scenario.open(encoding="utf-8") as handle:
+        for raw in parse(handle):
+            system = build_system(raw, component_ids)
+            if system.system_id in system_ids:
+                raise ValueError(f"Duplicate system_id in scenario: {system.system_id}")
+            system_ids.add(system.system_id)
+            yield system
@@ -0,0 +1,112 @@
+"""Startup readiness and deferred world construction.
+
+With ``MCP_FAST_STARTUP`` enabled a server only imports what it needs to
+start listening; the simulated world is built by a background task once
+the event loop is running, and ``/healthz`` answers 503 until it is done.
+Tool calls that arrive during the build simply wait for it. Servers are
+``CachedToolsFastMCP`` instances: the tool listing is computed once during
+the build and served from a cache, since the set of tools never changes
+after import.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import Tool
+
+logger = logging.getLogger("infra.startup")
+
+FAST_STARTUP = os.getenv("MCP_FAST_STARTUP", "false").lower() in {"1", "true", "yes"}
+
+_PROCESS_STARTED = time.monotonic()
+
+
+class StartupState:
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._phase = "starting"
+        self._error: str | None = None
+        self._ready_at: float | None = None
+        self._ready = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def phase(self) -> str:
+        return self._phase
+
+    @property
+    def is_ready(self) -> bool:
+        return self._phase == "ready"
+
+    def mark_ready(self) -> None:
+        self._phase = "ready"
+        self._ready_at = time.monotonic()
+        self._ready.set()
+        logger.info("%s ready in %.3fs", self._name, self._ready_at - _PROCESS_STARTED)
+
+    async def begin(self, build: Callable[[], Awaitable[None]]) -> None:
+        """Start ``build`` once in the background; later calls are no-ops."""
+        if self._task is not None or self.is_ready:
+            return
+        self._phase = "building"
+        self._task = asyncio.create_task(self._run(build), name=f"{self._name}-startup")
+        # Let the build take the locks it needs before any request is served.
+        await asyncio.sleep(0)
+
+    async def _run(self, build: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await build()
+        except Exception as error:
+            self._phase = "failed"
+            self._error = str(error)
+            logger.exception("%s startup failed", self._name)
+            return
+        self.mark_ready()
+
+    async def wait_ready(self, timeout: float | None = None) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def healthz(self) -> tuple[int, dict[str, Any]]:
+        payload: dict[str, Any] = {
+            "status": "ok" if self.is_ready else self._phase,
+            "ready": self.is_ready,
+            "uptime_seconds": round(time.monotonic() - _PROCESS_STARTED, 3),
+            "time_to_ready_seconds": (
+                round(self._ready_at - _PROCESS_STARTED, 3) if self._ready_at is not None else None
+            ),
+        }
+        if self._error is not None:
+            payload["error"] = self._error
+        return (200 if self.is_ready else 503), payload
+
+
+class CachedToolsFastMCP(FastMCP[Any]):
+    """``FastMCP`` that builds its ``tools/list`` answer once and reuses it until a tool is added or removed.
+
+    FastMCP registers its own ``list_tools`` as the protocol handler, so overriding the public
+    method is enough; await it during startup to fill the cache before the first client asks.
+    """
+
+    _tool_listing: list[Tool] | None = None
+
+    async def list_tools(self) -> list[Tool]:
+        if self._tool_listing is None:
+            self._tool_listing = await super().list_tools()
+        return self._tool_listing
+
+    def add_tool(self, *args: Any, **kwargs: Any) -> None:
+        self._tool_listing = None
+        super().add_tool(*args, **kwargs)
+
+    def remove_tool(self, name: str) -> None:
+        self._tool_listing = None
+        super().remove_tool(name)
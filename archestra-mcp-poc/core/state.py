@@ -0,0 +1,248 @@
+"""Compact engine-side world state.
+
+The engines mutate components and append telemetry on every step, so the
+live world is kept in plain ``__slots__`` classes instead of the Pydantic
+models in ``models.py``: attribute writes are ordinary slot stores and a
+telemetry point costs one small object rather than a model instance with
+its ``__dict__`` and fields set. Systems are built as Pydantic models,
+converted once with ``from_model``, and converted back with ``to_model``
+only when a result leaves through a tool or endpoint. ``to_model`` uses
+``model_construct`` (the values were validated on the way in) and copies
+every mutable value, so a returned model is detached from the live state
+just like the ``model_copy(deep=True)`` results it replaces.
+
+The per-system pieces that change rarely or are replaced wholesale
+(topology, constraints, risk state) stay Pydantic models.
+"""
+from __future__ import annotations
+
+import copy
+from collections.abc import Collection
+from datetime import datetime
+from typing import Any, ClassVar
+
+from models import (
+    Component,
+    HealthStatus,
+    OperationalConstraint,
+    OperationalState,
+    RiskState,
+    SystemModel,
+    TelemetryPoint,
+    TopologyGraph,
+)
+
+COMPONENT_FIELDS: frozenset[str] = frozenset(Component.model_fields)
+SYSTEM_FIELDS: frozenset[str] = frozenset(SystemModel.model_fields)
+
+
+def operational_state_effect(
+    state: OperationalState,
+    load: float,
+    capacity: float,
+    health: HealthStatus,
+) -> tuple[float, HealthStatus]:
+    """Load and health of a component moved to ``state``.
+
+    Shared by the engines' control actions and contingency analysis: going
+    OFFLINE drops the load and marks the component DEGRADED, and coming back
+    with no load picks up a third of its capacity.
+    """
+    if state == OperationalState.OFFLINE:
+        return 0.0, HealthStatus.DEGRADED
+    if load <= 0.0:
+        return min(capacity * 0.35, capacity), health
+    return load, health
+
+
+class TelemetryRecord:
+    __slots__ = ("timestamp", "metric_name", "metric_value", "units")
+
+    def __init__(self, timestamp: datetime, metric_name: str, metric_value: float, units: str) -> None:
+        self.timestamp = timestamp
+        self.metric_name = metric_name
+        self.metric_value = metric_value
+        self.units = units
+
+    @classmethod
+    def from_model(cls, point: TelemetryPoint) -> TelemetryRecord:
+        return cls(point.timestamp, point.metric_name, point.metric_value, point.units)
+
+    def to_model(self) -> TelemetryPoint:
+        return TelemetryPoint.model_construct(
+            timestamp=self.timestamp,
+            metric_name=self.metric_name,
+            metric_value=self.metric_value,
+            units=self.units,
+        )
+
+
+class ComponentState:
+    __slots__ = (
+        "component_id",
+        "component_type",
+        "system_id",
+        "telemetry",
+        "operational_state",
+        "health_status",
+        "capacity",
+        "current_load",
+        "metadata",
+    )
+    model_type: ClassVar[type[Component]] = Component
+
+    def __init__(
+        self,
+        component_id: str,
+        component_type: str,
+        system_id: str,
+        capacity: float,
+        current_load: float = 0.0,
+        operational_state: OperationalState = OperationalState.RUNNING,
+        health_status: HealthStatus = HealthStatus.HEALTHY,
+        telemetry: list[TelemetryRecord] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        self.component_id = component_id
+        self.component_type = component_type
+        self.system_id = system_id
+        self.capacity = capacity
+        self.current_load = current_load
+        self.operational_state = operational_state
+        self.health_status = health_status
+        self.telemetry: list[TelemetryRecord] = telemetry if telemetry is not None else []
+        self.metadata: dict[str, Any] = metadata if metadata is not None else {}
+
+    @classmethod
+    def from_model(cls, component: Component) -> ComponentState:
+        return cls(
+            component_id=component.component_id,
+            component_type=component.component_type,
+            system_id=component.system_id,
+            capacity=component.capacity,
+            current_load=component.current_load,
+            operational_state=component.operational_state,
+            health_status=component.health_status,
+            telemetry=[TelemetryRecord.from_model(point) for point in component.telemetry],
+            metadata=copy.deepcopy(component.metadata),
+        )
+
+    def to_model(self, fields: Collection[str] | None = None, telemetry_tail: int | None = None) -> Component:
+        """Build a detached ``Component``; with ``fields`` only those are filled in, the rest keep defaults.
+
+        ``telemetry_tail`` converts only the newest telemetry points.
+        """
+        wanted = COMPONENT_FIELDS if fields is None else fields
+        values: dict[str, Any] = {
+            "component_id": self.component_id,
+            "component_type": self.component_type,
+            "system_id": self.system_id,
+            "capacity": self.capacity,
+            "current_load": self.current_load,
+            "operational_state": self.operational_state,
+            "health_status": self.health_status,
+        }
+        if "telemetry" in wanted:
+            points = self.telemetry
+            if telemetry_tail is not None:
+                points = points[-telemetry_tail:] if telemetry_tail > 0 else []
+            values["telemetry"] = [point.to_model() for point in points]
+        if "metadata" in wanted:
+            values["metadata"] = copy.deepcopy(self.metadata) if self.metadata else {}
+        return Component.model_construct(**values)
+
+
+class SystemState:
+    __slots__ = (
+        "system_id",
+        "system_type",
+        "name",
+        "location",
+        "components",
+        "topology_graph",
+        "telemetry",
+        "operational_constraints",
+        "risk_state",
+        "metadata",
+    )
+    model_type: ClassVar[type[SystemModel]] = SystemModel
+
+    def __init__(
+        self,
+        system_id: str,
+        system_type: str,
+        name: str,
+        location: str,
+        components: list[ComponentState],
+        topology_graph: TopologyGraph,
+        telemetry: list[TelemetryRecord],
+        operational_constraints: list[OperationalConstraint],
+        risk_state: RiskState,
+        metadata: dict[str, Any],
+    ) -> None:
+        self.system_id = system_id
+        self.system_type = system_type
+        self.name = name
+        self.location = location
+        self.components = components
+        self.topology_graph = topology_graph
+        self.telemetry = telemetry
+        self.operational_constraints = operational_constraints
+        self.risk_state = risk_state
+        self.metadata = metadata
+
+    @classmethod
+    def from_model(cls, system: SystemModel) -> SystemState:
+        return cls(
+            system_id=system.system_id,
+            system_type=system.system_type,
+            name=system.name,
+            location=system.location,
+            components=[ComponentState.from_model(component) for component in system.components],
+            topology_graph=system.topology_graph.model_copy(deep=True),
+            telemetry=[TelemetryRecord.from_model(point) for point in system.telemetry],
+            operational_constraints=[constraint.model_copy() for constraint in system.operational_constraints],
+            risk_state=system.risk_state.model_copy(deep=True),
+            metadata=copy.deepcopy(system.metadata),
+        )
+
+    def to_model(
+        self,
+        fields: Collection[str] | None = None,
+        telemetry_tail: int | None = None,
+        component_telemetry_tail: int | None = None,
+    ) -> SystemModel:
+        """Build a detached ``SystemModel``.
+
+        With ``fields`` only those top-level fields are converted and the
+        rest keep their defaults; ``telemetry_tail`` and
+        ``component_telemetry_tail`` convert only the newest system and
+        component telemetry points.
+        """
+        wanted = SYSTEM_FIELDS if fields is None else fields
+        values: dict[str, Any] = {
+            "system_id": self.system_id,
+            "system_type": self.system_type,
+            "name": self.name,
+            "location": self.location,
+        }
+        if "components" in wanted:
+            values["components"] = [
+                component.to_model(telemetry_tail=component_telemetry_tail) for component in self.components
+            ]
+        if "topology_graph" in wanted:
+            values["topology_graph"] = self.topology_graph.model_copy(deep=True)
+        if "telemetry" in wanted:
+            points = self.telemetry
+            if telemetry_tail is not None:
+                points = points[-telemetry_tail:] if telemetry_tail > 0 else []
+            values["telemetry"] = [point.to_model() for point in points]
+        if "operational_constraints" in wanted:
+            values["operational_constraints"] = [
+                constraint.model_copy() for constraint in self.operational_constraints
+            ]
+        if "risk_state" in wanted:
+            values["risk_state"] = self.risk_state.model_copy(deep=True)
+        if "metadata" in wanted:
+            values["metadata"] = copy.deepcopy(self.metadata) if self.metadata else {}
+        return SystemModel.model_construct(**values)
@@ -0,0 +1,213 @@
+"""Per-system random streams and the partitioned sampling phase of a tick.
+
+Every system draws from its own ``random.Random`` seeded from the engine's
+root seed and the system id, so a system's trajectory does not depend on
+which other systems exist or on the order they are stepped in. A tick is
+split in two phases:
+
+* sampling - the next load and noise metrics of every online component
+  not fed by live ingestion (``core.ingest``), drawn from the system's
+  stream. It reads nothing but the system type, component capacities and
+  the step timestamps, so systems can be sampled in any order, on any
+  worker, for a whole block of steps at once.
+* applying - telemetry, anomaly detection, constraints, risk and the change
+  log, run by the engine in system order on the engine thread.
+
+``TickSampler.sample`` partitions the systems across the shared worker
+pool once a block is large enough: threads on free-threaded builds, where
+they run the streams in place, and processes otherwise, where each stream
+state travels to the worker and back. The event loop awaits the workers
+rather than blocking on them. Each system is always sampled by
+exactly one worker from its own stream, so the results are identical for
+any worker count and mode. ``SIM_TICK_MODE`` selects ``auto`` (default),
+``serial``, ``threads`` or ``processes``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import random
+from collections.abc import Collection, Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from core.dynamics import NOISE_METRICS, load_model
+from core.parallel import free_threaded, get_process_pool, get_thread_pool, worker_count
+from models import OperationalState
+
+if TYPE_CHECKING:
+    from core.state import SystemState
+
+TICK_MODES: frozenset[str] = frozenset({"auto", "serial", "threads", "processes"})
+# Below this many component-steps per block sampling stays on the engine thread.
+INLINE_WORK_LIMIT = 20_000
+# Longest block of steps sampled at once, which bounds the memory held by pending samples.
+MAX_BLOCK_STEPS = 100
+
+# Per system: one sample per step; per step: one tuple (load, *noise) per component, None when offline.
+StepSamples = list[tuple[float, ...] | None]
+SystemSamples = list[StepSamples]
+
+
+def system_seed(root_seed: int, system_id: str) -> int:
+    """Stable 64-bit seed for ``system_id``'s stream; independent of hash randomization."""
+    digest = hashlib.blake2b(f"{root_seed}:{system_id}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def tick_mode() -> str:
+    mode = os.getenv("SIM_TICK_MODE", "auto").strip().lower() or "auto"
+    if mode not in TICK_MODES:
+        raise ValueError(f"Unknown SIM_TICK_MODE: {mode}. Valid: {sorted(TICK_MODES)}")
+    return mode
+
+
+@dataclass(slots=True)
+class SampleJob:
+    system_id: str
+    system_type: str
+    # None marks an offline or externally fed component, which draws nothing.
+    capacities: tuple[float | None, ...]
+
+
+def draw_steps(
+    system_type: str,
+    rng: random.Random,
+    capacities: Sequence[float | None],
+    timestamps: Sequence[float],
+) -> SystemSamples:
+    model = load_model(system_type)
+    metrics = NOISE_METRICS.get(system_type, ())
+    uniform = rng.uniform
+    steps: SystemSamples = []
+    for timestamp in timestamps:
+        samples: StepSamples = []
+        for capacity in capacities:
+            if capacity is None:
+                samples.append(None)
+                continue
+            load = model(capacity, timestamp, rng)
+            samples.append((load, *[uniform(low, high) for _, low, high, _ in metrics]))
+        steps.append(samples)
+    return steps
+
+
+def _sample_partition(
+    jobs: list[SampleJob],
+    states: list[tuple[Any, ...]],
+    timestamps: tuple[float, ...],
+) -> list[tuple[tuple[Any, ...], SystemSamples]]:
+    """Process worker: sample ``jobs`` from their stream states and return the advanced states."""
+    rng = random.Random()
+    results: list[tuple[tuple[Any, ...], SystemSamples]] = []
+    for job, state in zip(jobs, states):
+        rng.setstate(state)
+        samples = draw_steps(job.system_type, rng, job.capacities, timestamps)
+        results.append((rng.getstate(), samples))
+    return results
+
+
+def _partition(jobs: list[SampleJob], parts: int) -> list[list[SampleJob]]:
+    """Split ``jobs`` into at most ``parts`` contiguous runs of similar component count."""
+    total = sum(len(job.capacities) for job in jobs)
+    target = max(1, -(-total // parts))
+    partitions: list[list[SampleJob]] = [[]]
+    filled = 0
+    for job in jobs:
+        if filled >= target and len(partitions) < parts:
+            partitions.append([])
+            filled = 0
+        partitions[-1].append(job)
+        filled += len(job.capacities)
+    return [partition for partition in partitions if partition]
+
+
+class TickSampler:
+    def __init__(self, seed: int, mode: str | None = None) -> None:
+        self._seed = seed
+        self._mode = mode or tick_mode()
+        if self._mode not in TICK_MODES:
+            raise ValueError(f"Unknown tick mode: {self._mode}. Valid: {sorted(TICK_MODES)}")
+        self._streams: dict[str, random.Random] = {}
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def add_system(self, system_id: str) -> None:
+        self._streams[system_id] = random.Random(system_seed(self._seed, system_id))
+
+    def _effective_mode(self, work: int) -> str:
+        if self._mode == "serial" or work < INLINE_WORK_LIMIT or worker_count() < 2:
+            return "serial"
+        if self._mode == "auto":
+            return "threads" if free_threaded() else "processes"
+        return self._mode
+
+    async def sample(
+        self,
+        systems: Iterable[SystemState],
+        timestamps: Sequence[float],
+        skip: Collection[str] = frozenset(),
+    ) -> dict[str, SystemSamples]:
+        """Draw ``len(timestamps)`` steps for every system; components in ``skip`` draw nothing.
+
+        See the module docstring.
+        """
+        timestamps = tuple(timestamps)
+        jobs = [
+            SampleJob(
+                system_id=system.system_id,
+                system_type=system.system_type,
+                capacities=tuple(
+                    None
+                    if component.operational_state == OperationalState.OFFLINE or component.component_id in skip
+                    else component.capacity
+                    for component in system.components
+                ),
+            )
+            for system in systems
+        ]
+        work = len(timestamps) * sum(len(job.capacities) for job in jobs)
+        mode = self._effective_mode(work)
+
+        if mode == "serial":
+            return {job.system_id: self._draw(job, timestamps) for job in jobs}
+
+        partitions = _partition(jobs, worker_count())
+        loop = asyncio.get_running_loop()
+        results: dict[str, SystemSamples] = {}
+        if mode == "threads":
+
+            def draw_partition(partition: list[SampleJob]) -> list[tuple[str, SystemSamples]]:
+                return [(job.system_id, self._draw(job, timestamps)) for job in partition]
+
+            thread_pool = get_thread_pool()
+            for drawn in await asyncio.gather(
+                *[loop.run_in_executor(thread_pool, draw_partition, partition) for partition in partitions]
+            ):
+                results.update(drawn)
+            return results
+
+        process_pool = get_process_pool()
+        outcomes = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    process_pool,
+                    _sample_partition,
+                    partition,
+                    [self._streams[job.system_id].getstate() for job in partition],
+                    timestamps,
+                )
+                for partition in partitions
+            ]
+        )
+        for partition, outcome in zip(partitions, outcomes):
+            for job, (state, samples) in zip(partition, outcome):
+                self._streams[job.system_id].setstate(state)
+                results[job.system_id] = samples
+        return results
+
+    def _draw(self, job: SampleJob, timestamps: Sequence[float]) -> SystemSamples:
+        return draw_steps(job.system_type, self._streams[job.system_id], job.capacities, timestamps)
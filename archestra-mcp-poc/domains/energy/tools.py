@@ -1,8 +1,18 @@
 """Energy domain adapter."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from typing import Sequence
 
+from core.forecasting import (
+    HistorySource,
+    HourlyRecorder,
+    MetricProfile,
+    RecordedHistory,
+    SeasonalForecaster,
+    SimulatedHistory,
+    build_forecast_points,
+)
+from core.registry import forecast_batch
 from core.schemas import (
     ActionRequest,
     ActionResult,
@@ -13,22 +23,45 @@ from core.schemas import (
     RiskResult,
 )
 
+ENERGY_PROFILES: dict[str, MetricProfile] = {
+    "load_mw": MetricProfile(base=450.0, daily_amplitude=90.0, weekly_amplitude=25.0, noise=12.0, minimum=0.0),
+    "price_per_mwh": MetricProfile(base=35.0, daily_amplitude=9.0, weekly_amplitude=3.0, noise=1.5, minimum=0.0),
+}
+
 
 class EnergyDomain:
+    """Energy forecasts and risk; entity ids are component ids.
+
+    Pass an engine's ``load_history`` as ``loads`` to forecast ``load_mw``
+    from the loads it recorded.
+    """
+
+    def __init__(
+        self,
+        history: HistorySource | None = None,
+        forecaster: SeasonalForecaster | None = None,
+        loads: HourlyRecorder | None = None,
+    ) -> None:
+        if history is None:
+            history = (
+                RecordedHistory(ENERGY_PROFILES, {"load_mw": loads})
+                if loads is not None
+                else SimulatedHistory(ENERGY_PROFILES)
+            )
+        self._history = history
+        self._forecaster = forecaster or SeasonalForecaster()
+
     @property
     def name(self) -> str:
         return "energy"
 
     async def forecast(self, request: ForecastRequest) -> ForecastResult:
-        now = datetime.now(timezone.utc)
-        points = [
-            {
-                "timestamp": (now + timedelta(hours=i)).isoformat(),
-                "load_mw": 450.0 + (i * 2.5),
-                "price_per_mwh": 35.0 + (i * 0.8),
-            }
-            for i in range(min(request.horizon_hours, 12))
-        ]
+        [points] = build_forecast_points(
+            [request.entity_id],
+            [request.horizon_hours],
+            self._history,
+            self._forecaster,
+        )
         return ForecastResult(
             entity_id=request.entity_id,
             domain=self.name,
@@ -36,7 +69,16 @@ class EnergyDomain:
             points=points,
         )
 
+    async def forecast_many(self, requests: Sequence[ForecastRequest]) -> list[ForecastResult]:
+        return await forecast_batch(self.name, requests, self._history, self._forecaster)
+
     async def evaluate_risk(self, request: RiskRequest) -> RiskResult:
+        return self._assess(request)
+
+    async def evaluate_risk_many(self, requests: Sequence[RiskRequest]) -> list[RiskResult]:
+        return [self._assess(request) for request in requests]
+
+    def _assess(self, request: RiskRequest) -> RiskResult:
         score = 0.8 if "outage" in request.scenario.lower() else 0.3
         level = RiskLevel.HIGH if score >= 0.6 else RiskLevel.LOW
         return RiskResult(
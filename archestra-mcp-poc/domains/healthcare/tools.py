@@ -1,8 +1,10 @@
 """Healthcare domain adapter."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from typing import Sequence
 
+from core.forecasting import MetricProfile, SeasonalForecaster, SimulatedHistory, build_forecast_points
+from core.registry import forecast_batch
 from core.schemas import (
     ActionRequest,
     ActionResult,
@@ -13,22 +15,32 @@ from core.schemas import (
     RiskResult,
 )
 
+HEALTHCARE_PROFILES: dict[str, MetricProfile] = {
+    "patient_admissions": MetricProfile(base=30.0, daily_amplitude=8.0, weekly_amplitude=4.0, noise=2.0, minimum=0.0, peak_hour=14.0),
+    "bed_occupancy_pct": MetricProfile(base=72.0, daily_amplitude=6.0, weekly_amplitude=3.0, noise=1.0, minimum=0.0, maximum=100.0, peak_hour=20.0),
+}
+
 
 class HealthcareDomain:
+    def __init__(
+        self,
+        history: SimulatedHistory | None = None,
+        forecaster: SeasonalForecaster | None = None,
+    ) -> None:
+        self._history = history or SimulatedHistory(HEALTHCARE_PROFILES)
+        self._forecaster = forecaster or SeasonalForecaster()
+
     @property
     def name(self) -> str:
         return "healthcare"
 
     async def forecast(self, request: ForecastRequest) -> ForecastResult:
-        now = datetime.now(timezone.utc)
-        points = [
-            {
-                "timestamp": (now + timedelta(hours=i)).isoformat(),
-                "patient_admissions": 30 + (i * 2),
-                "bed_occupancy_pct": 72.0 + (i * 1.1),
-            }
-            for i in range(min(request.horizon_hours, 12))
-        ]
+        [points] = build_forecast_points(
+            [request.entity_id],
+            [request.horizon_hours],
+            self._history,
+            self._forecaster,
+        )
         return ForecastResult(
             entity_id=request.entity_id,
             domain=self.name,
@@ -36,7 +48,16 @@ class HealthcareDomain:
             points=points,
         )
 
+    async def forecast_many(self, requests: Sequence[ForecastRequest]) -> list[ForecastResult]:
+        return await forecast_batch(self.name, requests, self._history, self._forecaster)
+
     async def evaluate_risk(self, request: RiskRequest) -> RiskResult:
+        return self._assess(request)
+
+    async def evaluate_risk_many(self, requests: Sequence[RiskRequest]) -> list[RiskResult]:
+        return [self._assess(request) for request in requests]
+
+    def _assess(self, request: RiskRequest) -> RiskResult:
         score = 0.75 if "surge" in request.scenario.lower() else 0.25
         level = RiskLevel.HIGH if score >= 0.6 else RiskLevel.LOW
         return RiskResult(
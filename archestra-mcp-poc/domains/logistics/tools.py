@@ -1,8 +1,10 @@
 """Logistics domain adapter."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from typing import Sequence
 
+from core.forecasting import MetricProfile, SeasonalForecaster, SimulatedHistory, build_forecast_points
+from core.registry import forecast_batch
 from core.schemas import (
     ActionRequest,
     ActionResult,
@@ -13,22 +15,32 @@ from core.schemas import (
     RiskResult,
 )
 
+LOGISTICS_PROFILES: dict[str, MetricProfile] = {
+    "shipments": MetricProfile(base=120.0, daily_amplitude=30.0, weekly_amplitude=20.0, noise=6.0, minimum=0.0, peak_hour=11.0),
+    "avg_transit_hours": MetricProfile(base=48.0, daily_amplitude=4.0, weekly_amplitude=6.0, noise=1.0, minimum=1.0, peak_hour=17.0),
+}
+
 
 class LogisticsDomain:
+    def __init__(
+        self,
+        history: SimulatedHistory | None = None,
+        forecaster: SeasonalForecaster | None = None,
+    ) -> None:
+        self._history = history or SimulatedHistory(LOGISTICS_PROFILES)
+        self._forecaster = forecaster or SeasonalForecaster()
+
     @property
     def name(self) -> str:
         return "logistics"
 
     async def forecast(self, request: ForecastRequest) -> ForecastResult:
-        now = datetime.now(timezone.utc)
-        points = [
-            {
-                "timestamp": (now + timedelta(hours=i)).isoformat(),
-                "shipments": 120 + (i * 5),
-                "avg_transit_hours": 48.0 - (i * 0.5),
-            }
-            for i in range(min(request.horizon_hours, 12))
-        ]
+        [points] = build_forecast_points(
+            [request.entity_id],
+            [request.horizon_hours],
+            self._history,
+            self._forecaster,
+        )
         return ForecastResult(
             entity_id=request.entity_id,
             domain=self.name,
@@ -36,7 +48,16 @@ class LogisticsDomain:
             points=points,
         )
 
+    async def forecast_many(self, requests: Sequence[ForecastRequest]) -> list[ForecastResult]:
+        return await forecast_batch(self.name, requests, self._history, self._forecaster)
+
     async def evaluate_risk(self, request: RiskRequest) -> RiskResult:
+        return self._assess(request)
+
+    async def evaluate_risk_many(self, requests: Sequence[RiskRequest]) -> list[RiskResult]:
+        return [self._assess(request) for request in requests]
+
+    def _assess(self, request: RiskRequest) -> RiskResult:
         score = 0.55 if "delay" in request.scenario.lower() else 0.2
         level = RiskLevel.MEDIUM if score >= 0.4 else RiskLevel.LOW
         return RiskResult(
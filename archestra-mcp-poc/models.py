@@ -72,6 +72,8 @@ class RiskState(BaseModel):
     bottlenecks: list[str] = Field(default_factory=list)
     predicted_failures: list[str] = Field(default_factory=list)
     recommendations: list[str] = Field(default_factory=list)
+    anomalies: list[str] = Field(default_factory=list)
+    constraint_violations: list[str] = Field(default_factory=list)
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
@@ -95,6 +97,8 @@ class RiskEvaluation(BaseModel):
     bottlenecks: list[str]
     predicted_failures: list[str]
     recommendations: list[str]
+    anomalies: list[str] = Field(default_factory=list)
+    constraint_violations: list[str] = Field(default_factory=list)
 
 
 class ControlActionResult(BaseModel):
@@ -2,17 +2,24 @@ from __future__ import annotations
 
 import logging
 import os
-import sys
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from mcp.server.fastmcp import FastMCP
 from mcp.server.streamable_http import TransportSecuritySettings
 
+from core.clock import SimulationClock
+from core.ingest import IngestSocket, ingest_socket_path
+from core.logs import configure_logging
+from core.registry import registry
+from core.replay import ReplaySource, replay_settings
+from core.scenario import scenario_path
+from core.startup import FAST_STARTUP, CachedToolsFastMCP, StartupState
+from domains.energy.tools import EnergyDomain
 from simulation import UniversalSimulationEngine
 from tools import UniversalInfrastructureTools
 
 logger = logging.getLogger("universal-infra-mcp")
-logger.addHandler(logging.StreamHandler(sys.stderr))
-logger.setLevel(logging.INFO)
 
 _allow_all_hosts = os.getenv("MCP_ALLOW_ALL_HOSTS", "false").lower() in {"1", "true", "yes"}
 
@@ -45,18 +52,60 @@ else:
         ],
     )
 
-mcp = FastMCP("universal-infrastructure-mcp", transport_security=transport_security)
 
-simulation_engine = UniversalSimulationEngine()
-simulation_engine.initialize_sample_systems()
+@asynccontextmanager
+async def _lifespan(_server: FastMCP) -> AsyncIterator[dict[str, Any]]:
+    await startup.begin(build_world)
+    await ingest_socket.start()
+    yield {}
+
+
+mcp = CachedToolsFastMCP("universal-infrastructure-mcp", transport_security=transport_security, lifespan=_lifespan)
+startup = StartupState("universal-infrastructure-mcp")
+
+simulation_engine = UniversalSimulationEngine(clock=SimulationClock.from_env())
+ingest_socket = IngestSocket(ingest_socket_path("universal-infrastructure-mcp"), simulation_engine.ingest_telemetry)
 
 logger.info("Initializing Universal Infrastructure MCP server")
-logger.info("Sample systems loaded: power_grid, hydro_plant, sewage_plant")
 
 UniversalInfrastructureTools(mcp, simulation_engine).register()
+registry.register(EnergyDomain(loads=simulation_engine.load_history))
+
+
+async def build_world() -> None:
+    scenario = scenario_path()
+    await simulation_engine.build_world(scenario=scenario)
+    await mcp.list_tools()
+    if scenario is not None:
+        logger.info("Scenario loaded: %s", scenario)
+    else:
+        logger.info("Sample systems loaded: power_grid, hydro_plant, sewage_plant")
+    replay = replay_settings()
+    if replay is not None:
+        await simulation_engine.start_replay(replay)
+        logger.info("Replaying %s at %gx", replay.path, replay.speed)
+
+
+if FAST_STARTUP:
+    logger.info("Fast startup: systems will be built once the server is listening")
+else:
+    _scenario = scenario_path()
+    if _scenario is not None:
+        simulation_engine.load_scenario(_scenario)
+        startup.mark_ready()
+        logger.info("Scenario loaded: %s", _scenario)
+    else:
+        simulation_engine.initialize_sample_systems()
+        startup.mark_ready()
+        logger.info("Sample systems loaded: power_grid, hydro_plant, sewage_plant")
+    _replay = replay_settings()
+    if _replay is not None:
+        simulation_engine.begin_replay(ReplaySource(_replay.path, _replay.speed, _replay.loop))
+        logger.info("Replaying %s at %gx", _replay.path, _replay.speed)
 
 logger.info("Universal infrastructure MCP initialized")
 
 
 if __name__ == "__main__":
+    configure_logging()
     mcp.run()
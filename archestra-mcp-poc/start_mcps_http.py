@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import http.client
+import importlib
 import os
 import signal
 import subprocess
 import sys
 import time
+import traceback
 from dataclasses import dataclass
+from typing import Protocol
 
 
 @dataclass(frozen=True)
@@ -22,6 +26,80 @@ SERVERS: tuple[HttpMcpConfig, ...] = (
     HttpMcpConfig(name="Sewage MCP", module="app_sewage:app", env_port="SEWAGE_MCP_PORT", default_port=8003),
 )
 
+POLL_INTERVAL_SECONDS = 0.1
+PROBE_TIMEOUT_SECONDS = 0.5
+# A child that stayed up this long before crashing restarts with the base backoff again.
+STABLE_UPTIME_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class SupervisorSettings:
+    ready_timeout: float
+    backoff_base: float
+    backoff_max: float
+    max_restarts: int
+    prefork: bool
+
+
+class ChildProcess(Protocol):
+    pid: int
+
+    def poll(self) -> int | None: ...
+
+    def terminate(self) -> None: ...
+
+    def kill(self) -> None: ...
+
+    def wait(self, timeout: float | None = None) -> int: ...
+
+
+class ForkedChild:
+    """Minimal ``Popen``-like handle for a child forked from the warmed supervisor."""
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self._returncode: int | None = None
+
+    def poll(self) -> int | None:
+        if self._returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+            if pid != 0:
+                self._returncode = os.waitstatus_to_exitcode(status)
+        return self._returncode
+
+    def terminate(self) -> None:
+        if self.poll() is None:
+            os.kill(self.pid, signal.SIGTERM)
+
+    def kill(self) -> None:
+        if self.poll() is None:
+            os.kill(self.pid, signal.SIGKILL)
+
+    def wait(self, timeout: float | None = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (return_code := self.poll()) is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"pid {self.pid} still running after {timeout}s")
+            time.sleep(0.05)
+        return return_code
+
+
+@dataclass
+class ServerState:
+    config: HttpMcpConfig
+    port: int
+    process: ChildProcess | None = None
+    started_at: float = 0.0
+    ready_at: float | None = None
+    restarts: int = 0
+    backoff: float = 0.0
+    restart_at: float | None = None
+    given_up: bool = False
+
+    @property
+    def label(self) -> str:
+        return f"{self.config.name} on http://localhost:{self.port}/mcp"
+
 
 def _resolve_port(config: HttpMcpConfig) -> int:
     raw = os.getenv(config.env_port, str(config.default_port)).strip()
@@ -36,6 +114,28 @@ def _resolve_port(config: HttpMcpConfig) -> int:
     return port
 
 
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name, str(default)).strip()
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise ValueError(f"Invalid value in {name}: {raw}") from exc
+
+
+def _resolve_settings() -> SupervisorSettings:
+    prefork = os.getenv("MCP_PREFORK", "false").lower() in {"1", "true", "yes"}
+    if prefork and not hasattr(os, "fork"):
+        print("[supervisor] MCP_PREFORK is not supported on this platform; spawning processes instead")
+        prefork = False
+    return SupervisorSettings(
+        ready_timeout=_env_float("MCP_READY_TIMEOUT", 30.0),
+        backoff_base=_env_float("MCP_RESTART_BACKOFF", 0.5),
+        backoff_max=_env_float("MCP_RESTART_BACKOFF_MAX", 30.0),
+        max_restarts=int(_env_float("MCP_MAX_RESTARTS", 10)),
+        prefork=prefork,
+    )
+
+
 def _start_server(config: HttpMcpConfig, port: int) -> subprocess.Popen[str]:
     command = [
         sys.executable,
@@ -62,68 +162,174 @@ def _start_server(config: HttpMcpConfig, port: int) -> subprocess.Popen[str]:
     )
 
 
-def _terminate(process: subprocess.Popen[str], label: str) -> None:
+def _prewarm() -> None:
+    """Import the app modules once so forked children start with them loaded."""
+    import uvicorn  # noqa: F401
+
+    for config in SERVERS:
+        module_name, _, _ = config.module.partition(":")
+        importlib.import_module(module_name)
+
+
+def _fork_server(config: HttpMcpConfig, port: int) -> ForkedChild:
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid != 0:
+        return ForkedChild(pid)
+
+    exit_code = 0
+    try:
+        import uvicorn
+
+        module_name, _, attribute = config.module.partition(":")
+        app = getattr(importlib.import_module(module_name), attribute)
+        uvicorn.run(app, host="127.0.0.1", port=port)
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+
+def _launch(state: ServerState, settings: SupervisorSettings) -> ChildProcess:
+    process: ChildProcess
+    if settings.prefork:
+        process = _fork_server(state.config, state.port)
+    else:
+        process = _start_server(state.config, state.port)
+    state.process = process
+    state.started_at = time.monotonic()
+    state.ready_at = None
+    state.restart_at = None
+    return process
+
+
+def _probe_ready(port: int) -> bool:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=PROBE_TIMEOUT_SECONDS)
+    try:
+        connection.request("GET", "/healthz")
+        return connection.getresponse().status == 200
+    except (OSError, http.client.HTTPException):
+        return False
+    finally:
+        connection.close()
+
+
+def _terminate(process: ChildProcess, label: str) -> None:
     if process.poll() is not None:
         return
 
     try:
         if os.name == "nt":
-            process.send_signal(signal.CTRL_BREAK_EVENT)
+            process.send_signal(signal.CTRL_BREAK_EVENT)  # type: ignore[attr-defined]
         else:
-            process.send_signal(signal.SIGTERM)
+            os.kill(process.pid, signal.SIGTERM)
     except Exception:
         process.terminate()
 
     print(f"[shutdown] terminating {label} (pid={process.pid})")
 
 
-def _kill(process: subprocess.Popen[str], label: str) -> None:
+def _kill(process: ChildProcess, label: str) -> None:
     if process.poll() is None:
         process.kill()
         print(f"[shutdown] force-killed {label} (pid={process.pid})")
 
 
+def _schedule_restart(state: ServerState, settings: SupervisorSettings, now: float, reason: str) -> None:
+    if now - state.started_at >= STABLE_UPTIME_SECONDS:
+        state.backoff = 0.0
+        state.restarts = 0
+    if state.restarts >= settings.max_restarts:
+        state.given_up = True
+        print(f"[give-up] {state.label} {reason}; {state.restarts} restarts exhausted")
+        return
+    state.backoff = settings.backoff_base if state.backoff == 0.0 else min(state.backoff * 2.0, settings.backoff_max)
+    state.restart_at = now + state.backoff
+    state.restarts += 1
+    print(f"[restart] {state.label} {reason}; restarting in {state.backoff:.1f}s (attempt {state.restarts})")
+
+
+def _supervise_once(states: list[ServerState], settings: SupervisorSettings) -> None:
+    now = time.monotonic()
+    for state in states:
+        if state.given_up:
+            continue
+
+        if state.restart_at is not None:
+            if now >= state.restart_at:
+                print(f"[started] {state.label} (pid={_launch(state, settings).pid})")
+            continue
+
+        process = state.process
+        if process is None:
+            continue
+
+        return_code = process.poll()
+        if return_code is not None:
+            print(f"[exit] {state.label} exited with code {return_code}")
+            state.process = None
+            _schedule_restart(state, settings, now, f"exited with code {return_code}")
+            continue
+
+        if state.ready_at is None:
+            if _probe_ready(state.port):
+                state.ready_at = time.monotonic()
+                print(f"[ready] {state.label} in {state.ready_at - state.started_at:.2f}s")
+            elif now - state.started_at > settings.ready_timeout:
+                print(f"[timeout] {state.label} not ready after {settings.ready_timeout:.1f}s")
+                process.kill()
+                process.wait(timeout=5.0)
+                state.process = None
+                _schedule_restart(state, settings, now, "failed its readiness check")
+
+
+def _raise_interrupt(_signum: int, _frame: object) -> None:
+    raise KeyboardInterrupt
+
+
 def main() -> int:
+    settings = _resolve_settings()
+    if os.name != "nt":
+        signal.signal(signal.SIGTERM, _raise_interrupt)
     print("Starting HTTP MCP servers for Archestra registration...")
-    processes: dict[str, subprocess.Popen[str]] = {}
-
-    for config in SERVERS:
-        port = _resolve_port(config)
-        process = _start_server(config, port)
-        label = f"{config.name} on http://localhost:{port}/mcp"
-        processes[label] = process
-        print(f"[started] {label} (pid={process.pid})")
+    if settings.prefork:
+        warm_started = time.monotonic()
+        _prewarm()
+        print(f"[prefork] supervisor warmed in {time.monotonic() - warm_started:.2f}s")
 
-    print("All HTTP MCP servers are up. Press Ctrl+C to stop all.")
+    states = [ServerState(config=config, port=_resolve_port(config)) for config in SERVERS]
+    for state in states:
+        print(f"[started] {state.label} (pid={_launch(state, settings).pid})")
 
+    announced = False
     try:
         while True:
-            dead: list[tuple[str, int]] = []
-            for label, process in processes.items():
-                return_code = process.poll()
-                if return_code is not None:
-                    dead.append((label, return_code))
+            _supervise_once(states, settings)
 
-            for label, return_code in dead:
-                print(f"[exit] {label} exited with code {return_code}")
-                processes.pop(label, None)
+            if not announced and all(state.ready_at is not None for state in states):
+                announced = True
+                slowest = max(state.ready_at - state.started_at for state in states if state.ready_at is not None)
+                print(f"All HTTP MCP servers are ready (slowest in {slowest:.2f}s). Press Ctrl+C to stop all.")
 
-            if not processes:
+            if all(state.given_up for state in states):
                 print("No HTTP MCP processes are running. Exiting launcher.")
                 return 1
 
-            time.sleep(1.0)
+            time.sleep(POLL_INTERVAL_SECONDS)
     except KeyboardInterrupt:
         print("\nCtrl+C received. Shutting down HTTP MCP servers...")
 
-    for label, process in processes.items():
+    running = [(state.label, state.process) for state in states if state.process is not None]
+    for label, process in running:
         _terminate(process, label)
 
     deadline = time.time() + 8.0
-    while time.time() < deadline and any(proc.poll() is None for proc in processes.values()):
+    while time.time() < deadline and any(process.poll() is None for _, process in running):
         time.sleep(0.2)
 
-    for label, process in processes.items():
+    for label, process in running:
         _kill(process, label)
 
     print("Shutdown complete.")
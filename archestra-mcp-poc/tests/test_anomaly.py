@@ -0,0 +1,107 @@
+import asyncio
+import math
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.anomaly import AnomalyDetector
+from core.clock import SimulationClock
+from core.dynamics import next_power_load
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _feed(detector: AnomalyDetector, values: list[float], metric: str = "load") -> list[str]:
+    kinds = []
+    for step, value in enumerate(values):
+        anomaly = detector.update("comp", metric, value, START + timedelta(seconds=step))
+        if anomaly is not None:
+            kinds.append(anomaly.kind)
+    return kinds
+
+
+@pytest.mark.parametrize(
+    "offset, amplitude, period",
+    [(100.0, 15.0, 30.0), (0.0, 1.0, 30.0), (50.0, 5.0, 6.0), (50.0, 5.0, 2.0), (50.0, 5.0, 200.0)],
+)
+def test_clean_sinusoid_produces_no_anomalies(offset: float, amplitude: float, period: float) -> None:
+    values = [offset + amplitude * math.sin(step / period) for step in range(3000)]
+    assert _feed(AnomalyDetector(), values) == []
+
+
+@pytest.mark.parametrize("step_seconds", [1.0, 3.0, 6.0])
+def test_oscillating_power_load_is_not_flagged_as_level_shift(step_seconds: float) -> None:
+    rng = random.Random(7)
+    values = [next_power_load(100.0, step * step_seconds, rng) for step in range(3000)]
+    assert "level_shift" not in _feed(AnomalyDetector(), values)
+
+
+def test_level_shift_is_detected() -> None:
+    rng = random.Random(3)
+    values = [50.0 + rng.gauss(0.0, 1.0) for _ in range(300)]
+    values += [62.0 + rng.gauss(0.0, 1.0) for _ in range(300)]
+    kinds = _feed(AnomalyDetector(), values)
+    assert kinds
+    assert set(kinds) <= {"spike", "level_shift"}
+
+
+def test_spike_is_detected_on_a_sinusoid() -> None:
+    values = [100.0 + 15.0 * math.sin(step / 30.0) for step in range(600)]
+    values[400] += 20.0
+    detector = AnomalyDetector()
+    assert _feed(detector, values) == ["spike"]
+    anomaly = detector.recent()[0]
+    assert anomaly.value == pytest.approx(values[400])
+    assert anomaly.expected == pytest.approx(values[400] - 20.0, abs=0.5)
+
+
+def _spiked_detector() -> AnomalyDetector:
+    values = [100.0 + 15.0 * math.sin(step / 30.0) for step in range(100)]
+    values[-1] += 20.0
+    detector = AnomalyDetector(hold_seconds=60.0)
+    assert _feed(detector, values) == ["spike"]
+    return detector
+
+
+def test_silent_stream_expires_after_hold_seconds() -> None:
+    detector = _spiked_detector()
+    flagged = START + timedelta(seconds=99)
+    assert [anomaly.kind for anomaly in detector.active(now=flagged + timedelta(seconds=60))] == ["spike"]
+    assert detector.active(now=flagged + timedelta(seconds=61)) == []
+    assert detector.active() == []
+    assert len(detector.recent()) == 1
+
+
+def test_forget_clears_the_component() -> None:
+    detector = _spiked_detector()
+    detector.forget("comp")
+    assert detector.active() == []
+    assert detector.update("comp", "load", 500.0, START + timedelta(seconds=100)) is None
+
+
+def test_taking_a_component_offline_clears_its_anomalies() -> None:
+    async def active_before_and_after() -> tuple[str, set[str], set[str]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        system = (await engine.get_systems())[0]
+        component_id = system.components[0].component_id
+        for step in range(100):
+            engine._anomalies.update(component_id, "probe", 20.0 if step == 99 else math.sin(step / 30.0), START)
+        before = await engine.get_anomalies(system.system_id)
+        await engine.execute_control_action(
+            system.system_id,
+            "set_operational_state",
+            {"component_id": component_id, "state": "offline"},
+        )
+        after = await engine.get_anomalies(system.system_id)
+        return (
+            component_id,
+            {anomaly["component_id"] for anomaly in before["active"]},
+            {anomaly["component_id"] for anomaly in after["active"]},
+        )
+
+    component_id, before, after = asyncio.run(active_before_and_after())
+    assert component_id in before
+    assert component_id not in after
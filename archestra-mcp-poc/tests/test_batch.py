@@ -0,0 +1,93 @@
+import asyncio
+import gzip
+import importlib.util
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from batch_runner import _build_parser
+from core.batch import TABLE_COLUMNS, BatchRunner, BatchSummary
+from core.clock import SimulationClock
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _run(output: Path, steps: int = 5, **options: Any) -> tuple[BatchSummary, int]:
+    async def run() -> tuple[BatchSummary, int]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        components = sum(len(system.components) for system in await engine.get_systems())
+        runner = BatchRunner(engine, output, **options)
+        return await runner.run(steps, step_seconds=2.0), components
+
+    return asyncio.run(run())
+
+
+def _table(output: Path, table: str) -> dict[str, list[Any]]:
+    manifest = json.loads((output / "manifest.json").read_text(encoding="utf-8"))
+    columns: dict[str, list[Any]] = {name: [] for name in manifest["tables"][table]["columns"]}
+    for part in manifest["tables"][table]["parts"]:
+        with gzip.open(output / part["path"], "rt", encoding="utf-8") as handle:
+            payload = json.load(handle)
+        assert payload["rows"] == part["rows"]
+        for name, values in payload["columns"].items():
+            assert len(values) == part["rows"]
+            columns[name].extend(values)
+    return columns
+
+
+def test_every_step_is_written_in_bounded_parts(tmp_path: Path) -> None:
+    summary, components = _run(tmp_path, chunk_rows=7)
+    assert summary.steps == 5
+    assert summary.systems == 6
+    assert summary.finished_at == (START + timedelta(seconds=10)).isoformat()
+
+    systems = _table(tmp_path, "systems")
+    assert len(systems["system_id"]) == 5 * 6
+    assert sorted(set(systems["step"])) == [1, 2, 3, 4, 5]
+    assert systems["timestamp"][0] == (START + timedelta(seconds=2)).isoformat()
+    assert all(value is not None for value in systems["aggregate_load"])
+
+    assert len(_table(tmp_path, "components")["component_id"]) == 5 * components
+    telemetry = _table(tmp_path, "telemetry")
+    assert len(telemetry["metric_name"]) > 0
+    assert set(telemetry["step"]) == {1, 2, 3, 4, 5}
+
+    for table, details in summary.tables.items():
+        assert details["columns"] == list(TABLE_COLUMNS[table])
+        assert all(part["rows"] <= 7 for part in details["parts"])
+        assert sum(part["rows"] for part in details["parts"]) == details["rows"]
+
+
+def test_runs_with_the_same_seed_write_the_same_rows(tmp_path: Path) -> None:
+    _run(tmp_path / "first", tables=("components",))
+    _run(tmp_path / "second", tables=("components",))
+    assert _table(tmp_path / "first", "components") == _table(tmp_path / "second", "components")
+    assert not (tmp_path / "first" / "systems").exists()
+
+
+def test_unknown_tables_and_formats_are_rejected(tmp_path: Path) -> None:
+    engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+    with pytest.raises(ValueError, match="Unknown tables"):
+        BatchRunner(engine, tmp_path, tables=("events",))
+    with pytest.raises(ValueError, match="Unknown output format"):
+        BatchRunner(engine, tmp_path, fmt="csv")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("pyarrow") is not None, reason="pyarrow is installed")
+def test_parquet_output_requires_pyarrow(tmp_path: Path) -> None:
+    engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+    with pytest.raises(ValueError, match="pyarrow"):
+        BatchRunner(engine, tmp_path, fmt="parquet")
+
+
+def test_start_times_are_validated_while_parsing_arguments() -> None:
+    parser = _build_parser()
+    args = parser.parse_args(["--output", "out", "--start", "2024-01-01T00:00:00"])
+    assert args.start == START
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--output", "out", "--start", "yesterday"])
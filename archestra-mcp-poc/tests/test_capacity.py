@@ -0,0 +1,192 @@
+import random
+from collections import deque
+
+import pytest
+
+from core.capacity import CapacityPaths
+from core.state import ComponentState, SystemState
+from models import Component, OperationalState, SystemModel, TopologyEdge, TopologyGraph
+
+
+def _system(capacities: dict[str, float], edges: list[tuple[str, str, float | None]]) -> SystemState:
+    return SystemState.from_model(
+        SystemModel(
+            system_id="grid",
+            system_type="power_grid",
+            name="grid",
+            location="test",
+            components=[
+                Component(
+                    component_id=component_id,
+                    component_type="node",
+                    system_id="grid",
+                    capacity=capacity,
+                    current_load=0.0,
+                )
+                for component_id, capacity in capacities.items()
+            ],
+            topology_graph=TopologyGraph(
+                nodes=list(capacities),
+                edges=[
+                    TopologyEdge(source_component_id=source, target_component_id=target, max_throughput=limit)
+                    for source, target, limit in edges
+                ],
+            ),
+        )
+    )
+
+
+def _diamond() -> SystemState:
+    # src -> a -> dst carries 30 (a's capacity), src -> b -> dst carries 40 (the b -> dst edge).
+    return _system(
+        {"src": 100.0, "a": 30.0, "b": 50.0, "dst": 100.0},
+        [("src", "a", None), ("src", "b", None), ("a", "dst", None), ("b", "dst", 40.0)],
+    )
+
+
+def _component(system: SystemState, component_id: str) -> ComponentState:
+    return next(component for component in system.components if component.component_id == component_id)
+
+
+def test_max_flow_and_min_cut() -> None:
+    result = CapacityPaths().compute(_diamond())
+    assert result["sources"] == ["src"]
+    assert result["sinks"] == ["dst"]
+    assert result["max_flow"] == 70.0
+    assert result["computation"] == "full"
+    assert {"kind": "component", "component_id": "a", "capacity": 30.0} in result["limiting"]
+    assert [(item["source_component_id"], item["target_component_id"]) for item in result["limiting"][1:]] == [
+        ("b", "dst")
+    ]
+    assert sorted((path["component_ids"], path["flow"]) for path in result["paths"]) == [
+        (["src", "a", "dst"], 30.0),
+        (["src", "b", "dst"], 40.0),
+    ]
+
+
+def test_repeated_query_is_cached_until_invalidated() -> None:
+    system = _diamond()
+    paths = CapacityPaths()
+    paths.compute(system)
+    assert paths.compute(system)["computation"] == "cached"
+    paths.invalidate("grid")
+    again = paths.compute(system)
+    assert again["computation"] == "incremental"
+    assert again["topology_version"] == 1
+    assert again["max_flow"] == 70.0
+
+
+def test_capacity_raise_augments_the_existing_flow() -> None:
+    system = _diamond()
+    paths = CapacityPaths()
+    paths.compute(system)
+    _component(system, "a").capacity = 45.0
+    paths.invalidate("grid")
+    result = paths.compute(system)
+    assert result["computation"] == "incremental"
+    assert result["max_flow"] == 85.0
+
+
+def test_cut_below_carried_flow_rebuilds_the_network() -> None:
+    system = _diamond()
+    paths = CapacityPaths()
+    paths.compute(system)
+    _component(system, "a").capacity = 10.0
+    paths.invalidate("grid")
+    result = paths.compute(system)
+    assert result["computation"] == "full"
+    assert result["max_flow"] == 50.0
+
+
+def test_offline_component_carries_nothing() -> None:
+    system = _diamond()
+    paths = CapacityPaths()
+    paths.compute(system)
+    _component(system, "b").operational_state = OperationalState.OFFLINE
+    paths.invalidate("grid")
+    result = paths.compute(system)
+    assert result["computation"] == "full"
+    assert result["max_flow"] == 30.0
+
+
+def test_invalid_endpoints_are_rejected() -> None:
+    paths = CapacityPaths()
+    with pytest.raises(ValueError):
+        paths.compute(_diamond(), ["missing"], None)
+    with pytest.raises(ValueError):
+        paths.compute(_diamond(), ["a"], ["a"])
+
+
+def _reference_max_flow(system: SystemState, sources: list[int], sinks: list[int]) -> float:
+    """Edmonds-Karp on a dense split-node matrix."""
+    count = len(system.components)
+    position = {component.component_id: index for index, component in enumerate(system.components)}
+    size = 2 * count + 2
+    source, sink = size - 2, size - 1
+    residual = [[0.0] * size for _ in range(size)]
+    for index, component in enumerate(system.components):
+        if component.operational_state != OperationalState.OFFLINE:
+            residual[2 * index][2 * index + 1] = component.capacity
+    for edge in system.topology_graph.edges:
+        limit = 1e9 if edge.max_throughput is None else edge.max_throughput
+        residual[2 * position[edge.source_component_id] + 1][2 * position[edge.target_component_id]] += limit
+    for index in sources:
+        residual[source][2 * index] = 1e12
+    for index in sinks:
+        residual[2 * index + 1][sink] = 1e12
+    flow = 0.0
+    while True:
+        parent = [-1] * size
+        parent[source] = source
+        queue = deque([source])
+        while queue and parent[sink] < 0:
+            node = queue.popleft()
+            for target in range(size):
+                if parent[target] < 0 and residual[node][target] > 1e-9:
+                    parent[target] = node
+                    queue.append(target)
+        if parent[sink] < 0:
+            return flow
+        amount = float("inf")
+        node = sink
+        while node != source:
+            amount = min(amount, residual[parent[node]][node])
+            node = parent[node]
+        node = sink
+        while node != source:
+            residual[parent[node]][node] -= amount
+            residual[node][parent[node]] += amount
+            node = parent[node]
+        flow += amount
+
+
+def test_matches_reference_through_incremental_changes() -> None:
+    rng = random.Random(3)
+    for _ in range(60):
+        size = rng.randint(3, 10)
+        capacities = {f"c{index}": float(rng.randint(1, 20)) for index in range(size)}
+        edges = [
+            (f"c{source}", f"c{target}", rng.choice([None, float(rng.randint(1, 15))]))
+            for source in range(size)
+            for target in range(source + 1, size)
+            if rng.random() < 0.4
+        ]
+        system = _system(capacities, edges)
+        paths = CapacityPaths()
+        try:
+            result = paths.compute(system)
+        except ValueError:
+            continue
+        sources = [int(component_id[1:]) for component_id in result["sources"]]
+        sinks = [int(component_id[1:]) for component_id in result["sinks"]]
+        for _ in range(5):
+            assert result["max_flow"] == pytest.approx(_reference_max_flow(system, sources, sinks))
+            cut = sum(
+                item["capacity"] if item["kind"] == "component" else item["max_throughput"]
+                for item in result["limiting"]
+            )
+            assert cut == pytest.approx(result["max_flow"])
+            component = rng.choice(system.components)
+            component.capacity = max(0.0, component.capacity + rng.randint(-10, 10))
+            paths.invalidate("grid")
+            result = paths.compute(system)
@@ -0,0 +1,121 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from core.changelog import ChangeLog, system_delta
+from core.clock import SimulationClock
+from core.state import SystemState
+from models import Component, SystemModel, TopologyGraph
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _system() -> SystemState:
+    return SystemState.from_model(
+        SystemModel(
+            system_id="grid",
+            system_type="power_grid",
+            name="grid",
+            location="test",
+            components=[
+                Component(
+                    component_id=f"c{index}",
+                    component_type="node",
+                    system_id="grid",
+                    capacity=100.0,
+                    current_load=0.0,
+                )
+                for index in range(3)
+            ],
+            topology_graph=TopologyGraph(nodes=[f"c{index}" for index in range(3)], edges=[]),
+        )
+    )
+
+
+def _engine_deltas() -> tuple[int, int, dict[str, Any], dict[str, Any], dict[str, Any]]:
+    async def scenario() -> tuple[int, int, dict[str, Any], dict[str, Any], dict[str, Any]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        since = await engine.advance(5)
+        current = await engine.advance(3)
+        delta = await engine.get_system_delta("grid_001", since, telemetry_limit=2)
+        unchanged = await engine.get_system_delta("grid_001", current)
+        everything = await engine.get_system_delta("grid_001", 0, telemetry_limit=1000)
+        return since, current, delta, unchanged, everything
+
+    return asyncio.run(scenario())
+
+
+def test_engine_delta_returns_newer_bounded_telemetry() -> None:
+    since, current, delta, unchanged, everything = _engine_deltas()
+    assert delta["resync_required"] is False
+    assert (delta["since_version"], delta["version"]) == (since, current)
+    assert delta["components"]
+    since_time = START + timedelta(seconds=5)
+    for component in delta["components"]:
+        assert 0 < len(component["telemetry"]) <= 2
+        assert all(datetime.fromisoformat(point["timestamp"]) > since_time for point in component["telemetry"])
+    assert len(delta["telemetry"]) <= 2
+
+    assert unchanged["components"] == []
+    assert unchanged["telemetry"] == []
+    assert unchanged["risk_state"] == {}
+
+    assert everything["resync_required"] is False
+    assert all(len(component["telemetry"]) <= 100 for component in everything["components"])
+
+
+def test_unknown_versions_require_resync() -> None:
+    changes = ChangeLog()
+    system = _system()
+    for since in (-1, 6):
+        delta = system_delta(changes, system, since, 5)
+        assert delta["resync_required"] is True
+        assert "not a version of this engine" in delta["reason"]
+
+
+def test_forgotten_version_time_requires_resync() -> None:
+    changes = ChangeLog(max_entries=2)
+    system = _system()
+    changes.track(system)
+    for version in range(1, 5):
+        changes.mark(version, START + timedelta(seconds=version))
+    assert changes.time_of(1) is None
+    stale = system_delta(changes, system, 1, 4)
+    assert stale["resync_required"] is True
+    assert "older than the retained version history" in stale["reason"]
+    assert system_delta(changes, system, 3, 4)["resync_required"] is False
+    assert system_delta(changes, system, 0, 4)["resync_required"] is False
+
+
+def _record_loads(changes: ChangeLog, system: SystemState, versions: int) -> None:
+    changes.track(system)
+    for version in range(1, versions + 1):
+        for component in system.components:
+            component.current_load = 10.0 * version
+        changes.record_system(version, system)
+
+
+def test_feed_pages_end_on_whole_versions() -> None:
+    changes = ChangeLog()
+    _record_loads(changes, _system(), 3)
+    page = changes.since(0, 3, limit=4)
+    assert page["resync_required"] is False
+    assert [change["version"] for change in page["changes"]] == [1, 1, 1, 2, 2, 2]
+    assert (page["next_version"], page["complete"]) == (2, False)
+    rest = changes.since(page["next_version"], 3, system_id="grid")
+    assert [change["version"] for change in rest["changes"]] == [3, 3, 3]
+    assert rest["complete"] is True
+    assert changes.since(0, 3, system_type="water")["changes"] == []
+
+
+def test_feed_requires_resync_below_floor_ahead_or_across_epochs() -> None:
+    changes = ChangeLog(max_entries=4)
+    _record_loads(changes, _system(), 3)
+    assert changes.floor == 2
+    assert changes.since(1, 3)["resync_required"] is True
+    assert changes.since(2, 3)["resync_required"] is False
+    assert changes.since(4, 3)["resync_required"] is True
+    assert changes.since(2, 3, epoch="other")["resync_required"] is True
+    assert changes.since(2, 3, epoch=changes.epoch)["resync_required"] is False
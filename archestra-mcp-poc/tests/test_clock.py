@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.clock import DEFAULT_ACCELERATION, MAX_ADVANCE_SECONDS, SimulationClock
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_fixed_step_only_moves_on_advance() -> None:
+    clock = SimulationClock(mode="fixed_step", start=START)
+    assert not clock.is_running
+    assert clock.now() == START
+    assert clock.advance(2.5) == START + timedelta(seconds=2.5)
+    with pytest.raises(ValueError, match="backwards"):
+        clock.advance(-1.0)
+
+
+def test_pause_and_resume_restore_mode_and_speed() -> None:
+    clock = SimulationClock(mode="accelerated", speed=8.0, start=START)
+    clock.pause()
+    status = clock.status()
+    assert status["mode"] == "paused"
+    assert status["running"] is False
+    assert (status["resume_mode"], status["resume_speed"]) == ("accelerated", 8.0)
+    frozen = clock.now()
+    assert clock.now() == frozen
+    clock.pause()
+    assert clock.status()["resume_mode"] == "accelerated"
+    clock.resume()
+    assert (clock.mode, clock.speed) == ("accelerated", 8.0)
+    assert clock.now() >= frozen
+
+
+def test_set_mode_paused_remembers_the_previous_mode() -> None:
+    clock = SimulationClock(mode="fixed_step", start=START)
+    clock.set_mode("paused")
+    assert clock.status()["resume_mode"] == "fixed_step"
+    clock.resume()
+    assert clock.mode == "fixed_step"
+    assert clock.now() == START
+
+
+def test_resume_when_not_paused_is_a_no_op() -> None:
+    clock = SimulationClock(mode="fixed_step", start=START)
+    clock.resume()
+    assert clock.mode == "fixed_step"
+
+
+def test_set_speed_selects_accelerated_or_realtime() -> None:
+    clock = SimulationClock(mode="fixed_step", start=START)
+    clock.set_speed(4.0)
+    assert (clock.mode, clock.speed, clock.is_running) == ("accelerated", 4.0, True)
+    clock.set_speed(1.0)
+    assert (clock.mode, clock.speed) == ("realtime", 1.0)
+    clock.set_mode("fixed_step")
+    assert (clock.mode, clock.speed) == ("fixed_step", 1.0)
+
+
+def test_set_speed_keeps_a_paused_clock_paused() -> None:
+    clock = SimulationClock(mode="realtime", start=START)
+    clock.pause()
+    frozen = clock.now()
+    clock.set_speed(6.0)
+    status = clock.status()
+    assert (status["mode"], status["running"]) == ("paused", False)
+    assert (status["resume_mode"], status["resume_speed"]) == ("accelerated", 6.0)
+    assert clock.now() == frozen
+    clock.resume()
+    assert (clock.mode, clock.speed) == ("accelerated", 6.0)
+
+
+def test_accelerated_mode_never_runs_at_realtime_speed() -> None:
+    clock = SimulationClock(mode="realtime", start=START)
+    clock.set_mode("accelerated")
+    assert (clock.mode, clock.speed) == ("accelerated", DEFAULT_ACCELERATION)
+    assert SimulationClock(mode="accelerated").speed == DEFAULT_ACCELERATION
+    clock.set_speed(3.0)
+    clock.set_mode("paused")
+    clock.set_mode("accelerated")
+    assert (clock.mode, clock.speed) == ("accelerated", 3.0)
+
+
+def test_invalid_mode_and_speed_are_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown clock mode"):
+        SimulationClock(mode="turbo")
+    with pytest.raises(ValueError, match="greater than zero"):
+        SimulationClock(speed=0.0)
+    clock = SimulationClock(mode="fixed_step")
+    with pytest.raises(ValueError, match="Unknown clock mode"):
+        clock.set_mode("resume")
+    with pytest.raises(ValueError, match="greater than zero"):
+        clock.set_speed(-2.0)
+
+
+def test_engine_clock_control() -> None:
+    async def scenario() -> list[dict[str, object]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        initial = await engine.get_clock_status()
+        advanced = await engine.control_clock(advance_seconds=3.0)
+        paused = await engine.control_clock(mode="paused")
+        resumed = await engine.control_clock(mode="resume")
+        return [initial, advanced, paused, resumed]
+
+    initial, advanced, paused, resumed = asyncio.run(scenario())
+    assert initial["mode"] == "fixed_step"
+    assert advanced["now"] == (START + timedelta(seconds=3)).isoformat()
+    assert isinstance(advanced["version"], int) and isinstance(initial["version"], int)
+    assert advanced["version"] > initial["version"]
+    assert paused["resume_mode"] == "fixed_step"
+    assert resumed["mode"] == "fixed_step"
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [{"mode": "turbo"}, {"advance_seconds": 0.0}, {"advance_seconds": MAX_ADVANCE_SECONDS + 1}],
+)
+def test_engine_rejects_invalid_clock_control(arguments: dict[str, object]) -> None:
+    engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step"))
+    with pytest.raises(ValueError):
+        asyncio.run(engine.control_clock(**arguments))  # type: ignore[arg-type]
@@ -0,0 +1,108 @@
+import asyncio
+import random
+from typing import Awaitable, Callable
+
+import pytest
+
+from core.coalesce import SingleFlight, coalesced
+
+
+def _sampler(calls: list[int | None]) -> Callable[..., Awaitable[float]]:
+    flight = SingleFlight()
+
+    @coalesced(flight, lambda: 0)
+    async def sample(trials: int, seed: int | None = None) -> float:
+        calls.append(seed)
+        await asyncio.sleep(0.01)
+        # Unseeded calls draw from the state version, as the engines do.
+        return random.Random(seed if seed is not None else 0).random()
+
+    return sample
+
+
+@pytest.mark.parametrize("seed", [7, None])
+def test_equal_calls_share_one_computation(seed: int | None) -> None:
+    calls: list[int | None] = []
+    sample = _sampler(calls)
+
+    async def burst() -> list[float]:
+        return list(await asyncio.gather(*(sample(100, seed=seed) for _ in range(5))))
+
+    results = asyncio.run(burst())
+    assert calls == [seed]
+    assert len(set(results)) == 1
+
+
+def test_different_arguments_are_not_shared() -> None:
+    calls: list[int | None] = []
+    sample = _sampler(calls)
+
+    async def burst() -> list[float]:
+        return list(await asyncio.gather(sample(100, seed=1), sample(100, seed=2), sample(200, seed=1)))
+
+    asyncio.run(burst())
+    assert sorted(calls, key=str) == [1, 1, 2]
+
+
+def test_new_state_version_starts_a_new_computation() -> None:
+    flight = SingleFlight()
+    version = [0]
+    calls: list[int] = []
+
+    @coalesced(flight, lambda: version[0])
+    async def read(key: str) -> int:
+        seen = version[0]
+        calls.append(seen)
+        await asyncio.sleep(0.01)
+        return seen
+
+    async def burst() -> list[int]:
+        first = [asyncio.ensure_future(read("a")) for _ in range(3)]
+        await asyncio.sleep(0.001)
+        version[0] = 1
+        second = [asyncio.ensure_future(read("a")) for _ in range(3)]
+        other = asyncio.ensure_future(read("b"))
+        return list(await asyncio.gather(*first, *second, other))
+
+    assert asyncio.run(burst()) == [0, 0, 0, 1, 1, 1, 1]
+    assert calls == [0, 1, 1]
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_work() -> None:
+    flight = SingleFlight()
+    calls: list[str] = []
+
+    async def work() -> str:
+        calls.append("run")
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def burst() -> tuple[bool, str, str]:
+        leaving = asyncio.ensure_future(flight.run("key", work))
+        staying = asyncio.ensure_future(flight.run("key", work))
+        await asyncio.sleep(0.005)
+        leaving.cancel()
+        result = await staying
+        await asyncio.sleep(0)
+        after = await flight.run("key", work)
+        return leaving.cancelled(), result, after
+
+    assert asyncio.run(burst()) == (True, "done", "done")
+    assert calls == ["run", "run"]
+
+
+def test_failure_reaches_every_waiter() -> None:
+    flight = SingleFlight()
+    calls: list[str] = []
+
+    async def work() -> str:
+        calls.append("run")
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def burst() -> list[BaseException | str]:
+        return list(await asyncio.gather(*(flight.run("key", work) for _ in range(3)), return_exceptions=True))
+
+    results = asyncio.run(burst())
+    assert calls == ["run"]
+    assert all(isinstance(result, RuntimeError) for result in results)
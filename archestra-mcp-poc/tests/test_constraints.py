@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from core.constraints import ConstraintEngine
+from core.state import ComponentState, SystemState
+from models import Component, OperationalConstraint, OperationalState, SystemModel
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _system() -> SystemState:
+    return SystemState.from_model(
+        SystemModel(
+            system_id="plant",
+            system_type="sewage_plant",
+            name="plant",
+            location="test",
+            components=[
+                Component(
+                    component_id="pump", component_type="pump", system_id="plant", capacity=100.0, current_load=50.0
+                ),
+                Component(
+                    component_id="line",
+                    component_type="transmission_line",
+                    system_id="plant",
+                    capacity=10.0,
+                    current_load=5.0,
+                ),
+            ],
+            operational_constraints=[
+                OperationalConstraint(name="target_ph_min", min_value=6.5, hard_limit=False),
+                OperationalConstraint(name="max_line_loading", max_value=0.9),
+            ],
+        )
+    )
+
+
+def _component(system: SystemState, component_id: str) -> ComponentState:
+    return next(component for component in system.components if component.component_id == component_id)
+
+
+def test_violation_tracks_start_duration_and_clearing() -> None:
+    system = _system()
+    engine = ConstraintEngine()
+    assert engine.evaluate(system, START) == []
+
+    engine.observe("pump", "ph", 6.0)
+    [violation] = engine.evaluate(system, START + timedelta(seconds=1))
+    assert (violation.component_id, violation.constraint, violation.metric) == ("pump", "target_ph_min", "ph")
+    assert violation.hard_limit is False
+    engine.observe("pump", "ph", 5.8)
+    engine.evaluate(system, START + timedelta(seconds=4))
+    details = violation.to_dict(START + timedelta(seconds=5))
+    assert (details["value"], details["samples"], details["duration_seconds"]) == (5.8, 2, 4.0)
+
+    engine.observe("pump", "ph", 7.0)
+    assert engine.evaluate(system, START + timedelta(seconds=6)) == []
+    [cleared] = engine.cleared(["plant"])
+    assert cleared.to_dict()["duration_seconds"] == 5.0
+    assert engine.active(["plant"]) == []
+
+
+def test_utilization_rule_only_covers_its_component_types() -> None:
+    system = _system()
+    engine = ConstraintEngine()
+    _component(system, "pump").current_load = 99.0
+    assert engine.evaluate(system, START) == []
+    _component(system, "line").current_load = 9.5
+    [violation] = engine.evaluate(system, START)
+    assert (violation.component_id, violation.constraint, violation.hard_limit) == ("line", "max_line_loading", True)
+    assert violation.value == 0.95
+
+
+def test_offline_components_do_not_violate() -> None:
+    system = _system()
+    engine = ConstraintEngine()
+    line = _component(system, "line")
+    line.current_load = 9.5
+    line.operational_state = OperationalState.OFFLINE
+    assert engine.evaluate(system, START) == []
+
+
+def test_partial_evaluation_keeps_other_violations() -> None:
+    system = _system()
+    engine = ConstraintEngine()
+    engine.observe("pump", "ph", 6.0)
+    _component(system, "line").current_load = 9.5
+    assert len(engine.evaluate(system, START)) == 2
+    _component(system, "line").current_load = 1.0
+    [remaining] = engine.evaluate(system, START + timedelta(seconds=1), metrics={"load"})
+    assert remaining.constraint == "target_ph_min"
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any
+
+from core.contingency import ContingencySpec, run_contingency_analysis
+
+
+def _spec() -> ContingencySpec:
+    # source -> (line_a | line_b) -> sink
+    return ContingencySpec(
+        system_id="grid",
+        component_ids=("source", "line_a", "line_b", "sink"),
+        component_types=("source", "line", "line", "sink"),
+        capacities=(100.0, 50.0, 50.0, 100.0),
+        loads=(60.0, 30.0, 20.0, 50.0),
+        critical=(False, False, False, False),
+        degraded=(False, False, False, False),
+        offline=(False, False, False, False),
+        anomalous=(False, False, False, False),
+        hard_violating=(False, False, False, False),
+        successors=((1, 2), (3,), (3,), ()),
+        predecessors=((), (0,), (0,), (1, 2)),
+    )
+
+
+def _cases() -> dict[str, dict[str, Any]]:
+    result = asyncio.run(run_contingency_analysis(_spec()))
+    assert result["complete"]
+    return {case["component_id"]: case for case in result["contingencies"]}
+
+
+def test_outage_with_redistributed_load_raises_risk() -> None:
+    case = _cases()["line_a"]
+    assert case["unserved_load"] == 0.0
+    assert case["load_shifted_to"] == ["line_b"]
+    assert case["newly_critical"] == ["line_b"]
+    assert case["risk_delta"] > 0.0
+
+
+def test_outages_never_read_as_risk_relief() -> None:
+    cases = _cases()
+    assert all(case["risk_delta"] > 0.0 for case in cases.values())
+    blackout = cases["source"]
+    assert blackout["de_energized"] == ["line_a", "line_b", "sink"]
+    assert blackout["unserved_fraction"] == 1.0
+    assert max(cases.values(), key=lambda case: case["impact"]) is blackout
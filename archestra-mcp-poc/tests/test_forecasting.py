@@ -0,0 +1,95 @@
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.clock import SimulationClock
+from core.forecasting import (
+    HourlyRecorder,
+    MetricHistory,
+    MetricProfile,
+    RecordedHistory,
+    SeasonalForecaster,
+    build_forecast_points,
+)
+from core.schemas import ForecastRequest
+from domains.energy.tools import EnergyDomain
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+PROFILES = {"load_mw": MetricProfile(base=450.0, daily_amplitude=90.0, noise=12.0)}
+
+
+def _daily_load(hour: int) -> float:
+    return 300.0 + 50.0 * math.sin(2.0 * math.pi * hour / 24.0)
+
+
+def _recorded(hours: int) -> HourlyRecorder:
+    recorder = HourlyRecorder()
+    for hour in range(hours + 1):
+        for minute in (0, 30):
+            recorder.record("feeder", START + timedelta(hours=hour, minutes=minute), _daily_load(hour))
+    return recorder
+
+
+def test_recorder_keeps_closed_hourly_means_and_fills_gaps() -> None:
+    recorder = HourlyRecorder(window_hours=4)
+    recorder.record("a", START, 10.0)
+    recorder.record("a", START + timedelta(minutes=20), 20.0)
+    assert recorder.history("a") is None
+    recorder.record("a", START + timedelta(hours=2), 40.0)
+    recorder.record("a", START + timedelta(minutes=50), 99.0)
+    history = recorder.history("a")
+    assert history is not None
+    assert history.start == START
+    assert history.values == (15.0, 15.0)
+    recorder.record("a", START + timedelta(hours=5), 0.0)
+    history = recorder.history("a")
+    assert history is not None
+    assert history.values == (15.0, 40.0, 40.0, 40.0)
+    assert history.end == START + timedelta(hours=4)
+
+
+def test_forecast_follows_the_recorded_loads() -> None:
+    source = RecordedHistory(PROFILES, {"load_mw": _recorded(24 * 7)})
+    [points] = build_forecast_points(["feeder"], [24], source, SeasonalForecaster(), now=START)
+    assert points[0]["timestamp"] == (START + timedelta(hours=24 * 7)).isoformat()
+    for hour, point in enumerate(points, start=24 * 7):
+        assert point["load_mw"] == pytest.approx(_daily_load(hour), abs=1.0)
+
+
+def test_short_recordings_fall_back_to_synthetic_history() -> None:
+    source = RecordedHistory(PROFILES, {"load_mw": _recorded(10)}, min_hours=48)
+    history = source.history("feeder", "load_mw", START + timedelta(days=30))
+    assert len(history.values) == 336
+    with pytest.raises(ValueError, match="without a profile"):
+        RecordedHistory(PROFILES, {"price": HourlyRecorder()})
+
+
+def test_energy_domain_forecasts_the_loads_the_engine_recorded() -> None:
+    async def forecast() -> tuple[MetricHistory | None, list[dict[str, float | str]]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        component = (await engine.get_systems())[0].components[0]
+        await engine.advance(49 * 60, step_seconds=60.0)
+        domain = EnergyDomain(loads=engine.load_history)
+        result = await domain.forecast(ForecastRequest(entity_id=component.component_id, horizon_hours=30))
+        return engine.load_history.history(component.component_id), result.points
+
+    history, points = asyncio.run(forecast())
+    assert history is not None
+    assert history.start == START
+    assert len(history.values) == 49
+    assert len(points) == 30
+    assert points[0]["timestamp"] == (history.end + timedelta(hours=1)).isoformat()
+
+
+def test_fits_are_reused_until_the_history_grows() -> None:
+    forecaster = SeasonalForecaster()
+    values = tuple(_daily_load(hour) for hour in range(48))
+    history = MetricHistory(start=START, step_hours=1.0, values=values)
+    first = forecaster.fit_many({"feeder": history})["feeder"]
+    assert forecaster.fit_many({"feeder": history})["feeder"] is first
+    grown = MetricHistory(start=START, step_hours=1.0, values=values + (values[0],))
+    assert forecaster.fit_many({"feeder": grown})["feeder"] is not first
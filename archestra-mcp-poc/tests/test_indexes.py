@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from core.clock import SimulationClock
+from core.indexes import ComponentIndex, utilization_band
+from core.state import ComponentState
+from models import HealthStatus, OperationalState
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _index() -> tuple[ComponentIndex, ComponentState, ComponentState]:
+    pump = ComponentState("pump", "pump", "plant", capacity=100.0, current_load=40.0)
+    valve = ComponentState("valve", "valve", "plant", capacity=100.0, current_load=90.0)
+    index = ComponentIndex()
+    index.add_system("plant", "hydro_plant", [pump, valve])
+    return index, pump, valve
+
+
+def _ids(components: list[ComponentState]) -> list[str]:
+    return [component.component_id for component in components]
+
+
+@pytest.mark.parametrize(
+    ("load", "band"), [(0.0, "low"), (50.0, "normal"), (90.0, "high"), (100.0, "overloaded")]
+)
+def test_utilization_bands(load: float, band: str) -> None:
+    component = ComponentState("c", "pump", "s", capacity=100.0, current_load=load)
+    assert utilization_band(component) == band
+
+
+def test_filters_combine_and_list_values_match_any() -> None:
+    index, _, _ = _index()
+    assert len(index) == 2
+    assert _ids(index.find({})) == ["pump", "valve"]
+    high = index.find({"system_type": "Hydro_Plant ", "utilization_band": "high"})
+    assert _ids(high) == ["valve"]
+    assert _ids(index.find({"component_type": ["pump", "valve"], "system_id": "plant"})) == [
+        "pump",
+        "valve",
+    ]
+    assert index.find({"system_id": "PLANT"}) == []
+    assert _ids(index.find({"health_status": None})) == ["pump", "valve"]
+    with pytest.raises(ValueError, match="Unsupported filter"):
+        index.find({"capacity": "100"})
+
+
+def test_updates_move_components_between_buckets() -> None:
+    index, pump, _ = _index()
+    pump.current_load = 120.0
+    pump.health_status = HealthStatus.CRITICAL
+    pump.operational_state = OperationalState.OFFLINE
+    index.update(pump)
+    assert _ids(index.find({"utilization_band": "overloaded"})) == ["pump"]
+    assert _ids(index.find({"utilization_band": "normal"})) == []
+    failed = index.find({"health_status": "critical", "operational_state": "offline"})
+    assert _ids(failed) == ["pump"]
+    assert index.find({"health_status": "healthy", "component_type": "pump"}) == []
+    assert index.get_in_system("plant", "pump") is pump
+    assert index.get_in_system("other", "pump") is None
+
+
+def _find(filters: dict[str, Any], domain_filter: str | None = None) -> tuple[list[str], list[str]]:
+    async def find() -> tuple[list[str], list[str]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        await engine.advance(20)
+        found = await engine.find_components(filters, domain_filter=domain_filter)
+        expected = [
+            component.component_id
+            for system in await engine.get_systems(domain_filter)
+            for component in system.components
+            if all(
+                getattr(component, field).value == value
+                for field, value in filters.items()
+                if field in {"health_status", "operational_state"}
+            )
+            and filters.get("system_type", system.system_type) == system.system_type
+        ]
+        return [match["component_id"] for match in found], sorted(expected)
+
+    return asyncio.run(find())
+
+
+@pytest.mark.parametrize(
+    ("filters", "domain_filter"),
+    [
+        ({"system_type": "power_grid"}, None),
+        ({"operational_state": "running", "health_status": "healthy"}, None),
+        ({}, "hydro_plant"),
+    ],
+)
+def test_engine_index_matches_a_scan_of_the_fleet(
+    filters: dict[str, Any], domain_filter: str | None
+) -> None:
+    found, expected = _find(filters, domain_filter)
+    assert found
+    assert found == expected
+
+
+def test_domain_servers_only_find_their_own_components() -> None:
+    found, _ = _find({"system_type": "power_grid"}, domain_filter="hydro_plant")
+    assert found == []
+
+
+def test_control_actions_update_the_index() -> None:
+    async def offline_matches() -> tuple[str, list[str]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        component_id = (await engine.get_systems())[0].components[0].component_id
+        await engine.execute_control_action(
+            "grid_001", "set_operational_state", {"component_id": component_id, "state": "offline"}
+        )
+        found = await engine.find_components({"operational_state": "offline"})
+        return component_id, [match["component_id"] for match in found]
+
+    component_id, found = asyncio.run(offline_matches())
+    assert found == [component_id]
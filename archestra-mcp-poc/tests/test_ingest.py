@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from core.ingest import MAX_REPORTED_ERRORS, batch_format, parse_batch
+
+
+def test_batch_format_from_content_type() -> None:
+    assert batch_format("application/x-ndjson; charset=utf-8") == "ndjson"
+    assert batch_format("Text/CSV") == "csv"
+    assert batch_format("application/json") is None
+    assert batch_format(None) is None
+
+
+def test_ndjson_rows_and_line_errors() -> None:
+    body = b"\n".join(
+        [
+            b'{"component_id": "a", "metric_name": "load", "metric_value": 5, "timestamp": "2024-01-01T00:00:00"}',
+            b"{not json",
+            b'{"component_id": "a", "metric_name": "load"}',
+            b'{"component_id": "a", "metric_name": "load", "metric_value": "high"}',
+            b'{"component_id": "a", "metric_name": "load", "metric_value": true}',
+            b'{"component_id": 1, "metric_name": "load", "metric_value": 1}',
+            b'{"component_id": "a", "metric_name": "load", "metric_value": 1, "timestamp": "yesterday"}',
+            b"[1, 2]",
+            b"",
+            b'{"component_id": "b", "metric_name": "temperature", "metric_value": 21.5, "units": "C"}',
+        ]
+    )
+    batch = parse_batch(body, "ndjson")
+    assert batch.rows == [
+        ("a", "load", 5.0, datetime(2024, 1, 1, tzinfo=timezone.utc), None),
+        ("b", "temperature", 21.5, None, "C"),
+    ]
+    assert batch.lines == [1, 10]
+    assert batch.rejected == 7
+    assert [error.split(":", 1)[0] for error in batch.errors] == [f"line {line}" for line in range(2, 9)]
+    assert batch.errors[0].startswith("line 2: Invalid JSON")
+    assert batch.errors[1] == "line 3: Missing field: metric_value"
+    assert batch.errors[3] == "line 5: Invalid metric_value: True"
+    assert batch.errors[4] == "line 6: component_id and metric_name must be strings"
+    assert batch.errors[5] == "line 7: Invalid timestamp: 'yesterday'"
+    assert batch.errors[6] == "line 8: Expected a JSON object"
+
+
+def test_ndjson_rejects_non_finite_values() -> None:
+    batch = parse_batch(b'{"component_id": "a", "metric_name": "load", "metric_value": "nan"}', "ndjson")
+    assert batch.rows == []
+    assert batch.errors == ["line 1: metric_value must be finite, got 'nan'"]
+
+
+@pytest.mark.parametrize("timestamp", [b"1e20", b'"1e20"', b'"inf"', b"-1e20", b'"99999999999999"'])
+def test_out_of_range_timestamps_are_rejected(timestamp: bytes) -> None:
+    line = b'{"component_id": "a", "metric_name": "load", "metric_value": 1, "timestamp": ' + timestamp + b"}"
+    batch = parse_batch(line, "ndjson")
+    assert batch.rows == []
+    assert batch.errors[0].startswith("line 1: Invalid timestamp")
+    csv_batch = parse_batch(b"component_id,metric_name,metric_value,timestamp\na,load,1,1e20\n", "csv")
+    assert csv_batch.rows == []
+    assert csv_batch.errors == ["line 2: Invalid timestamp: '1e20'"]
+
+
+def test_ndjson_lines_are_decoded_one_by_one() -> None:
+    body = b"\n".join(
+        [
+            b'{"component_id": "a", "metric_name": "load",',
+            b'"metric_value": 1}',
+            b'{"component_id": "b", "metric_name": "load", "metric_value": 2}, '
+            b'{"component_id": "c", "metric_name": "load", "metric_value": 3}',
+        ]
+    )
+    batch = parse_batch(body, "ndjson")
+    assert batch.rows == []
+    assert batch.rejected == 3
+    assert all("Invalid JSON" in error for error in batch.errors)
+
+
+def test_reported_errors_are_capped() -> None:
+    batch = parse_batch(b"{\n" * (MAX_REPORTED_ERRORS + 5), "ndjson")
+    assert batch.rejected == MAX_REPORTED_ERRORS + 5
+    assert len(batch.errors) == MAX_REPORTED_ERRORS
+
+
+def test_csv_rows_and_line_errors() -> None:
+    body = (
+        "\ufeffcomponent_id,metric_name,metric_value,timestamp,units\n"
+        "a,load,5,1704067200,MW\n"
+        "a,load,abc,,\n"
+        "a,load\n"
+        "\n"
+        "b,load,7,,\n"
+    ).encode()
+    batch = parse_batch(body, "csv")
+    assert batch.rows == [
+        ("a", "load", 5.0, datetime(2024, 1, 1, tzinfo=timezone.utc), "MW"),
+        ("b", "load", 7.0, None, None),
+    ]
+    assert batch.lines == [2, 6]
+    assert batch.rejected == 2
+    assert batch.errors[0].startswith("line 3: could not convert")
+    assert batch.errors[1] == "line 4: Expected 5 columns, got 2"
+
+
+def test_csv_header_must_name_required_columns() -> None:
+    with pytest.raises(ValueError, match="missing columns: metric_value"):
+        parse_batch(b"component_id,metric_name\na,load\n", "csv")
+    with pytest.raises(ValueError, match="missing columns"):
+        parse_batch(b"", "csv")
+
+
+def test_unknown_format_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unsupported ingestion format"):
+        parse_batch(b"", "xml")
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import logging
+import logging.handlers
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from core.logs import JsonFormatter, SamplingPolicy, logged_tool, sampling
+
+logger = logging.getLogger("test.tools")
+
+
+@logged_tool(logger)
+async def lookup(component_id: str, delay: float = 0.0) -> str:
+    await asyncio.sleep(delay)
+    if component_id == "missing":
+        raise ValueError("Component not found: missing")
+    return component_id
+
+
+def _tool_calls(caplog: pytest.LogCaptureFixture) -> list[logging.LogRecord]:
+    return [record for record in caplog.records if record.name == "test.tools"]
+
+
+def _fields(record: logging.LogRecord) -> dict[str, object]:
+    fields = getattr(record, "fields")
+    assert isinstance(fields, dict)
+    return fields
+
+
+def test_importing_tools_leaves_root_logging_alone() -> None:
+    import tools  # noqa: F401
+
+    assert not any(isinstance(handler, logging.handlers.QueueHandler) for handler in logging.getLogger().handlers)
+
+
+def test_successful_calls_are_sampled(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO)
+    sampling.set_rate("lookup", 1.0)
+    try:
+        assert asyncio.run(lookup("sub_a")) == "sub_a"
+        sampling.set_rate("lookup", 0.0)
+        asyncio.run(lookup("sub_b"))
+    finally:
+        sampling.set_rate("lookup", 1.0)
+    (record,) = _tool_calls(caplog)
+    fields = _fields(record)
+    assert record.levelno == logging.INFO
+    assert (fields["tool"], fields["status"], fields["args"]) == ("lookup", "ok", {"component_id": "sub_a"})
+    assert isinstance(fields["latency_ms"], float)
+
+
+def test_failures_are_always_logged_as_warnings(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO)
+    sampling.set_rate("lookup", 0.0)
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(lookup("missing"))
+    finally:
+        sampling.set_rate("lookup", 1.0)
+    (record,) = _tool_calls(caplog)
+    assert record.levelno == logging.WARNING
+    assert _fields(record)["status"] == "error"
+    assert _fields(record)["error"] == "Component not found: missing"
+
+
+def test_cancelled_calls_are_logged_as_info_and_reraised(caplog: pytest.LogCaptureFixture) -> None:
+    caplog.set_level(logging.INFO)
+
+    async def cancel() -> None:
+        call = asyncio.ensure_future(lookup("sub_a", delay=1.0))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+    asyncio.run(cancel())
+    (record,) = _tool_calls(caplog)
+    assert record.levelno == logging.INFO
+    assert _fields(record)["status"] == "cancelled"
+    assert "error" not in _fields(record)
+
+
+def test_sampling_rates_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LOG_SAMPLE_RATES", "get_system_state=0.05, find_components=2,*=0")
+    policy = SamplingPolicy.from_env()
+    assert policy.rate("get_system_state") == 0.05
+    assert policy.rate("find_components") == 1.0
+    assert policy.rate("other") == 0.0
+    assert not policy.should_log("other")
+    monkeypatch.setenv("LOG_SAMPLE_RATES", "get_system_state")
+    with pytest.raises(ValueError, match="Invalid LOG_SAMPLE_RATES entry"):
+        SamplingPolicy.from_env()
+
+
+def test_json_formatter_lifts_fields() -> None:
+    record = logging.LogRecord("infra", logging.INFO, __file__, 1, "tool_call %s", ("lookup",), None)
+    record.fields = {"tool": "lookup", "latency_ms": 1.5}
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "tool_call lookup"
+    assert (payload["level"], payload["tool"], payload["latency_ms"]) == ("info", "lookup", 1.5)
+
+
+def test_configured_logging_writes_json_lines_from_the_listener() -> None:
+    script = (
+        "import logging\n"
+        "from core.logs import configure_logging\n"
+        "logging.basicConfig()\n"
+        "configure_logging()\n"
+        "configure_logging()\n"
+        "root = logging.getLogger()\n"
+        "assert [type(h).__name__ for h in root.handlers] == ['QueueHandler'], root.handlers\n"
+        "logging.getLogger('infra').info('ready', extra={'fields': {'port': 8001}})\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        env={**os.environ, "LOG_LEVEL": "INFO", "LOG_FORMAT": "json"},
+        check=True,
+    )
+    (line,) = result.stderr.splitlines()
+    assert json.loads(line)["port"] == 8001
@@ -0,0 +1,69 @@
+import asyncio
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any
+
+from core.clock import SimulationClock
+from core.memory import _Sizer, memory_report
+from models import HealthStatus
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _report(advance: int = 0, **options: Any) -> dict[str, Any]:
+    async def report() -> dict[str, Any]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        if advance:
+            await engine.advance(advance)
+        return await engine.get_memory_report(**options)
+
+    return asyncio.run(report())
+
+
+def test_shared_objects_are_counted_once_at_their_first_owner() -> None:
+    sizer = _Sizer()
+    payload = ["x" * 100, 1.5]
+    owner = {"payload": payload, "state": HealthStatus.HEALTHY}
+    first = sizer.size(owner)
+    objects = (owner, "payload", "state", payload, *payload)
+    assert first == sum(sys.getsizeof(obj) for obj in objects)
+    assert sizer.size({"payload": payload}) == sys.getsizeof({"payload": payload})
+    assert sizer.size(payload) == 0
+
+
+def test_system_figures_add_up_to_the_totals() -> None:
+    report = _report(advance=10, top_components=3)
+    totals = report["totals"]
+    assert totals["systems"] == len(report["systems"]) == 6
+    assert totals["systems_bytes"] == sum(system["bytes"] for system in report["systems"])
+    assert totals["telemetry_points"] == sum(
+        system["telemetry"]["points"] + system["components"]["telemetry_points"]
+        for system in report["systems"]
+    )
+    assert 0 < totals["telemetry_bytes"] < totals["systems_bytes"]
+    assert totals["components"] == sum(
+        system["components"]["count"] for system in report["systems"]
+    )
+    assert set(totals["engine_bytes"])
+    largest = report["largest_components"]
+    assert len(largest) == 3
+    sizes = [item["bytes"] for item in largest]
+    assert sizes == sorted(sizes, reverse=True)
+    assert "tracemalloc" not in report
+
+
+def test_telemetry_growth_shows_in_the_report() -> None:
+    before = _report()["totals"]
+    after = _report(advance=20)["totals"]
+    assert after["telemetry_points"] > before["telemetry_points"]
+    assert after["telemetry_bytes"] > before["telemetry_bytes"]
+
+
+def test_domain_filter_and_tracemalloc_hint() -> None:
+    report = _report(domain_filter="power_grid", tracemalloc_top=5)
+    assert {system["system_type"] for system in report["systems"]} == {"power_grid"}
+    assert report["tracemalloc"]["enabled"] is tracemalloc.is_tracing()
+    assert memory_report([])["totals"]["bytes_per_telemetry_point"] == 0
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+import core.montecarlo
+from core.montecarlo import RolloutComponent, RolloutSpec, estimate_failure_probabilities, run_rollouts
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _spec(horizon_steps: int = 60, overloaded: bool = False) -> RolloutSpec:
+    return RolloutSpec(
+        system_type="power_grid",
+        components=(
+            RolloutComponent("hot", "transformer", capacity=1.0 if overloaded else 100.0, offline=False, critical=False),
+            RolloutComponent("idle", "line", capacity=100.0, offline=True, critical=False),
+        ),
+        start_timestamp=START.timestamp(),
+        step_seconds=1.0,
+        horizon_steps=horizon_steps,
+    )
+
+
+def _estimate(spec: RolloutSpec, trials: int, seed: int = 7) -> dict[str, Any]:
+    return asyncio.run(estimate_failure_probabilities(spec, trials=trials, seed=seed))
+
+
+def test_seeded_estimates_are_reproducible() -> None:
+    first = _estimate(_spec(), 200)
+    assert first == _estimate(_spec(), 200)
+    assert first["trials"] == first["requested_trials"] == 200
+    chunked = run_rollouts(_spec(), 7, 0, 120)
+    chunked.merge(run_rollouts(_spec(), 7, 120, 80))
+    assert chunked == run_rollouts(_spec(), 7, 0, 200)
+
+
+def test_overloaded_component_fails_and_offline_one_never_does() -> None:
+    result = _estimate(_spec(overloaded=True), 100)
+    by_id = {component["component_id"]: component for component in result["components"]}
+    assert by_id["hot"]["failure_probability"] == 1.0
+    assert by_id["idle"]["failure_probability"] == 0.0
+    assert by_id["idle"]["offline"] is True
+    assert result["system_failure_probability"] == 1.0
+    assert 0.0 <= by_id["hot"]["ci_low"] <= 1.0 == by_id["hot"]["ci_high"]
+
+
+def test_work_is_capped_by_running_fewer_trials(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(core.montecarlo, "MAX_WORK", 60 * 50)
+    result = _estimate(_spec(), 1000)
+    assert (result["trials"], result["requested_trials"]) == (50, 1000)
+    with pytest.raises(ValueError, match="component-steps"):
+        _estimate(_spec(horizon_steps=60 * 50 + 1), 1)
+
+
+@pytest.mark.parametrize("trials, confidence", [(0, 0.95), (core.montecarlo.MAX_TRIALS + 1, 0.95), (10, 1.0)])
+def test_invalid_arguments_are_rejected(trials: int, confidence: float) -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(estimate_failure_probabilities(_spec(), trials=trials, seed=1, confidence=confidence))
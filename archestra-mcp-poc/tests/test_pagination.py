@@ -0,0 +1,121 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from core.pagination import MAX_PAGE_SIZE, Cursor, SnapshotPager, clamp_page_size
+from models import Component, SystemModel, TopologyEdge, TopologyGraph
+
+
+def _model(size: int) -> SystemModel:
+    ids = [f"c{index}" for index in range(size)]
+    return SystemModel(
+        system_id="grid",
+        system_type="power_grid",
+        name="grid",
+        location="test",
+        components=[
+            Component(
+                component_id=component_id,
+                component_type="node",
+                system_id="grid",
+                capacity=10.0,
+                current_load=0.0,
+            )
+            for component_id in ids
+        ],
+        topology_graph=TopologyGraph(
+            nodes=ids,
+            edges=[TopologyEdge(source_component_id=a, target_component_id=b) for a, b in zip(ids, ids[1:])],
+        ),
+    )
+
+
+class _Source:
+    """Serves a fresh snapshot per load, bumping the version each time."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.version = 0
+        self.loads = 0
+
+    async def __call__(self, system_id: str) -> tuple[int, SystemModel]:
+        self.loads += 1
+        self.version += 1
+        return self.version, _model(self.size)
+
+
+def _page(pager: SnapshotPager, source: _Source, section: str, size: int, cursor: str | None) -> dict[str, Any]:
+    return asyncio.run(pager.page("grid", section, size, cursor, source))
+
+
+def test_cursor_round_trip() -> None:
+    cursor = Cursor("grid", 4, "telemetry", 100, 50)
+    token = cursor.encode()
+    assert "=" not in token
+    assert Cursor.decode(token) == cursor
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a cursor",
+        "e30",  # {}
+        Cursor("grid", 1, "components", 0, 10).encode()[:-3],
+        Cursor("grid", 1, "alarms", 0, 10).encode(),
+        Cursor("grid", 1, "components", -1, 10).encode(),
+        Cursor("grid", 1, "components", 0, 0).encode(),
+    ],
+)
+def test_malformed_cursor_is_rejected(token: str) -> None:
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        Cursor.decode(token)
+
+
+def test_page_size_is_clamped() -> None:
+    assert clamp_page_size(1) == 1
+    assert clamp_page_size(MAX_PAGE_SIZE + 1) == MAX_PAGE_SIZE
+    with pytest.raises(ValueError, match="at least 1"):
+        clamp_page_size(0)
+
+
+def test_pages_walk_one_pinned_snapshot() -> None:
+    pager = SnapshotPager()
+    source = _Source(7)
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page = _page(pager, source, "components", 3, cursor)
+        seen += [component.component_id for component in page["items"]]
+        assert page["page"]["snapshot_version"] == 1
+        assert page["page"]["total"] == 7
+        cursor = page["page"]["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"c{index}" for index in range(7)]
+    assert source.loads == 1
+
+
+def test_evicted_snapshot_expires_its_cursor() -> None:
+    pager = SnapshotPager(max_snapshots=2)
+    source = _Source(5)
+    cursor = _page(pager, source, "edges", 2, None)["page"]["next_cursor"]
+    _page(pager, source, "edges", 2, None)
+    assert _page(pager, source, "edges", 2, cursor)["page"]["offset"] == 2
+    _page(pager, source, "edges", 2, None)
+    _page(pager, source, "edges", 2, None)
+    with pytest.raises(ValueError, match="Cursor expired"):
+        _page(pager, source, "edges", 2, cursor)
+
+
+def test_cursor_is_bound_to_its_system() -> None:
+    pager = SnapshotPager()
+    source = _Source(5)
+    cursor = Cursor("hydro", 1, "components", 2, 2).encode()
+    with pytest.raises(ValueError, match="belongs to system hydro"):
+        _page(pager, source, "components", 2, cursor)
+
+
+def test_unknown_section_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown page section"):
+        _page(SnapshotPager(), _Source(1), "alarms", 2, None)
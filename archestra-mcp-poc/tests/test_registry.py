@@ -0,0 +1,165 @@
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from core.registry import DomainRegistry
+from core.schemas import (
+    ActionRequest,
+    ActionResult,
+    ForecastRequest,
+    ForecastResult,
+    RiskLevel,
+    RiskRequest,
+    RiskResult,
+)
+from domains.energy.tools import EnergyDomain
+from domains.logistics.tools import LogisticsDomain
+
+
+class RecordingDomain:
+    def __init__(self, name: str, drop_one: bool = False) -> None:
+        self._name = name
+        self._drop_one = drop_one
+        self.batches: list[list[str]] = []
+        self.running = 0
+        self.peak = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def forecast(self, request: ForecastRequest) -> ForecastResult:
+        return (await self.forecast_many([request]))[0]
+
+    async def forecast_many(self, requests: Sequence[ForecastRequest]) -> list[ForecastResult]:
+        self.batches.append([request.entity_id for request in requests])
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        results = [
+            ForecastResult(
+                entity_id=request.entity_id,
+                domain=self._name,
+                horizon_hours=request.horizon_hours,
+                points=[],
+            )
+            for request in requests
+        ]
+        return results[1:] if self._drop_one else results
+
+    async def evaluate_risk(self, request: RiskRequest) -> RiskResult:
+        return (await self.evaluate_risk_many([request]))[0]
+
+    async def evaluate_risk_many(self, requests: Sequence[RiskRequest]) -> list[RiskResult]:
+        self.batches.append([request.entity_id for request in requests])
+        return [
+            RiskResult(
+                entity_id=request.entity_id,
+                domain=self._name,
+                scenario=request.scenario,
+                level=RiskLevel.LOW,
+                score=0.1,
+                factors=[],
+            )
+            for request in requests
+        ]
+
+    async def execute_action(self, request: ActionRequest) -> ActionResult:
+        return ActionResult(
+            entity_id=request.entity_id,
+            domain=self._name,
+            action_type=request.action_type,
+            success=True,
+            message="",
+        )
+
+
+def _forecasts(*targets: tuple[str, str]) -> list[tuple[str, ForecastRequest]]:
+    return [
+        (domain, ForecastRequest(entity_id=entity_id, horizon_hours=2))
+        for domain, entity_id in targets
+    ]
+
+
+def test_batch_results_follow_input_order_across_domains() -> None:
+    registry = DomainRegistry(batch_size=2)
+    alpha, beta = RecordingDomain("alpha"), RecordingDomain("beta")
+    registry.register(alpha)
+    registry.register(beta)
+    requests = _forecasts(
+        ("alpha", "a1"), ("beta", "b1"), ("alpha", "a2"), ("alpha", "a3"), ("beta", "b2")
+    )
+
+    results = asyncio.run(registry.forecast_many(requests))
+
+    assert [(result.domain, result.entity_id) for result in results] == [
+        (domain, request.entity_id) for domain, request in requests
+    ]
+    assert sorted(alpha.batches) == [["a1", "a2"], ["a3"]]
+    assert beta.batches == [["b1", "b2"]]
+
+    risks = asyncio.run(
+        registry.evaluate_risk_many(
+            [
+                ("beta", RiskRequest(entity_id="b3", scenario="outage")),
+                ("alpha", RiskRequest(entity_id="a4", scenario="outage")),
+            ]
+        )
+    )
+    assert [risk.entity_id for risk in risks] == ["b3", "a4"]
+
+
+def test_batches_run_under_the_concurrency_cap() -> None:
+    registry = DomainRegistry(max_concurrency=2, batch_size=1)
+    domain = RecordingDomain("alpha")
+    registry.register(domain)
+    asyncio.run(registry.forecast_many(_forecasts(*[("alpha", f"a{index}") for index in range(6)])))
+    assert len(domain.batches) == 6
+    assert domain.peak == 2
+
+
+def test_unknown_domains_fail_before_any_work() -> None:
+    registry = DomainRegistry()
+    domain = RecordingDomain("alpha")
+    registry.register(domain)
+    with pytest.raises(KeyError, match="not registered"):
+        asyncio.run(registry.forecast_many(_forecasts(("alpha", "a1"), ("missing", "m1"))))
+    assert domain.batches == []
+
+
+def test_short_batches_are_reported() -> None:
+    registry = DomainRegistry()
+    registry.register(RecordingDomain("alpha", drop_one=True))
+    with pytest.raises(ExceptionGroup) as raised:
+        asyncio.run(registry.forecast_many(_forecasts(("alpha", "a1"), ("alpha", "a2"))))
+    [error] = raised.value.exceptions
+    assert isinstance(error, RuntimeError)
+    assert "returned 1 results for 2 requests" in str(error)
+
+
+def test_invalid_limits_are_rejected() -> None:
+    with pytest.raises(ValueError, match="max_concurrency"):
+        DomainRegistry(max_concurrency=0)
+    with pytest.raises(ValueError, match="batch_size"):
+        DomainRegistry(batch_size=0)
+
+
+def test_built_in_domains_batch_like_single_calls() -> None:
+    async def compare() -> None:
+        registry = DomainRegistry()
+        registry.register(EnergyDomain())
+        registry.register(LogisticsDomain())
+        requests = [
+            ("energy", ForecastRequest(entity_id="feeder_1", horizon_hours=6)),
+            ("logistics", ForecastRequest(entity_id="route_1", horizon_hours=4)),
+            ("energy", ForecastRequest(entity_id="feeder_2", horizon_hours=3)),
+        ]
+        batched = await registry.forecast_many(requests)
+        for (domain, request), result in zip(requests, batched):
+            single = await registry.get(domain).forecast(request)
+            assert (result.domain, result.entity_id) == (single.domain, single.entity_id)
+            assert result.points == single.points
+
+    asyncio.run(compare())
@@ -0,0 +1,148 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+import core.replay
+from core.batch import BatchRunner
+from core.clock import SimulationClock
+from core.replay import ReplaySettings, ReplaySource
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+RECORDED = datetime(2023, 6, 1, tzinfo=timezone.utc)
+COMPONENT = "grid_001_substation_a"
+
+
+def _capture(path: Path, offsets: tuple[int, ...] = (0, 10, 20)) -> Path:
+    lines = []
+    for frame, offset in enumerate(offsets):
+        timestamp = (RECORDED + timedelta(seconds=offset)).isoformat()
+        for metric_name, value in (("load", 50.0 + frame), ("temperature", 30.0 + frame)):
+            point = {
+                "component_id": COMPONENT,
+                "metric_name": metric_name,
+                "metric_value": value,
+                "timestamp": timestamp,
+            }
+            lines.append(json.dumps(point))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def _loads(source: ReplaySource, until: datetime) -> list[tuple[datetime, float]]:
+    return [
+        (due, value)
+        for due, batch in source.pop_due(until)
+        for _, metric_name, value, _, _ in batch.rows
+        if metric_name == "load"
+    ]
+
+
+def test_frames_play_at_the_requested_speed(tmp_path: Path) -> None:
+    source = ReplaySource(_capture(tmp_path / "capture.ndjson"), speed=10.0)
+    source.start(START)
+    assert _loads(source, START) == [(START, 50.0)]
+    assert source.next_due() == START + timedelta(seconds=1)
+    assert _loads(source, START + timedelta(seconds=1.5)) == [(START + timedelta(seconds=1), 51.0)]
+    assert _loads(source, START + timedelta(seconds=5)) == [(START + timedelta(seconds=2), 52.0)]
+    assert source.finished
+    assert source.next_due() is None
+    status = source.status(START + timedelta(seconds=5))
+    assert (status["frames"], status["duration_seconds"]) == (3, 20.0)
+    assert status["position_seconds"] == 20.0
+    source.close()
+
+
+def test_speed_changes_seeks_and_loops(tmp_path: Path) -> None:
+    source = ReplaySource(_capture(tmp_path / "capture.ndjson"), loop=True)
+    source.start(START)
+    assert _loads(source, START) == [(START, 50.0)]
+    source.set_speed(5.0, START + timedelta(seconds=5))
+    assert source.next_due() == START + timedelta(seconds=6)
+    # The next cycle starts one frame period after the last frame.
+    assert _loads(source, START + timedelta(seconds=10)) == [
+        (START + timedelta(seconds=6), 51.0),
+        (START + timedelta(seconds=8), 52.0),
+        (START + timedelta(seconds=10), 50.0),
+    ]
+    assert source.cycles == 1
+    assert not source.finished
+
+    source.seek(15.0, START + timedelta(seconds=10))
+    assert source.next_due() == START + timedelta(seconds=11)
+    assert source.status(START + timedelta(seconds=10))["position_seconds"] == 15.0
+    with pytest.raises(ValueError, match="negative"):
+        source.seek(-1.0, START)
+    source.close()
+
+
+def test_playback_skips_ahead_instead_of_flooding(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(core.replay, "MAX_CATCH_UP_FRAMES", 2)
+    source = ReplaySource(_capture(tmp_path / "capture.ndjson", offsets=tuple(range(10))))
+    source.start(START)
+    assert len(source.pop_due(START + timedelta(seconds=7))) == 2
+    assert source.frames_skipped == 5
+    assert _loads(source, START + timedelta(seconds=7)) == [(START + timedelta(seconds=7), 57.0)]
+    source.close()
+
+
+def test_invalid_recordings_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="not found"):
+        ReplaySource(tmp_path / "missing.ndjson")
+    empty = tmp_path / "empty.ndjson"
+    empty.write_text("", encoding="utf-8")
+    with pytest.raises(ValueError, match="empty"):
+        ReplaySource(empty)
+    with pytest.raises(ValueError, match="not sorted"):
+        ReplaySource(_capture(tmp_path / "unsorted.ndjson", offsets=(0, 20, 10)))
+    with pytest.raises(ValueError, match="no manifest.json"):
+        ReplaySource(tmp_path)
+    with pytest.raises(ValueError, match="greater than zero"):
+        ReplaySource(_capture(tmp_path / "capture.ndjson"), speed=0.0)
+
+
+def test_engine_ingests_replayed_frames_at_their_due_time(tmp_path: Path) -> None:
+    capture = _capture(tmp_path / "capture.ndjson")
+
+    async def replay() -> tuple[float, list[tuple[datetime, float]], dict[str, object]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        await engine.start_replay(ReplaySettings(path=str(capture), speed=2.0))
+        await engine.advance(12)
+        component = await engine.get_component_state(COMPONENT)
+        replayed = [
+            (point.timestamp, point.metric_value)
+            for point in component.telemetry
+            if point.metric_name == "load" and point.metric_value in {50.0, 51.0, 52.0}
+        ]
+        return component.current_load, replayed, await engine.stop_replay()
+
+    current_load, replayed, status = asyncio.run(replay())
+    assert current_load == 52.0
+    assert replayed == [
+        (START, 50.0),
+        (START + timedelta(seconds=5), 51.0),
+        (START + timedelta(seconds=10), 52.0),
+    ]
+    assert (status["frames_played"], status["points_accepted"], status["finished"]) == (3, 6, True)
+
+
+def test_batch_output_replays_its_telemetry_table(tmp_path: Path) -> None:
+    async def record() -> None:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        await BatchRunner(engine, tmp_path / "run", chunk_rows=100).run(4)
+
+    asyncio.run(record())
+    source = ReplaySource(tmp_path / "run" / "manifest.json")
+    status = source.status(START)
+    assert (status["frames"], status["duration_seconds"]) == (4, 3.0)
+    assert status["position_seconds"] == 0.0
+    source.start(START)
+    assert len(source.pop_due(START + timedelta(seconds=3))) == 4
+    source.close()
@@ -0,0 +1,85 @@
+from typing import Any, Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from core.rest import MIN_COMPRESS_BYTES, SnapshotCache, snapshot_response
+
+
+class _Resource:
+    def __init__(self) -> None:
+        self.version = 0
+        self.payload: dict[str, Any] = {"system_id": "grid", "points": list(range(MIN_COMPRESS_BYTES))}
+        self.builds = 0
+
+    async def read(self, reader: Callable[[dict[str, Any]], Any]) -> Any:
+        return reader(self.payload)
+
+    def build(self, live: dict[str, Any]) -> dict[str, Any]:
+        self.builds += 1
+        return dict(live)
+
+
+def _client(resource: _Resource) -> TestClient:
+    app = FastAPI()
+    cache = SnapshotCache()
+
+    async def missing(reader: Callable[[dict[str, Any]], Any]) -> Any:
+        raise KeyError("System not found: nowhere")
+
+    @app.get("/grid")
+    async def grid(request: Request) -> Response:
+        return await snapshot_response(request, cache, ("grid",), lambda: resource.version, resource.read, resource.build)
+
+    @app.get("/nowhere")
+    async def nowhere(request: Request) -> Response:
+        return await snapshot_response(request, cache, ("nowhere",), lambda: 0, missing, resource.build)
+
+    return TestClient(app)
+
+
+def test_matching_etag_gets_304_with_the_same_etag() -> None:
+    resource = _Resource()
+    client = _client(resource)
+    first = client.get("/grid", headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    again = client.get("/grid", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert resource.builds == 1
+
+
+def test_etag_survives_unrelated_version_bumps() -> None:
+    resource = _Resource()
+    client = _client(resource)
+    etag = client.get("/grid").headers["ETag"]
+    resource.version += 5
+    assert client.get("/grid", headers={"If-None-Match": etag}).status_code == 304
+    resource.payload = {**resource.payload, "system_id": "grid-2"}
+    resource.version += 1
+    changed = client.get("/grid", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["system_id"] == "grid-2"
+
+
+def test_compressed_etag_is_repeated_on_304() -> None:
+    client = _client(_Resource())
+    first = client.get("/grid", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["Content-Encoding"] == "gzip"
+    etag = first.headers["ETag"]
+    assert etag.endswith('-gzip"')
+    again = client.get("/grid", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    identity = client.get("/grid", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert identity.status_code == 304
+    assert identity.headers["ETag"] == etag.removesuffix('-gzip"') + '"'
+
+
+def test_missing_resource_is_404() -> None:
+    response = _client(_Resource()).get("/nowhere")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "System not found: nowhere"}
@@ -0,0 +1,118 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from core.clock import SimulationClock
+from core.scenario import iter_scenario
+from models import SystemModel
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SAMPLE_FLEET = Path(__file__).resolve().parent.parent / "scenarios" / "sample_fleet.json"
+
+
+def _component(component_id: str, component_type: str, **fields: Any) -> dict[str, Any]:
+    return {"component_id": component_id, "component_type": component_type, **fields}
+
+
+def _edges(source: str, target: str) -> dict[str, Any]:
+    return {"edges": [{"source_component_id": source, "target_component_id": target}]}
+
+
+def _system(system_id: str, **overrides: Any) -> dict[str, Any]:
+    system: dict[str, Any] = {
+        "system_id": system_id,
+        "system_type": "power_grid",
+        "name": f"Grid {system_id}",
+        "components": [
+            _component(f"{system_id}_sub", "substation", capacity=120.0, current_load=65.0),
+            _component(f"{system_id}_tx", "transformer", capacity=90.0, current_load=40.0),
+        ],
+        "topology_graph": _edges(f"{system_id}_sub", f"{system_id}_tx"),
+        "operational_constraints": [
+            {"name": "max_line_loading", "max_value": 1.05, "units": "ratio"},
+        ],
+    }
+    system.update(overrides)
+    return system
+
+
+def _write_json(path: Path, systems: list[dict[str, Any]]) -> Path:
+    path.write_text(json.dumps({"name": "test", "systems": systems}), encoding="utf-8")
+    return path
+
+
+def _load(path: Path) -> tuple[int, list[SystemModel]]:
+    async def load() -> tuple[int, list[SystemModel]]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        count = engine.load_scenario(path)
+        return count, await engine.get_systems()
+
+    return asyncio.run(load())
+
+
+def _dumps(path: Path) -> list[dict[str, Any]]:
+    return [system.model_dump(exclude={"risk_state"}) for system in _load(path)[1]]
+
+
+def test_scenario_systems_are_loaded_into_the_engine(tmp_path: Path) -> None:
+    count, systems = _load(_write_json(tmp_path / "fleet.json", [_system("a"), _system("b")]))
+    assert count == 2
+    assert [system.system_id for system in systems] == ["a", "b"]
+    first = systems[0]
+    assert [component.component_id for component in first.components] == ["a_sub", "a_tx"]
+    assert first.components[0].current_load == pytest.approx(65.0, rel=0.2)
+    assert first.topology_graph.nodes == ["a_sub", "a_tx"]
+    assert [constraint.name for constraint in first.operational_constraints] == ["max_line_loading"]
+
+
+def test_json_lines_scenarios_match_json_documents(tmp_path: Path) -> None:
+    systems = [_system("a"), _system("b")]
+    document = _write_json(tmp_path / "fleet.json", systems)
+    lines = tmp_path / "fleet.jsonl"
+    lines.write_text("\n".join(json.dumps(system) for system in systems) + "\n", encoding="utf-8")
+    assert [system.system_id for system in iter_scenario(lines)] == ["a", "b"]
+    assert _dumps(lines) == _dumps(document)
+
+
+@pytest.mark.parametrize(
+    ("systems", "message"),
+    [
+        ([_system("a", components=[_component("x", "pump")])], "capacity are required"),
+        ([_system("a", components=[_component("x", "pump", capacity=-1.0)])], "non-negative"),
+        ([_system("a", topology_graph=_edges("a_sub", "nope"))], "unknown component 'nope'"),
+        ([_system("a"), _system("a", components=[], topology_graph={})], "Duplicate system_id"),
+        (
+            [_system("a"), _system("b", components=_system("a")["components"])],
+            "duplicate component_id",
+        ),
+    ],
+)
+def test_invalid_scenarios_are_rejected(
+    tmp_path: Path, systems: list[dict[str, Any]], message: str
+) -> None:
+    path = _write_json(tmp_path / "fleet.json", systems)
+    with pytest.raises(ValueError, match=message):
+        list(iter_scenario(path))
+
+
+def test_unsupported_or_missing_files_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unsupported scenario file type"):
+        list(iter_scenario(tmp_path / "fleet.csv"))
+    with pytest.raises(ValueError, match="not found"):
+        list(iter_scenario(tmp_path / "missing.json"))
+
+
+def test_sample_fleet_scenario_matches_the_built_in_fleet() -> None:
+    async def built_in() -> list[str]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        return [system.system_id for system in await engine.get_systems()]
+
+    count, systems = _load(SAMPLE_FLEET)
+    assert count == 6
+    assert [system.system_id for system in systems] == asyncio.run(built_in())
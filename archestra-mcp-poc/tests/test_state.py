@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from core.clock import SimulationClock
+from core.state import SystemState, operational_state_effect
+from models import (
+    Component,
+    HealthStatus,
+    OperationalConstraint,
+    OperationalState,
+    SystemModel,
+    TelemetryPoint,
+    TopologyEdge,
+    TopologyGraph,
+)
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _points(count: int) -> list[TelemetryPoint]:
+    return [
+        TelemetryPoint(
+            timestamp=START + timedelta(seconds=index),
+            metric_name="load",
+            metric_value=index,
+            units="MW",
+        )
+        for index in range(count)
+    ]
+
+
+def _model() -> SystemModel:
+    return SystemModel(
+        system_id="grid",
+        system_type="power_grid",
+        name="Grid",
+        location="North",
+        components=[
+            Component(
+                component_id="sub",
+                component_type="substation",
+                system_id="grid",
+                capacity=100.0,
+                current_load=60.0,
+                telemetry=_points(5),
+                metadata={"tags": ["a"]},
+            ),
+            Component(
+                component_id="tx",
+                component_type="transformer",
+                system_id="grid",
+                capacity=80.0,
+                current_load=0.0,
+            ),
+        ],
+        topology_graph=TopologyGraph(
+            nodes=["sub", "tx"],
+            edges=[TopologyEdge(source_component_id="sub", target_component_id="tx")],
+        ),
+        telemetry=_points(3),
+        operational_constraints=[OperationalConstraint(name="max_line_loading", max_value=1.05)],
+        metadata={"owner": {"team": "ops"}},
+    )
+
+
+def test_models_round_trip_through_engine_state() -> None:
+    model = _model()
+    assert SystemState.from_model(model).to_model().model_dump() == model.model_dump()
+
+
+def test_converted_models_are_detached_from_the_live_state() -> None:
+    model = _model()
+    state = SystemState.from_model(model)
+    model.components[0].metadata["tags"].append("b")
+    model.metadata["owner"]["team"] = "dev"
+    model.topology_graph.nodes.append("x")
+
+    result = state.to_model()
+    result.components[0].telemetry.clear()
+    result.risk_state.bottlenecks.append("sub")
+    result.operational_constraints[0].max_value = 2.0
+
+    again = state.to_model()
+    assert again.components[0].metadata == {"tags": ["a"]}
+    assert again.metadata == {"owner": {"team": "ops"}}
+    assert again.topology_graph.nodes == ["sub", "tx"]
+    assert len(again.components[0].telemetry) == 5
+    assert again.risk_state.bottlenecks == []
+    assert again.operational_constraints[0].max_value == 1.05
+
+
+def test_fields_and_telemetry_tails_limit_the_conversion() -> None:
+    state = SystemState.from_model(_model())
+    partial = state.to_model(fields={"name"})
+    assert partial.name == "Grid"
+    assert partial.components == []
+    assert partial.telemetry == []
+
+    tail = state.to_model(telemetry_tail=2, component_telemetry_tail=0)
+    assert [point.metric_value for point in tail.telemetry] == [1.0, 2.0]
+    assert tail.components[0].telemetry == []
+
+    component = state.components[0].to_model(fields={"telemetry"}, telemetry_tail=1)
+    assert [point.metric_value for point in component.telemetry] == [4.0]
+    assert component.metadata == {}
+
+
+def test_operational_state_effect() -> None:
+    healthy, degraded, critical = HealthStatus.HEALTHY, HealthStatus.DEGRADED, HealthStatus.CRITICAL
+    effect = operational_state_effect
+    assert effect(OperationalState.OFFLINE, 50.0, 100.0, healthy) == (0.0, degraded)
+    assert effect(OperationalState.RUNNING, 0.0, 100.0, critical) == (35.0, critical)
+    assert effect(OperationalState.STANDBY, 20.0, 100.0, healthy) == (20.0, healthy)
+
+
+def test_engine_results_do_not_alias_the_world() -> None:
+    async def loads() -> tuple[float, float]:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        system = await engine.get_system_state("grid_001")
+        original = system.components[0].current_load
+        system.components[0].current_load = 10_000.0
+        system.components[0].telemetry.clear()
+        again = await engine.get_system_state("grid_001")
+        return original, again.components[0].current_load
+
+    original, again = asyncio.run(loads())
+    assert again == original
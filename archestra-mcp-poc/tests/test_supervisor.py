@@ -0,0 +1,171 @@
+import socket
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import start_mcps_http
+from start_mcps_http import SERVERS, ServerState, SupervisorSettings
+
+SETTINGS = SupervisorSettings(
+    ready_timeout=30.0, backoff_base=0.5, backoff_max=2.0, max_restarts=3, prefork=False
+)
+
+
+class FakeChild:
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.returncode: int | None = None
+        self.killed = False
+
+    def poll(self) -> int | None:
+        return self.returncode
+
+    def terminate(self) -> None:
+        self.returncode = -15
+
+    def kill(self) -> None:
+        self.killed = True
+        self.returncode = -9
+
+    def wait(self, timeout: float | None = None) -> int:
+        assert self.returncode is not None
+        return self.returncode
+
+
+@pytest.fixture
+def launched(monkeypatch: pytest.MonkeyPatch) -> list[FakeChild]:
+    children: list[FakeChild] = []
+
+    def start(config: object, port: int) -> FakeChild:
+        children.append(FakeChild(1000 + len(children)))
+        return children[-1]
+
+    monkeypatch.setattr(start_mcps_http, "_start_server", start)
+    monkeypatch.setattr(start_mcps_http, "_probe_ready", lambda port: False)
+    return children
+
+
+def _state() -> ServerState:
+    state = ServerState(config=SERVERS[0], port=8001)
+    start_mcps_http._launch(state, SETTINGS)
+    return state
+
+
+def _crash_and_restart(state: ServerState, launched: list[FakeChild]) -> None:
+    launched[-1].returncode = 1
+    start_mcps_http._supervise_once([state], SETTINGS)
+    if state.restart_at is not None:
+        state.restart_at = 0.0
+        start_mcps_http._supervise_once([state], SETTINGS)
+
+
+def test_crashed_children_restart_with_capped_backoff(launched: list[FakeChild]) -> None:
+    state = _state()
+    backoffs = []
+    for _ in range(3):
+        _crash_and_restart(state, launched)
+        backoffs.append(state.backoff)
+    assert backoffs == [0.5, 1.0, 2.0]
+    assert len(launched) == 4
+    assert state.process is launched[-1]
+
+    _crash_and_restart(state, launched)
+    assert state.given_up
+    assert state.process is None
+    assert len(launched) == 4
+
+
+def test_stable_children_restart_with_the_base_backoff(launched: list[FakeChild]) -> None:
+    state = _state()
+    _crash_and_restart(state, launched)
+    _crash_and_restart(state, launched)
+    assert state.backoff == 1.0
+    state.started_at -= start_mcps_http.STABLE_UPTIME_SECONDS
+    _crash_and_restart(state, launched)
+    assert (state.backoff, state.restarts) == (0.5, 1)
+
+
+def test_children_that_never_become_ready_are_killed(
+    launched: list[FakeChild], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    state = _state()
+    start_mcps_http._supervise_once([state], SETTINGS)
+    assert state.process is launched[0]
+    assert state.restart_at is None
+
+    state.started_at -= SETTINGS.ready_timeout + 1.0
+    start_mcps_http._supervise_once([state], SETTINGS)
+    assert launched[0].killed
+    assert state.process is None
+    assert state.restart_at is not None
+
+    monkeypatch.setattr(start_mcps_http, "_probe_ready", lambda port: True)
+    state.restart_at = 0.0
+    start_mcps_http._supervise_once([state], SETTINGS)
+    start_mcps_http._supervise_once([state], SETTINGS)
+    assert state.ready_at is not None
+    assert state.process is launched[1]
+
+
+class _Health(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(200 if self.path == "/healthz" else 404)
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def health_port() -> Iterator[int]:
+    server = HTTPServer(("127.0.0.1", 0), _Health)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def garbage_port() -> Iterator[int]:
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def serve() -> None:
+        connection, _ = listener.accept()
+        with connection:
+            connection.recv(1024)
+            connection.sendall(b"not http at all\r\n\r\n")
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield listener.getsockname()[1]
+    thread.join(timeout=1.0)
+    listener.close()
+
+
+def test_readiness_probe(health_port: int, garbage_port: int) -> None:
+    assert start_mcps_http._probe_ready(health_port)
+    assert not start_mcps_http._probe_ready(garbage_port)
+    unused = socket.socket()
+    unused.bind(("127.0.0.1", 0))
+    closed_port = unused.getsockname()[1]
+    unused.close()
+    assert not start_mcps_http._probe_ready(closed_port)
+
+
+def test_ports_and_settings_come_from_the_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("POWER_MCP_PORT", "9001")
+    monkeypatch.setenv("MCP_RESTART_BACKOFF", "0.25")
+    assert start_mcps_http._resolve_port(SERVERS[0]) == 9001
+    assert start_mcps_http._resolve_settings().backoff_base == 0.25
+    for raw in ("0", "70000", "http"):
+        monkeypatch.setenv("POWER_MCP_PORT", raw)
+        with pytest.raises(ValueError, match="POWER_MCP_PORT"):
+            start_mcps_http._resolve_port(SERVERS[0])
+    monkeypatch.setenv("MCP_READY_TIMEOUT", "soon")
+    with pytest.raises(ValueError, match="MCP_READY_TIMEOUT"):
+        start_mcps_http._resolve_settings()
@@ -0,0 +1,69 @@
+import asyncio
+from collections.abc import Iterator
+from datetime import datetime, timezone
+
+import pytest
+
+import core.tick
+from core.clock import SimulationClock
+from core.parallel import shutdown_process_pool
+from simulation import UniversalSimulationEngine
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+Trajectory = dict[str, tuple[float, list[float]]]
+
+
+@pytest.fixture(autouse=True)
+def _pooled_sampling(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(core.tick, "INLINE_WORK_LIMIT", 0)
+    monkeypatch.setenv("SIM_WORKERS", "2")
+    yield
+    shutdown_process_pool()
+
+
+def _trajectory(mode: str, monkeypatch: pytest.MonkeyPatch, replicas: int = 1) -> Trajectory:
+    monkeypatch.setenv("SIM_TICK_MODE", mode)
+
+    async def run() -> Trajectory:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems(replicas=replicas)
+        await engine.advance(30)
+        return {
+            component.component_id: (
+                component.current_load,
+                [point.metric_value for point in component.telemetry],
+            )
+            for system in await engine.get_systems()
+            for component in system.components
+        }
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("mode", ["processes", "threads"])
+def test_pooled_sampling_matches_serial(mode: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert _trajectory(mode, monkeypatch) == _trajectory("serial", monkeypatch)
+
+
+def test_trajectory_does_not_depend_on_other_systems(monkeypatch: pytest.MonkeyPatch) -> None:
+    single = _trajectory("processes", monkeypatch)
+    replicated = _trajectory("processes", monkeypatch, replicas=3)
+    assert {component_id: replicated[component_id] for component_id in single} == single
+
+
+def test_pooled_tick_yields_to_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SIM_TICK_MODE", "processes")
+
+    async def run() -> int:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        advancing = asyncio.create_task(engine.advance(30))
+        turns = 0
+        while not advancing.done():
+            turns += 1
+            await asyncio.sleep(0)
+        await advancing
+        return turns
+
+    assert asyncio.run(run()) > 1
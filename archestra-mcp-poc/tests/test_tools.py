@@ -0,0 +1,67 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+from core.clock import SimulationClock
+from simulation import UniversalSimulationEngine
+from tools import UniversalInfrastructureTools
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _call(tool: str, arguments: dict[str, Any], advance_seconds: float = 0.0) -> Any:
+    async def call() -> Any:
+        engine = UniversalSimulationEngine(clock=SimulationClock(mode="fixed_step", start=START))
+        engine.initialize_sample_systems()
+        if advance_seconds:
+            await engine.control_clock(advance_seconds=advance_seconds)
+        mcp = FastMCP("test")
+        UniversalInfrastructureTools(mcp, engine).register()
+        _, structured = await mcp.call_tool(tool, arguments)
+        return structured
+
+    return asyncio.run(call())
+
+
+def test_fields_select_only_the_requested_paths() -> None:
+    state = _call("get_system_state", {"system_id": "grid_001", "fields": ["name", "components.component_id"]})
+    assert set(state) == {"name", "components"}
+    assert state["components"]
+    assert all(set(component) == {"component_id"} for component in state["components"])
+
+    systems = _call("get_systems", {"fields": ["system_id", "status"]})["result"]
+    assert systems
+    assert all(set(system) == {"system_id", "status"} for system in systems)
+
+
+def test_fields_bound_component_telemetry() -> None:
+    state = _call(
+        "get_system_state",
+        {"system_id": "grid_001", "fields": ["components.telemetry"], "telemetry_limit": 2},
+        advance_seconds=10.0,
+    )
+    assert all(len(component["telemetry"]) == 2 for component in state["components"])
+
+
+def test_calls_without_fields_keep_full_component_telemetry() -> None:
+    state = _call("get_system_state", {"system_id": "grid_001", "telemetry_limit": 2}, advance_seconds=10.0)
+    assert len(state["telemetry"]) <= 2
+    assert max(len(component["telemetry"]) for component in state["components"]) > 2
+    assert "version" in state
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"since_version": 0, "fields": ["name"]},
+        {"since_version": 0, "page_size": 10},
+        {"page_size": 0},
+    ],
+)
+def test_conflicting_or_invalid_arguments_are_rejected(arguments: dict[str, Any]) -> None:
+    with pytest.raises(ToolError):
+        _call("get_system_state", {"system_id": "grid_001", **arguments})
@@ -1,128 +1,184 @@
 from __future__ import annotations
 
 import logging
-import sys
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from mcp.server.fastmcp import FastMCP
 
-from simulation import UniversalSimulationEngine
+from core.coalesce import SingleFlight, coalesced
+from core.logs import logged_tool
+from core.pagination import SnapshotPager, system_page_view, topology_page_view
+from core.projection import clamp_telemetry_limit, parse_fields, project_model, project_system
+
+if TYPE_CHECKING:
+    from core.engine import SimulationEngine
+    from models import SystemModel
+    from simulation import UniversalSimulationEngine
 
 
 logger = logging.getLogger("universal-infra.tools")
-logger.addHandler(logging.StreamHandler(sys.stderr))
-logger.setLevel(logging.INFO)
 
 
-class UniversalInfrastructureTools:
-    def __init__(self, mcp: FastMCP, simulation: UniversalSimulationEngine) -> None:
+def _system_status(system: dict[str, Any]) -> str:
+    risk_state = system.get("risk_state") if isinstance(system.get("risk_state"), dict) else {}
+    level = risk_state.get("risk_level") if isinstance(risk_state, dict) else None
+    if level == "critical":
+        return "critical"
+    if level in {"high", "medium"}:
+        return "risk"
+    return "healthy"
+
+
+def _system_load(system: dict[str, Any]) -> float:
+    components = system.get("components") if isinstance(system.get("components"), list) else []
+    total_capacity = 0.0
+    total_current_load = 0.0
+    for component in components:
+        if not isinstance(component, dict):
+            continue
+        capacity = component.get("capacity")
+        current_load = component.get("current_load")
+        if isinstance(capacity, (int, float)) and isinstance(current_load, (int, float)):
+            total_capacity += float(capacity)
+            total_current_load += float(current_load)
+
+    if total_capacity > 0.0:
+        return max(0.0, min(1.0, total_current_load / total_capacity))
+    return 0.0
+
+
+def _system_temperature(system: dict[str, Any]) -> float:
+    components = system.get("components") if isinstance(system.get("components"), list) else []
+    component_temperatures: list[float] = []
+    for component in components:
+        if not isinstance(component, dict):
+            continue
+        telemetry = component.get("telemetry") if isinstance(component.get("telemetry"), list) else []
+        for point in telemetry:
+            if not isinstance(point, dict):
+                continue
+            if point.get("metric_name") == "temperature" and isinstance(point.get("metric_value"), (int, float)):
+                component_temperatures.append(float(point["metric_value"]))
+
+    if component_temperatures:
+        return sum(component_temperatures) / len(component_temperatures)
+    return 0.0
+
+
+def _serialize_system(system: dict[str, Any]) -> dict[str, Any]:
+    topology = system.get("topology_graph") if isinstance(system.get("topology_graph"), dict) else {"nodes": [], "edges": []}
+    payload = {
+        **system,
+        "status": _system_status(system),
+        "load": _system_load(system),
+        "temperature": _system_temperature(system),
+        "topology": topology,
+    }
+    return payload
+
+
+def _compact_system(system: dict[str, Any]) -> dict[str, Any]:
+    components = system.get("components") if isinstance(system.get("components"), list) else []
+    risk_state = system.get("risk_state") if isinstance(system.get("risk_state"), dict) else {}
+    return {
+        "system_id": system.get("system_id"),
+        "system_type": system.get("system_type"),
+        "name": system.get("name"),
+        "location": system.get("location"),
+        "status": _system_status(system),
+        "load": _system_load(system),
+        "temperature": _system_temperature(system),
+        "component_count": len(components),
+        "risk_state": {
+            "risk_score": risk_state.get("risk_score"),
+            "risk_level": risk_state.get("risk_level"),
+            "bottlenecks": risk_state.get("bottlenecks", []),
+            "predicted_failures": risk_state.get("predicted_failures", []),
+            "recommendations": risk_state.get("recommendations", []),
+        },
+    }
+
+
+def _bounded_system_view(
+    system: dict[str, Any],
+    include_components: bool,
+    include_topology: bool,
+    telemetry_limit: int,
+) -> dict[str, Any]:
+    payload = _serialize_system(system)
+    if not include_components:
+        payload.pop("components", None)
+    if not include_topology:
+        payload.pop("topology_graph", None)
+        payload.pop("topology", None)
+
+    telemetry = payload.get("telemetry") if isinstance(payload.get("telemetry"), list) else []
+    safe_limit = clamp_telemetry_limit(telemetry_limit)
+    payload["telemetry"] = telemetry[-safe_limit:] if safe_limit else []
+
+    return payload
+
+
+class InfrastructureTools:
+    """Registers the read and control tools on ``mcp`` against an engine, scoped to ``domain_filter``.
+
+    ``engine`` returns the engine to use, so a server can build it lazily; ``state_version``
+    keys tool call coalescing and must not block.
+    """
+
+    def __init__(
+        self,
+        mcp: FastMCP,
+        engine: Callable[[], Awaitable[SimulationEngine]],
+        state_version: Callable[[], int],
+        domain_filter: str | None = None,
+        tool_logger: logging.Logger = logger,
+    ) -> None:
         self._mcp = mcp
-        self._simulation = simulation
+        self._logger = tool_logger
+        self._engine = engine
+        self._state_version = state_version
+        self._domain_filter = domain_filter
+        self._pager = SnapshotPager()
+        self._flight = SingleFlight()
+
+    async def _load_snapshot(self, system_id: str) -> tuple[int, SystemModel]:
+        engine = await self._engine()
+        return await engine.snapshot_system(system_id, domain_filter=self._domain_filter)
 
     def register(self) -> None:
-        logger.info("Registering MCP tools")
-
-        def _system_status(system: dict[str, Any]) -> str:
-            risk_state = system.get("risk_state") if isinstance(system.get("risk_state"), dict) else {}
-            level = risk_state.get("risk_level") if isinstance(risk_state, dict) else None
-            if level == "critical":
-                return "critical"
-            if level in {"high", "medium"}:
-                return "risk"
-            return "healthy"
-
-        def _system_load(system: dict[str, Any]) -> float:
-            components = system.get("components") if isinstance(system.get("components"), list) else []
-            total_capacity = 0.0
-            total_current_load = 0.0
-            for component in components:
-                if not isinstance(component, dict):
-                    continue
-                capacity = component.get("capacity")
-                current_load = component.get("current_load")
-                if isinstance(capacity, (int, float)) and isinstance(current_load, (int, float)):
-                    total_capacity += float(capacity)
-                    total_current_load += float(current_load)
-
-            if total_capacity > 0.0:
-                return max(0.0, min(1.0, total_current_load / total_capacity))
-            return 0.0
-
-        def _system_temperature(system: dict[str, Any]) -> float:
-            components = system.get("components") if isinstance(system.get("components"), list) else []
-            component_temperatures: list[float] = []
-            for component in components:
-                if not isinstance(component, dict):
-                    continue
-                telemetry = component.get("telemetry") if isinstance(component.get("telemetry"), list) else []
-                for point in telemetry:
-                    if not isinstance(point, dict):
-                        continue
-                    if point.get("metric_name") == "temperature" and isinstance(point.get("metric_value"), (int, float)):
-                        component_temperatures.append(float(point["metric_value"]))
-
-            if component_temperatures:
-                return sum(component_temperatures) / len(component_temperatures)
-            return 0.0
-
-        def _serialize_system(system: dict[str, Any]) -> dict[str, Any]:
-            topology = system.get("topology_graph") if isinstance(system.get("topology_graph"), dict) else {"nodes": [], "edges": []}
-            payload = {
-                **system,
-                "status": _system_status(system),
-                "load": _system_load(system),
-                "temperature": _system_temperature(system),
-                "topology": topology,
-            }
-            return payload
-
-        def _compact_system(system: dict[str, Any]) -> dict[str, Any]:
-            components = system.get("components") if isinstance(system.get("components"), list) else []
-            risk_state = system.get("risk_state") if isinstance(system.get("risk_state"), dict) else {}
-            return {
-                "system_id": system.get("system_id"),
-                "system_type": system.get("system_type"),
-                "name": system.get("name"),
-                "location": system.get("location"),
-                "status": _system_status(system),
-                "load": _system_load(system),
-                "temperature": _system_temperature(system),
-                "component_count": len(components),
-                "risk_state": {
-                    "risk_score": risk_state.get("risk_score"),
-                    "risk_level": risk_state.get("risk_level"),
-                    "bottlenecks": risk_state.get("bottlenecks", []),
-                    "predicted_failures": risk_state.get("predicted_failures", []),
-                    "recommendations": risk_state.get("recommendations", []),
-                },
-            }
-
-        def _bounded_system_view(
-            system: dict[str, Any],
-            include_components: bool,
-            include_topology: bool,
-            telemetry_limit: int,
-        ) -> dict[str, Any]:
-            payload = _serialize_system(system)
-            if not include_components:
-                payload.pop("components", None)
-            if not include_topology:
-                payload.pop("topology_graph", None)
-                payload.pop("topology", None)
-
-            telemetry = payload.get("telemetry") if isinstance(payload.get("telemetry"), list) else []
-            safe_limit = max(0, min(telemetry_limit, 100))
-            if safe_limit == 0:
-                payload["telemetry"] = []
-            else:
-                payload["telemetry"] = telemetry[-safe_limit:]
-
-            return payload
+        self._logger.info("Registering MCP tools")
+        domain_filter = self._domain_filter
 
         @self._mcp.tool()
-        async def get_systems(system_id: str | None = None, include_components: bool = False) -> list[dict[str, Any]]:
-            logger.info("Request received: get_systems system_id=%s include_components=%s", system_id, include_components)
-            systems = await self._simulation.get_systems()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_systems(
+            system_id: str | None = None,
+            include_components: bool = False,
+            fields: list[str] | None = None,
+        ) -> list[dict[str, Any]]:
+            engine = await self._engine()
+            projection = parse_fields(fields)
+            if projection is not None:
+                target = system_id.strip() if isinstance(system_id, str) and system_id.strip() else None
+                if target is not None:
+                    try:
+                        return [
+                            await engine.read_system(
+                                target,
+                                lambda system: project_system(system, projection, telemetry_limit=20),
+                                domain_filter=domain_filter,
+                            )
+                        ]
+                    except KeyError as error:
+                        raise ValueError(f"System not found: {target}") from error
+                return await engine.read_systems(
+                    lambda system: project_system(system, projection, telemetry_limit=10),
+                    domain_filter=domain_filter,
+                )
+
+            systems = await engine.get_systems(domain_filter=domain_filter)
             serialized = [_serialize_system(system.model_dump(mode="json")) for system in systems]
 
             if isinstance(system_id, str) and system_id.strip():
@@ -143,92 +199,343 @@ class UniversalInfrastructureTools:
 
             return [_compact_system(system) for system in serialized]
 
+
         @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
         async def get_system_state(
             system_id: str,
             include_components: bool = True,
             include_topology: bool = False,
             telemetry_limit: int = 25,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+            page_section: str = "components",
+            since_version: int | None = None,
         ) -> dict[str, Any]:
-            logger.info(
-                "Request received: get_system_state system_id=%s include_components=%s include_topology=%s telemetry_limit=%s",
-                system_id,
-                include_components,
-                include_topology,
-                telemetry_limit,
-            )
+            """Full state of one system, including its state ``version``. Pass that version back as
+            ``since_version`` to get only the components, telemetry points and risk fields changed since;
+            it cannot be combined with ``fields``, ``page_size`` or ``cursor``. ``telemetry_limit`` (at
+            most 100) bounds the system's telemetry, and each component's when selected through ``fields``."""
             try:
-                system = await self._simulation.get_system_state(system_id)
-                return _bounded_system_view(
+                if since_version is not None:
+                    if fields or page_size is not None or cursor:
+                        raise ValueError("since_version cannot be combined with fields, page_size or cursor")
+                    engine = await self._engine()
+                    return await engine.get_system_delta(
+                        system_id,
+                        since_version,
+                        include_components=include_components,
+                        telemetry_limit=telemetry_limit,
+                        domain_filter=domain_filter,
+                    )
+                if page_size is not None or cursor:
+                    page = await self._pager.page(
+                        system_id,
+                        section=page_section,
+                        page_size=50 if page_size is None else page_size,
+                        cursor=cursor,
+                        load_snapshot=self._load_snapshot,
+                    )
+                    if page["section"] == "edges":
+                        raise ValueError("Use get_system_topology to page through topology edges")
+                    return system_page_view(page)
+                engine = await self._engine()
+                projection = parse_fields(fields)
+                if projection is not None:
+                    return await engine.read_system(
+                        system_id,
+                        lambda system: project_system(system, projection, telemetry_limit=telemetry_limit),
+                        domain_filter=domain_filter,
+                    )
+                version, system = await engine.snapshot_system(system_id, domain_filter=domain_filter)
+                payload = _bounded_system_view(
                     system.model_dump(mode="json"),
                     include_components=include_components,
                     include_topology=include_topology,
                     telemetry_limit=telemetry_limit,
                 )
+                payload["version"] = version
+                return payload
             except KeyError as error:
-                logger.warning("get_system_state failed: %s", error)
                 raise ValueError(str(error)) from error
 
+
         @self._mcp.tool()
-        async def get_component_state(component_id: str) -> dict[str, Any]:
-            logger.info("Request received: get_component_state component_id=%s", component_id)
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_component_state(component_id: str, fields: list[str] | None = None) -> dict[str, Any]:
             try:
-                component = await self._simulation.get_component_state(component_id)
+                engine = await self._engine()
+                projection = parse_fields(fields)
+                if projection is not None:
+                    return await engine.read_component(
+                        component_id,
+                        lambda component: project_model(component, projection),
+                        domain_filter=domain_filter,
+                    )
+                component = await engine.get_component_state(component_id, domain_filter=domain_filter)
                 return component.model_dump(mode="json")
             except KeyError as error:
-                logger.warning("get_component_state failed: %s", error)
                 raise ValueError(str(error)) from error
 
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def find_components(filters: dict[str, Any] | None = None, limit: int = 100) -> list[dict[str, Any]]:
+            """Find components by system_id, system_type, component_type, health_status,
+            operational_state or utilization_band (low, normal, high, overloaded).
+            Each filter takes a value or a list of accepted values."""
+            engine = await self._engine()
+            return await engine.find_components(filters or {}, limit=limit, domain_filter=domain_filter)
+
+
         @self._mcp.tool()
-        async def get_system_topology(system_id: str) -> dict[str, Any]:
-            logger.info("Request received: get_system_topology system_id=%s", system_id)
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_system_topology(
+            system_id: str,
+            fields: list[str] | None = None,
+            page_size: int | None = None,
+            cursor: str | None = None,
+        ) -> dict[str, Any]:
             try:
-                topology = await self._simulation.get_system_topology(system_id)
+                if page_size is not None or cursor:
+                    page = await self._pager.page(
+                        system_id,
+                        section="edges",
+                        page_size=50 if page_size is None else page_size,
+                        cursor=cursor,
+                        load_snapshot=self._load_snapshot,
+                    )
+                    if page["section"] != "edges":
+                        raise ValueError("Cursor does not page topology edges")
+                    return topology_page_view(page)
+                engine = await self._engine()
+                projection = parse_fields(fields)
+                if projection is not None:
+                    return await engine.read_system(
+                        system_id,
+                        lambda system: project_model(system.topology_graph, projection),
+                        domain_filter=domain_filter,
+                    )
+                topology = await engine.get_system_topology(system_id, domain_filter=domain_filter)
                 return topology.model_dump(mode="json")
             except KeyError as error:
-                logger.warning("get_system_topology failed: %s", error)
                 raise ValueError(str(error)) from error
 
+
         @self._mcp.tool()
-        async def evaluate_system_risk(system_id: str) -> dict[str, Any]:
-            logger.info("Request received: evaluate_system_risk system_id=%s", system_id)
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def evaluate_system_risk(system_id: str, fields: list[str] | None = None) -> dict[str, Any]:
             try:
-                risk = await self._simulation.evaluate_system_risk(system_id)
+                engine = await self._engine()
+                projection = parse_fields(fields)
+                risk = await engine.evaluate_system_risk(system_id, domain_filter=domain_filter)
+                if projection is not None:
+                    return project_model(risk, projection)
                 return risk.model_dump(mode="json")
             except KeyError as error:
-                logger.warning("evaluate_system_risk failed: %s", error)
                 raise ValueError(str(error)) from error
 
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_anomalies(system_id: str | None = None, limit: int = 50) -> dict[str, Any]:
+            """Active and recent telemetry anomalies (spikes and level shifts) per component metric."""
+            try:
+                engine = await self._engine()
+                return await engine.get_anomalies(system_id, limit=limit, domain_filter=domain_filter)
+            except KeyError as error:
+                raise ValueError(str(error)) from error
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_constraint_violations(system_id: str | None = None, limit: int = 50) -> dict[str, Any]:
+            """Active operational constraint violations with start time and duration, plus recently cleared ones."""
+            try:
+                engine = await self._engine()
+                return await engine.get_constraint_violations(system_id, limit=limit, domain_filter=domain_filter)
+            except KeyError as error:
+                raise ValueError(str(error)) from error
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def forecast_failure_probability(
+            system_id: str,
+            horizon_seconds: float = 300.0,
+            trials: int = 1000,
+            step_seconds: float = 1.0,
+            seed: int | None = None,
+            confidence: float = 0.95,
+        ) -> dict[str, Any]:
+            """Monte Carlo per-component failure probabilities with confidence intervals over a horizon.
+            Large systems and horizons run fewer ``trials`` than requested (see ``requested_trials``)."""
+            try:
+                engine = await self._engine()
+                return await engine.forecast_failure_probability(
+                    system_id,
+                    horizon_seconds=horizon_seconds,
+                    trials=trials,
+                    step_seconds=step_seconds,
+                    seed=seed,
+                    confidence=confidence,
+                    domain_filter=domain_filter,
+                )
+            except KeyError as error:
+                raise ValueError(str(error)) from error
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def contingency_analysis(
+            system_id: str,
+            deadline_seconds: float = 5.0,
+            limit: int | None = None,
+        ) -> dict[str, Any]:
+            """N-1 analysis: take each component offline in turn and rank the outages by impact."""
+            try:
+                engine = await self._engine()
+                return await engine.contingency_analysis(
+                    system_id,
+                    deadline_seconds=deadline_seconds,
+                    limit=limit,
+                    domain_filter=domain_filter,
+                )
+            except KeyError as error:
+                raise ValueError(str(error)) from error
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        async def compute_capacity_paths(
+            system_id: str,
+            source_component_ids: list[str] | None = None,
+            sink_component_ids: list[str] | None = None,
+        ) -> dict[str, Any]:
+            """Max flow / min cut over the topology from source to sink components (default: components
+            without feeders to components without successors), with the limiting components and edges
+            and the flow paths. Cached until a control action changes capacity or operational state."""
+            try:
+                engine = await self._engine()
+                return await engine.compute_capacity_paths(
+                    system_id,
+                    source_component_ids=source_component_ids,
+                    sink_component_ids=sink_component_ids,
+                    domain_filter=domain_filter,
+                )
+            except KeyError as error:
+                raise ValueError(str(error)) from error
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_changes_since(
+            version: int,
+            system_id: str | None = None,
+            limit: int = 1000,
+            epoch: str | None = None,
+        ) -> dict[str, Any]:
+            """Changes after ``version``: component load/health/state, risk transitions and actions.
+            Start from the returned ``version`` and pass ``next_version`` back on the next call; when
+            ``resync_required`` is true, reload full state and continue from the returned ``version``."""
+            try:
+                engine = await self._engine()
+                return await engine.get_changes_since(
+                    version,
+                    system_id=system_id,
+                    limit=limit,
+                    epoch=epoch,
+                    domain_filter=domain_filter,
+                )
+            except KeyError as error:
+                raise ValueError(str(error)) from error
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        @coalesced(self._flight, self._state_version)
+        async def get_memory_report(top_components: int = 10, tracemalloc_top: int = 0) -> dict[str, Any]:
+            """Estimated memory per system, component and telemetry buffer, model object counts and GC
+            stats; ``tracemalloc_top`` > 0 adds top allocators when started with PYTHONTRACEMALLOC."""
+            engine = await self._engine()
+            return await engine.get_memory_report(
+                top_components=top_components,
+                tracemalloc_top=tracemalloc_top,
+                domain_filter=domain_filter,
+            )
+
+
+        @self._mcp.tool()
+        @logged_tool(self._logger)
+        async def control_simulation_clock(
+            mode: str | None = None,
+            speed: float | None = None,
+            advance_seconds: float | None = None,
+        ) -> dict[str, Any]:
+            """Show or change the simulation clock: ``mode`` is realtime, accelerated, fixed_step, paused
+            or resume; ``speed`` runs it that many times faster than wall-clock (1.0 is realtime);
+            ``advance_seconds`` (at most 3600) simulates that far ahead now. No arguments returns the status."""
+            engine = await self._engine()
+            if mode is None and speed is None and advance_seconds is None:
+                return await engine.get_clock_status()
+            return await engine.control_clock(mode=mode, speed=speed, advance_seconds=advance_seconds)
+
+
         @self._mcp.tool()
+        @logged_tool(self._logger)
         async def execute_control_action(
             system_id: str,
             action_type: str,
             parameters: dict[str, Any] | None = None,
         ) -> dict[str, Any]:
-            logger.info(
-                "Request received: execute_control_action system_id=%s action_type=%s",
-                system_id,
-                action_type,
-            )
             try:
-                result = await self._simulation.execute_control_action(
+                engine = await self._engine()
+                result = await engine.execute_control_action(
                     system_id=system_id,
                     action_type=action_type,
                     parameters=parameters or {},
+                    domain_filter=domain_filter,
                 )
                 return result.model_dump(mode="json")
             except KeyError as error:
-                logger.warning("execute_control_action failed: %s", error)
                 raise ValueError(str(error)) from error
 
-        logger.info(
+        self._logger.info(
             "Tools registered: %s",
             [
                 "get_systems",
                 "get_system_state",
                 "get_component_state",
+                "find_components",
                 "get_system_topology",
                 "evaluate_system_risk",
+                "get_anomalies",
+                "get_constraint_violations",
+                "forecast_failure_probability",
+                "contingency_analysis",
+                "compute_capacity_paths",
+                "get_changes_since",
+                "get_memory_report",
+                "control_simulation_clock",
                 "execute_control_action",
             ],
         )
+
+
+class UniversalInfrastructureTools(InfrastructureTools):
+    def __init__(self, mcp: FastMCP, simulation: UniversalSimulationEngine) -> None:
+        async def engine() -> SimulationEngine:
+            return simulation
+
+        super().__init__(mcp, engine, lambda: simulation.version)